@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+
+"""Compare validating a corpus one process per file with batch validation.
+
+Usage::
+
+    python -m benchmarks.bench_batch --files 200 --jobs 4
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from time import perf_counter
+
+from oaspec.batch import validate_files
+
+from .generator import generate_spec
+
+def write_corpus(directory, files, paths):
+    for idx in range(files):
+        with (directory / f"spec-{idx:04}.json").open("w", encoding="utf-8") as f:
+            json.dump(generate_spec(paths=paths, schemas=5, seed=idx), f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--paths", type=int, default=10)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--process-sample", type=int, default=20,
+                        help="the number of files validated one process per file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = Path(tmp_dir)
+        write_corpus(corpus, args.files, args.paths)
+        spec_files = sorted(corpus.iterdir())
+
+        print(f"Validating {args.files} generated specs with {args.paths} paths each")
+
+        sample = spec_files[:args.process_sample]
+        start = perf_counter()
+        for spec_file in sample:
+            subprocess.run([sys.executable, "-m", "oaspec", "validate", str(spec_file)], capture_output=True)
+        elapsed = perf_counter() - start
+        print(f"  {'process per file':18} {len(sample) / elapsed:8.1f} files/s")
+
+        for jobs in sorted({1, args.jobs}):
+            start = perf_counter()
+            results = list(validate_files([corpus], jobs=jobs))
+            elapsed = perf_counter() - start
+            print(f"  {f'batch, jobs={jobs}':18} {len(results) / elapsed:8.1f} files/s")
+
+if __name__ == "__main__":
+    main()
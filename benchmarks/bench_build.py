@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+"""Measure the time and memory taken to build the Schema class tree of a version.
+
+Usage::
+
+    python -m benchmarks.bench_build --version 3.0.1
+"""
+
+import argparse
+import gc
+import json
+import pickle
+import tracemalloc
+from time import perf_counter
+
+from oaspec.schema import Schema, build_schema, registry
+from oaspec.schema.cache import dump_class_tree
+from oaspec.schema.funcs import get_schema_classes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--version", default="3.0.1")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    schema_source = (registry.specs_dir / f"oas-{args.version}.json").read_bytes()
+
+    best = None
+    for _ in range(args.repeat):
+        validation_schema = json.loads(schema_source)
+        start = perf_counter()
+        build_schema(validation_schema, Schema, type("openapiObject", (Schema,), dict()))
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    validation_schema = json.loads(schema_source)
+    gc.collect()
+    tracemalloc.start()
+    schema_class = build_schema(validation_schema, Schema, type("openapiObject", (Schema,), dict()))
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    classes = get_schema_classes(schema_class)
+    payload = pickle.dumps(dump_class_tree(schema_class, validation_schema), protocol=pickle.HIGHEST_PROTOCOL)
+
+    print(f"Building the class tree of OpenAPI {args.version} ({len(classes)} classes)")
+    print(f"  build time     {best * 1000:8.1f}ms (best of {args.repeat})")
+    print(f"  memory         {memory / 2 ** 20:8.2f}MB")
+    print(f"  cache entry    {len(payload) / 2 ** 10:8.1f}KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+"""Measure bundling a specification split across many YAML files.
+
+Usage::
+
+    python -m benchmarks.bench_bundle --paths 300 --schemas 100
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from oaspec.schema import registry
+from oaspec.spec import FileCache, bundle
+from oaspec.utils import yaml
+
+from .generator import generate_spec
+
+def write_tree(directory, paths, schemas):
+    """Split a generated spec into one file per path item and per component schema.
+
+    Returns:
+        Path: The root specification file.
+    """
+    spec = generate_spec(paths=paths, schemas=schemas)
+
+    def relocate(value, prefix):
+        # Point the component references at the schema files
+        if isinstance(value, dict):
+            ref = value.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#/components/schemas/"):
+                value["$ref"] = "{}schemas/{}.yaml".format(prefix, ref.rsplit("/", 1)[1])
+            elif isinstance(ref, str):
+                value["$ref"] = "{}openapi.yaml{}".format(prefix, ref)
+            for item in value.values():
+                relocate(item, prefix)
+        elif isinstance(value, list):
+            for item in value:
+                relocate(item, prefix)
+
+    (directory / "paths").mkdir()
+    (directory / "schemas").mkdir()
+
+    for idx, (template, path_item) in enumerate(list(spec["paths"].items())):
+        relocate(path_item, "../")
+        yaml.dump(path_item, directory / "paths" / f"resource{idx}.yaml")
+        spec["paths"][template] = {"$ref": f"./paths/resource{idx}.yaml"}
+
+    for name, schema in list(spec["components"]["schemas"].items()):
+        yaml.dump(schema, directory / "schemas" / f"{name}.yaml")
+        del spec["components"]["schemas"][name]
+
+    # Keep the responses and parameters in the root file, referenced back from the path files
+    relocate(spec["components"], "./")
+    spec["components"]["responses"]["Error"]["content"]["application/json"]["schema"] = {
+        "$ref": "./schemas/Error.yaml"
+    }
+
+    root_file = directory / "openapi.yaml"
+    yaml.dump(spec, root_file)
+    return root_file
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=300)
+    parser.add_argument("--schemas", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        root_file = write_tree(Path(directory), args.paths, args.schemas)
+        files = len(list(Path(directory).rglob("*.yaml")))
+        print(f"Bundling a generated spec split across {files} files")
+
+        for loader in ("round_trip", "safe_c"):
+            timings = []
+            for workers in (1, args.workers):
+                start = perf_counter()
+                bundled = bundle(root_file, loader=loader, workers=workers, cache=FileCache())
+                timings.append(perf_counter() - start)
+
+            cache = FileCache()
+            bundle(root_file, loader=loader, cache=cache)
+            start = perf_counter()
+            bundle(root_file, loader=loader, workers=args.workers, cache=cache)
+            cached_time = perf_counter() - start
+
+            start = perf_counter()
+            registry.get(bundled["openapi"])(bundled, validation="once")
+            parse_time = perf_counter() - start
+
+            print(
+                f"  {loader:10} 1 thread {timings[0]:6.2f}s   {args.workers} threads {timings[1]:6.2f}s   "
+                f"cached {cached_time:6.2f}s   parse of the bundle {parse_time:6.2f}s"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Compare the time and memory of copying and zero-copy parsing.
+
+Usage::
+
+    python -m benchmarks.bench_copy --paths 1000
+"""
+
+import gc
+import argparse
+import tracemalloc
+from io import StringIO
+from time import perf_counter
+
+from oaspec.schema import registry
+from oaspec.utils import yaml
+
+from .generator import generate_spec
+
+def measure(schema_class, spec, zero_copy):
+    gc.collect()
+    start = perf_counter()
+    schema_class(spec, validation="once", zero_copy=zero_copy)
+    elapsed = perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    parsed = schema_class(spec, validation="once", zero_copy=zero_copy)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+
+    return elapsed, retained, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--schemas", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    schema_class = registry.get(spec["openapi"])
+
+    # The same document loaded with the ruamel round-trip loader
+    buffer = StringIO()
+    yaml.dump(spec, buffer)
+    round_trip_spec = yaml.load(buffer.getvalue())
+
+    print(f"Parsing a generated spec with {args.paths} paths (validation='once')")
+    print(f"  {'input':12} {'mode':10} {'time':>9} {'retained':>12} {'peak':>12}")
+    for input_name, source in (("dict", spec), ("CommentedMap", round_trip_spec)):
+        for zero_copy in (False, True):
+            elapsed, retained, peak = measure(schema_class, source, zero_copy)
+            mode = "zero-copy" if zero_copy else "copy"
+            print(
+                f"  {input_name:12} {mode:10} {elapsed:8.3f}s "
+                f"{retained / 2**20:10.1f}MB {peak / 2**20:10.1f}MB"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Compare diffing two versions of a specification with `oaspec.diff` and with a deep diff of `_raw()`.
+
+Usage::
+
+    python -m benchmarks.bench_diff --paths 500 --changes 5
+"""
+
+import argparse
+import copy
+import gc
+from time import perf_counter
+
+import oaspec
+from oaspec.schema import registry, reparse
+
+from .generator import generate_spec
+
+def deep_diff(old, new, path=()):
+    # A generic diff of raw values, without any knowledge of OpenAPI
+    if type(old) is not type(new):
+        return [path]
+    elif isinstance(old, dict):
+        changes = [path + (key,) for key in old.keys() ^ new.keys()]
+        for key in old.keys() & new.keys():
+            changes.extend(deep_diff(old[key], new[key], path + (key,)))
+        return changes
+    elif isinstance(old, list):
+        if len(old) != len(new):
+            return [path]
+        changes = []
+        for position, (old_item, new_item) in enumerate(zip(old, new)):
+            changes.extend(deep_diff(old_item, new_item, path + (position,)))
+        return changes
+
+    return [] if old == new else [path]
+
+def edit_spec(spec, changes):
+    """Return a copy of a generated specification with a few changes."""
+    edited = copy.deepcopy(spec)
+    paths = list(edited["paths"])
+    for idx in range(changes):
+        path_item = edited["paths"][paths[idx * len(paths) // changes]]
+        operation = next(value for key, value in path_item.items() if key != "parameters")
+        operation["summary"] = "Changed"
+        operation["parameters"].append({"name": f"filter{idx}", "in": "query", "required": True, "schema": {"type": "string"}})
+    del edited["paths"][paths[-1]]
+    edited["components"]["schemas"]["Error"]["required"].append("details")
+
+    return edited
+
+def timed(function):
+    gc.collect()
+    start = perf_counter()
+    result = function()
+    return perf_counter() - start, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=500)
+    parser.add_argument("--changes", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths)
+    edited = edit_spec(spec, args.changes)
+    schema_class = registry.get("3.0.1")
+
+    old = schema_class(copy.deepcopy(spec), validation="once")
+    new = schema_class(copy.deepcopy(edited), validation="once")
+
+    print(f"Diffing two versions of a specification of {args.paths} paths")
+    elapsed, raw_changes = timed(lambda: deep_diff(old._raw(), new._raw()))
+    print(f"  {'_raw() deep diff':24} {elapsed * 1000:9.1f}ms  {len(raw_changes)} changed values")
+    elapsed, result = timed(lambda: oaspec.diff(old, new))
+    print(f"  {'diff, hashing both':24} {elapsed * 1000:9.1f}ms  {len(result)} changes, {len(result.breaking)} breaking")
+    elapsed, result = timed(lambda: oaspec.diff(old, new))
+    print(f"  {'diff, hashes cached':24} {elapsed * 1000:9.1f}ms")
+
+    # The unchanged subtrees of a reparse are the nodes of the previous tree
+    previous = schema_class(copy.deepcopy(spec), validation="once")
+    previous._subtree_hash()
+    reparsed = reparse(previous, copy.deepcopy(edited))
+    elapsed, reparsed_result = timed(lambda: oaspec.diff(previous, reparsed))
+    print(f"  {'diff after reparse':24} {elapsed * 1000:9.1f}ms")
+    assert reparsed_result.as_dict() == result.as_dict()
+
+if __name__ == "__main__":
+    main()
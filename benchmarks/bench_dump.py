@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Compare dumping a parsed specification through `_raw` with the streaming writers.
+
+Usage::
+
+    python -m benchmarks.bench_dump --paths 2000
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from io import StringIO
+from time import perf_counter
+
+from oaspec.schema import registry
+from oaspec.schema.refs import walk
+from oaspec.utils import yaml
+
+from .generator import generate_spec
+
+class _NullWriter(object):
+    # Discards its output, so that only the memory of the dump itself is measured
+
+    def write(self, text):
+        return len(text)
+
+def dump_json_raw(node):
+    json.dump(node._raw(), _NullWriter(), ensure_ascii=False, indent=2)
+
+def dump_json_stream(node):
+    node._dump_json(_NullWriter())
+
+def dump_yaml_raw(node):
+    yaml.dump(node._raw(), _NullWriter())
+
+def dump_yaml_stream(node):
+    node._dump_yaml(_NullWriter())
+
+def measure(dump, node, repeat):
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        dump(node)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    dump(node)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return best, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=2000)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-yaml", action="store_true", help="Only dump JSON (YAML dumps are slow)")
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    node = registry.get(spec["openapi"])(spec)
+    nodes = sum(1 for _ in walk(node))
+    size = len(node._dump_json())
+
+    buffer = StringIO()
+    yaml.dump(node._raw(), buffer)
+    assert node._dump_yaml() == buffer.getvalue()
+    assert node._dump_json(mode="canonical") == json.dumps(
+        node._raw(), ensure_ascii=False, separators=(",", ":"), sort_keys=True
+    )
+
+    dumps = [("json, _raw", dump_json_raw), ("json, streaming", dump_json_stream)]
+    if not args.skip_yaml:
+        dumps += [("yaml, _raw", dump_yaml_raw), ("yaml, streaming", dump_yaml_stream)]
+
+    print(f"Dumping a specification of {nodes} nodes ({size / 2 ** 20:.1f}MB of JSON)")
+    for name, dump in dumps:
+        elapsed, peak = measure(dump, node, args.repeat)
+        print(f"  {name:16} {elapsed * 1000:9.1f}ms  peak memory {peak / 2 ** 20:8.2f}MB")
+
+if __name__ == "__main__":
+    main()
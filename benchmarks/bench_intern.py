@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+"""Measure the nodes and memory saved by interning identical subtrees.
+
+Usage::
+
+    python -m benchmarks.bench_intern --paths 1000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from time import perf_counter
+
+from oaspec.schema import registry, InternTable
+
+from .generator import generate_spec
+
+def measure(schema_class, spec, intern, **kwargs):
+    # Returns the parsed tree, the parse time and the memory held by the tree
+    table = InternTable() if intern else None
+
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    if table is not None:
+        with table:
+            root = schema_class(spec, **kwargs)
+    else:
+        root = schema_class(spec, **kwargs)
+    elapsed = perf_counter() - start
+
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return root, table, elapsed, memory
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--validation", default="once")
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    schema_class = registry.get(spec["openapi"])
+
+    print(f"Parsing a generated spec with {args.paths} paths (validation={args.validation!r})")
+
+    for zero_copy in (False, True):
+        mode = "zero-copy" if zero_copy else "copy"
+        options = dict(validation=args.validation, zero_copy=zero_copy)
+
+        plain, _, plain_time, plain_memory = measure(schema_class, spec, False, **options)
+        del plain
+        interned, table, intern_time, intern_memory = measure(schema_class, spec, True, **options)
+        del interned
+
+        stats = table.stats()
+        print(
+            f"  {mode:10} plain {plain_time:6.2f}s {plain_memory / 2 ** 20:7.1f}MB   "
+            f"interned {intern_time:6.2f}s {intern_memory / 2 ** 20:7.1f}MB   "
+            f"saved {(plain_memory - intern_memory) / 2 ** 20:6.1f}MB"
+        )
+        print(
+            f"  {'':10} {stats['built']} nodes built for {stats['total_nodes']}, "
+            f"{stats['shared']} shared subtrees, dedup ratio {stats['dedup_ratio']:.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+
+"""Compare the loader backends on the petstore fixtures and a generated spec.
+
+Usage::
+
+    python -m benchmarks.bench_loaders --paths 1000
+"""
+
+import json
+import argparse
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+
+from oaspec.utils import yaml, loaders
+
+from .generator import generate_spec
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "data"
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+
+    return min(times)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    buffer = StringIO()
+    yaml.dump(spec, buffer)
+
+    documents = [
+        ("petstore.json", (FIXTURES / "petstore-3.0.0.json").read_bytes()),
+        ("petstore.yaml", (FIXTURES / "petstore-3.0.0.yaml").read_bytes()),
+        (f"generated-{args.paths}.json", json.dumps(spec, indent=2).encode("utf-8")),
+        (f"generated-{args.paths}.yaml", buffer.getvalue().encode("utf-8")),
+    ]
+
+    print(f"  {'document':22} {'size':>9} " + " ".join(f"{loader:>11}" for loader in loaders.LOADERS))
+    for name, source in documents:
+        source_format = loaders.sniff_format(source)
+        times = []
+        for loader in loaders.LOADERS:
+            if loader == "json" and source_format != "json":
+                times.append(f"{'-':>11}")
+                continue
+
+            elapsed = best_time(lambda: loaders.load(source, loader), args.repeat)
+            times.append(f"{elapsed * 1000:9.2f}ms")
+
+        print(f"  {name:22} {len(source) / 2**10:7.0f}KB " + " ".join(times))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Compare merging many specification fragments with `merge_fragments` and with `_update`.
+
+Usage::
+
+    python -m benchmarks.bench_merge --fragments 400 --paths 5
+"""
+
+import argparse
+import gc
+import json
+from time import perf_counter
+
+from oaspec.schema import registry, merge_fragments
+
+from .generator import generate_spec
+
+def generate_fragments(count, paths, schemas):
+    """Generate team fragments: each has its own paths, and shares the component names.
+
+    Returns:
+        list: The raw fragments.
+    """
+    fragments = []
+    for idx in range(count):
+        fragment = generate_spec(paths=paths, schemas=schemas, seed=idx)
+        fragment["info"]["title"] = f"Team {idx}"
+        fragment["paths"] = {f"/team{idx}{path}": item for path, item in fragment["paths"].items()}
+        fragments.append(fragment)
+
+    return fragments
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fragments", type=int, default=400)
+    parser.add_argument("--paths", type=int, default=5)
+    parser.add_argument("--schemas", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    schema_class = registry.get("3.0.1")
+    source = json.dumps(generate_fragments(args.fragments, args.paths, args.schemas))
+
+    def parse():
+        base, *fragments = [schema_class(fragment, validation="none") for fragment in json.loads(source)]
+        return base, fragments
+
+    def pairwise(base, fragments):
+        for fragment in fragments:
+            base._update(fragment)
+
+    def k_way(base, fragments):
+        merge_fragments(base, fragments)
+
+    print(f"Merging {args.fragments} fragments of {args.paths} paths")
+    results = []
+    for name, function in (("_update", pairwise), ("merge_fragments", k_way)):
+        base, fragments = parse()
+        gc.collect()
+        start = perf_counter()
+        function(base, fragments)
+        elapsed = perf_counter() - start
+        results.append(base._raw())
+        print(f"  {name:16} {elapsed * 1000:10.1f}ms")
+
+    assert results[0] == results[1]
+
+if __name__ == "__main__":
+    main()
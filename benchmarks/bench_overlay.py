@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Measure amending large arrays and applying many overlays to a specification.
+
+Usage::
+
+    python -m benchmarks.bench_overlay --items 2000 --overlays 50
+"""
+
+import argparse
+import gc
+import json
+from time import perf_counter
+
+from oaspec.schema import registry, apply_overlays
+
+from .generator import generate_spec
+
+def legacy_amend_array(node, amendments_spec):
+    # How `_amend` amended arrays before overlays were indexed: every item is
+    # compared with every value of the amendment
+    revised_list = list()
+    delete_items = set()
+    for item in amendments_spec["__override"]:
+        if not item:
+            continue
+        elif item == "__del *":
+            delete_items = set(amendments_spec["__original"])
+        elif item.startswith("__del"):
+            delete_items.add(item[6:])
+        else:
+            revised_list.append(node._items(item, parent=node, key="array"))
+
+    for item in node._value:
+        if item in amendments_spec["__original"] or item in amendments_spec["__override"]:
+            if item._value in delete_items:
+                continue
+
+            revised_list.append(item)
+
+    node._value = revised_list
+
+def timed(function):
+    gc.collect()
+    start = perf_counter()
+    function()
+    return perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--paths", type=int, default=200)
+    parser.add_argument("--overlays", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths)
+    tags = [f"tag{idx}" for idx in range(args.items)]
+    first_path = next(iter(spec["paths"]))
+    spec["paths"][first_path]["get"]["tags"] = tags
+    source = json.dumps(spec)
+    schema_class = registry.get("3.0.1")
+
+    amendments = {
+        "__original": list(tags),
+        "__override": [f"new{idx}" for idx in range(args.items // 2)]
+        + [f"__del tag{idx}" for idx in range(0, args.items, 4)],
+    }
+
+    def parse():
+        return schema_class(json.loads(source), validation="once")
+
+    print(f"Amending an array of {args.items} items with {len(amendments['__override'])} values")
+    root = parse()
+    legacy = timed(lambda: legacy_amend_array(root.paths[first_path].get.tags, amendments))
+    expected = root.paths[first_path].get.tags._raw()
+    root = parse()
+    indexed = timed(lambda: root.paths[first_path].get.tags._amend(amendments))
+    assert root.paths[first_path].get.tags._raw() == expected
+    print(f"  {'compared':16} {legacy * 1000:10.1f}ms")
+    print(f"  {'indexed':16} {indexed * 1000:10.1f}ms")
+
+    overlays = [
+        {"paths": {path: {"summary": {"__override": f"Summary {idx}"}} for path in spec["paths"]}}
+        for idx in range(args.overlays)
+    ]
+    print(f"Applying {args.overlays} overlays to {args.paths} paths")
+    root = parse()
+    sequential = timed(lambda: [root._amend(overlay) for overlay in overlays])
+    root = parse()
+    validated = timed(lambda: apply_overlays(root, overlays))
+    root = parse()
+    single_pass = timed(lambda: apply_overlays(root, overlays, validate=False))
+    print(f"  {'_amend per file':16} {sequential * 1000:10.1f}ms")
+    print(f"  {'one pass':16} {single_pass * 1000:10.1f}ms")
+    print(f"  {'validated':16} {validated * 1000:10.1f}ms")
+
+if __name__ == "__main__":
+    main()
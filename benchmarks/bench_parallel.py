@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+
+"""Compare serial parsing with parsing in a process pool.
+
+Usage::
+
+    python -m benchmarks.bench_parallel --paths 1000 --workers 2 4
+"""
+
+import os
+import argparse
+from time import perf_counter
+
+from oaspec.spec import OASpecParser
+
+from .generator import generate_spec
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--validation", default="once")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, os.cpu_count() or 1])
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    spec_parser = OASpecParser(spec)
+
+    print(f"Parsing a generated spec with {args.paths} paths (validation={args.validation!r})")
+    serial_time = None
+    for workers in [1] + args.workers:
+        start = perf_counter()
+        spec_parser.parse_spec(validation=args.validation, workers=workers)
+        elapsed = perf_counter() - start
+
+        serial_time = serial_time or elapsed
+        print(f"  workers={workers:<3} {elapsed:8.3f}s  speedup {serial_time / elapsed:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+"""Measure the resolution of every `$ref` of a large spec.
+
+Usage::
+
+    python -m benchmarks.bench_refs --paths 1000
+"""
+
+import argparse
+from time import perf_counter
+
+from oaspec.schema import registry
+from oaspec.schema.refs import reference_of, unescape_token
+
+from .generator import generate_spec
+
+def walk_pointer(root, ref):
+    # Resolve a reference the way callers had to before the index: walking the
+    # pointer from the root, again for every reference of a chain
+    while ref is not None:
+        node = root
+        for token in ref[2:].split("/"):
+            node = node[unescape_token(token)]
+        ref = reference_of(node)
+
+    return node
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--schemas", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    # Chains of references, as produced by bundlers and aliases
+    for idx in range(args.schemas):
+        spec["components"]["schemas"][f"Alias{idx}"] = {"$ref": f"#/components/schemas/Model{idx}"}
+        spec["components"]["schemas"][f"Model{idx}"]["properties"]["parent"] = {
+            "$ref": f"#/components/schemas/Alias{(idx + 1) % args.schemas}"
+        }
+
+    root = registry.get(spec["openapi"])(spec, validation="once")
+    references = [node for _, node in root._walk() if reference_of(node) is not None]
+
+    print(f"Resolving {len(references)} references of a generated spec with {args.paths} paths")
+
+    start = perf_counter()
+    expected = [walk_pointer(root, reference_of(node)) for node in references]
+    walk_time = perf_counter() - start
+
+    start = perf_counter()
+    resolved = [node._resolve() for node in references]
+    first_time = perf_counter() - start
+
+    start = perf_counter()
+    resolved = [node._resolve() for node in references]
+    memo_time = perf_counter() - start
+
+    assert all(a is b for a, b in zip(expected, resolved))
+
+    start = perf_counter()
+    walked = sum(1 for _ in root._walk(follow_refs=True))
+    follow_time = perf_counter() - start
+
+    print(f"  pointer walks  {walk_time * 1000:8.1f}ms")
+    print(f"  _resolve()     {first_time * 1000:8.1f}ms (index built)   {memo_time * 1000:8.1f}ms (memoized)")
+    print(f"  _walk(follow_refs=True) over {walked} nodes {follow_time * 1000:8.1f}ms")
+
+if __name__ == "__main__":
+    main()
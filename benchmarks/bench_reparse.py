@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+
+"""Measure the latency of reparsing a large spec after a one-line edit.
+
+Usage::
+
+    python -m benchmarks.bench_reparse --paths 1000
+"""
+
+import argparse
+from copy import deepcopy
+from time import perf_counter
+
+from oaspec.schema import registry, reparse
+
+from .generator import generate_spec
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--validation", default="once")
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    schema_class = registry.get(spec["openapi"])
+
+    print(f"Editing one operation summary of a generated spec with {args.paths} paths "
+          f"(validation={args.validation!r})")
+
+    for zero_copy in (False, True):
+        mode = "zero-copy" if zero_copy else "copy"
+
+        start = perf_counter()
+        previous = schema_class(deepcopy(spec), validation=args.validation, zero_copy=zero_copy)
+        full_time = perf_counter() - start
+
+        edited = deepcopy(spec)
+        path_item = edited["paths"][f"/resource{args.paths // 2}/{{itemId}}"]
+        next(operation for key, operation in path_item.items() if key != "parameters")["summary"] = "Edited"
+
+        stats = dict()
+        start = perf_counter()
+        reparse(previous, edited, validation=args.validation, stats=stats)
+        reparse_time = perf_counter() - start
+
+        print(
+            f"  {mode:10} full parse {full_time * 1000:9.1f}ms   reparse {reparse_time * 1000:7.1f}ms   "
+            f"reused {stats['reused']}, rebuilt {stats['rebuilt']}, built {stats['built']}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Compare matching request paths with a `Router` and with a scan of regular expressions.
+
+Usage::
+
+    python -m benchmarks.bench_router --templates 3000 --requests 50000
+"""
+
+import argparse
+import gc
+import random
+import re
+from time import perf_counter
+
+from oaspec.schema import registry
+from oaspec.runtime import Router
+
+def generate_templates(count, seed=0):
+    """Generate path templates shaped like the ones of a large gateway.
+
+    Templates are spread over services and resources, with static and templated
+    segments at several depths.
+
+    Returns:
+        list: (template, sample path) tuples.
+    """
+    rng = random.Random(seed)
+    shapes = (
+        "/{service}/{resource}",
+        "/{service}/{resource}/{{id}}",
+        "/{service}/{resource}/{{id}}/keys/{{keyId}}",
+        "/{service}/{resource}/{{id}}/{child}",
+        "/{service}/{resource}/search",
+    )
+
+    templates = []
+    seen = set()
+    while len(templates) < count:
+        service, resource, child = (f"svc{rng.randrange(50)}", f"res{rng.randrange(200)}", f"sub{rng.randrange(5)}")
+        template = rng.choice(shapes).format(service=service, resource=resource, child=child)
+        if template in seen:
+            continue
+
+        seen.add(template)
+        sample = template.replace("{id}", str(rng.randrange(10 ** 6))).replace("{keyId}", "k" + str(rng.randrange(100)))
+        templates.append((template, sample))
+
+    return templates
+
+def build_root(templates):
+    paths = {
+        template: {"get": {"responses": {"200": {"description": "OK"}}}}
+        for template, _ in templates
+    }
+    spec = {"openapi": "3.0.1", "info": {"title": "Routes", "version": "1.0.0"}, "paths": paths}
+
+    return registry.get("3.0.1")(spec, validation="once")
+
+def compile_patterns(templates):
+    # What matching takes without a router: one regular expression per template
+    patterns = []
+    for template, _ in templates:
+        parts = re.split(r"{([^{}/]+)}", template)
+        source = "".join(re.escape(part) if i % 2 == 0 else "(?P<{}>[^/]+)".format(part) for i, part in enumerate(parts))
+        patterns.append((re.compile(source + r"\Z"), template))
+
+    return patterns
+
+def scan(patterns, path):
+    for pattern, template in patterns:
+        match = pattern.match(path)
+        if match is not None:
+            return template, match.groupdict()
+
+    return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates", type=int, default=3000)
+    parser.add_argument("--requests", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    templates = generate_templates(args.templates)
+    rng = random.Random(1)
+    requests = [rng.choice(templates) for _ in range(args.requests)]
+
+    root = build_root(templates)
+    start = perf_counter()
+    router = Router(root)
+    build_time = perf_counter() - start
+    patterns = compile_patterns(templates)
+
+    # The scan returns the first template listed that matches, which is not always
+    # the static one: only the router is checked
+    for template, path in requests[:1000]:
+        assert router.match("GET", path).route.path == template
+
+    print(f"Matching {args.requests} paths against {args.templates} templates "
+          f"(router built in {build_time * 1000:.1f}ms)")
+    timings = (
+        ("router", lambda path: router.match("GET", path)),
+        ("regex scan", lambda path: scan(patterns, path)),
+    )
+    for name, function in timings:
+        gc.collect()
+        start = perf_counter()
+        for _, path in requests:
+            function(path)
+        elapsed = perf_counter() - start
+        print(f"  {name:12} {elapsed * 1e6 / args.requests:8.2f}us per path  {args.requests / elapsed:10.0f} paths/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Compare reloading a parsed specification from a snapshot with parsing and unpickling it.
+
+Usage::
+
+    python -m benchmarks.bench_snapshot --paths 500
+"""
+
+import argparse
+import gc
+import json
+import pickle
+from time import perf_counter
+
+from oaspec.schema import registry, load_snapshot
+
+from .generator import generate_spec
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=500)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    source = json.dumps(generate_spec(paths=args.paths, schemas=args.schemas))
+    schema_class = registry.get("3.0.1")
+
+    root = schema_class(json.loads(source))
+    snapshot = root._dump_snapshot()
+    pickled = pickle.dumps(root, protocol=pickle.HIGHEST_PROTOCOL)
+    assert load_snapshot(snapshot)._raw() == root._raw()
+
+    timings = [
+        ("parse", len(source), lambda: schema_class(json.loads(source))),
+        ("parse, zero copy", len(source), lambda: schema_class(json.loads(source), zero_copy=True)),
+        ("pickle.loads", len(pickled), lambda: pickle.loads(pickled)),
+        ("load_snapshot", len(snapshot), lambda: load_snapshot(snapshot)),
+    ]
+
+    print(f"Loading a specification of {args.paths} paths")
+    for name, size, function in timings:
+        elapsed = best_time(function, args.repeat)
+        print(f"  {name:18} {elapsed * 1000:9.1f}ms  input {size / 2 ** 10:8.1f}KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+
+"""Compare the peak memory of loading and parsing a file with streaming it.
+
+Usage::
+
+    python -m benchmarks.bench_stream --paths 1000
+"""
+
+import gc
+import json
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+from oaspec.schema import registry
+from oaspec.spec import OASpecStreamParser
+from oaspec.utils import yaml
+
+from .generator import generate_spec
+
+def load_and_parse(spec_file):
+    with spec_file.open("r", encoding="utf-8") as f:
+        raw_spec = yaml.load(f)
+
+    return registry.get(raw_spec["openapi"])(raw_spec, validation="once", zero_copy=True)
+
+def stream_parse(spec_file):
+    return OASpecStreamParser(spec_file).parse_spec()
+
+def stream_paths(spec_file):
+    for _ in OASpecStreamParser(spec_file).iter_paths():
+        pass
+
+def measure(func, spec_file):
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    result = func(spec_file)
+    elapsed = perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return elapsed, retained, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--schemas", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    # Build the class tree before measuring
+    registry.get(spec["openapi"])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"Parsing a generated spec with {args.paths} paths (validation='once')")
+        print(f"  {'format':7} {'method':16} {'time':>9} {'retained':>12} {'peak':>12}")
+
+        for suffix in (".json", ".yaml"):
+            spec_file = Path(tmp_dir) / f"spec{suffix}"
+            with spec_file.open("w", encoding="utf-8") as f:
+                if suffix == ".json":
+                    json.dump(spec, f, indent=2)
+                else:
+                    yaml.dump(spec, f)
+
+            for name, func in (
+                ("load + parse", load_and_parse),
+                ("stream", stream_parse),
+                ("stream paths", stream_paths),
+            ):
+                elapsed, retained, peak = measure(func, spec_file)
+                print(
+                    f"  {suffix[1:]:7} {name:16} {elapsed:8.3f}s "
+                    f"{retained / 2**20:10.1f}MB {peak / 2**20:10.1f}MB"
+                )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Measure the throughput of validating HTTP traffic against a compiled specification.
+
+Usage::
+
+    python -m benchmarks.bench_traffic --paths 200 --requests 20000
+"""
+
+import argparse
+import gc
+import json
+import random
+from time import perf_counter
+
+import jsonschema
+
+from oaspec.schema import registry
+from oaspec.runtime import TrafficValidator
+
+from .generator import generate_spec
+
+def generate_traffic(spec, count, seed=0):
+    """Generate requests and responses for the operations of a generated specification.
+
+    Returns:
+        list: (method, path, query, body, response body) tuples.
+    """
+    rng = random.Random(seed)
+    operations = [
+        (path, method)
+        for path, path_item in spec["paths"].items()
+        for method in path_item
+        if method != "parameters"
+    ]
+
+    traffic = []
+    for idx in range(count):
+        path, method = rng.choice(operations)
+        model = {"id": idx, "name": f"item{idx}", "tags": ["a", "b"], "status": "active"}
+        body = json.dumps(model) if method in {"post", "put"} else None
+        traffic.append((method, path.replace("{itemId}", str(idx)), {"limit": "10"}, body, [model]))
+
+    return traffic
+
+def validate_uncompiled(spec, path_template, method, query, body):
+    # What validating costs without compiling: resolving the operation and building
+    # validators for its raw schemas, with references resolved on every call
+    resolver = jsonschema.RefResolver("", spec)
+    operation = spec["paths"][path_template][method]
+    errors = []
+    for parameter in operation["parameters"]:
+        if "$ref" in parameter:
+            parameter = resolver.resolve(parameter["$ref"])[1]
+        value = int(query[parameter["name"]])
+        errors.extend(jsonschema.Draft4Validator(parameter["schema"], resolver=resolver).iter_errors(value))
+    if body is not None:
+        schema = operation["requestBody"]["content"]["application/json"]["schema"]
+        errors.extend(jsonschema.Draft4Validator(schema, resolver=resolver).iter_errors(json.loads(body)))
+
+    return errors
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=200)
+    parser.add_argument("--schemas", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    root = registry.get("3.0.1")(json.loads(json.dumps(spec)))
+
+    start = perf_counter()
+    validator = TrafficValidator(root)
+    compile_time = perf_counter() - start
+
+    traffic = generate_traffic(spec, args.requests)
+    headers = {"Content-Type": "application/json"}
+
+    def requests():
+        for method, path, query, body, _ in traffic:
+            assert not validator.validate_request(method, path, headers, query, body)
+
+    def responses():
+        for method, path, _, _, response in traffic:
+            assert not validator.validate_response(method, path, 200, headers, response)
+
+    def uncompiled():
+        for method, path, query, body, _ in traffic:
+            template = path.rsplit("/", 1)[0] + "/{itemId}"
+            assert not validate_uncompiled(spec, template, method, query, body)
+
+    print(f"Compiled {sum(len(item) for item in validator.operations.values())} operations "
+          f"of {args.paths} paths in {compile_time * 1000:.1f}ms")
+    for name, function in (("requests", requests), ("responses", responses), ("requests, uncompiled", uncompiled)):
+        gc.collect()
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        print(f"  {name:22} {args.requests / elapsed:10.0f} req/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Compare per-node validation with validating the whole document once.
+
+Usage::
+
+    python -m benchmarks.bench_validation --paths 1000
+"""
+
+import argparse
+from time import perf_counter
+
+from oaspec.schema import registry
+
+from .generator import generate_spec
+
+def time_parse(schema_class, spec, validation, repeat):
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        schema_class(spec, validation=validation)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(paths=args.paths, schemas=args.schemas)
+    schema_class = registry.get(spec["openapi"])
+
+    print(f"Parsing a generated spec with {args.paths} paths (best of {args.repeat})")
+    results = {}
+    for validation in ("node", "once"):
+        results[validation] = time_parse(schema_class, spec, validation, args.repeat)
+        print(f"  validation={validation!r:8} {results[validation]:8.3f}s")
+
+    print(f"  speedup: {results['node'] / results['once']:.2f}x")
+
+if __name__ == "__main__":
+    main()
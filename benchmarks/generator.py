@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import random
+from copy import deepcopy
+
+HTTP_METHODS = ("get", "post", "put", "delete")
+
+def generate_spec(paths=100, schemas=20, seed=0, operations=4, depth=0, ref_density=1.0, unions=0):
+    """Generate a deterministic, valid OpenAPI 3.0.1 specification.
+
+    Every path has a path parameter and up to four operations. Operations reference
+    the shared component schemas, parameters and responses, and also carry inline
+    schemas so that the generated document exercises both `$ref` and schema parsing.
+
+    The default values of the shape options generate the same specifications as
+    before they were added, so results of earlier benchmark runs stay comparable.
+
+    Parameters:
+        paths: The number of entries in the `paths` object.
+        schemas: The number of entries in `components.schemas`.
+        seed: The seed used to pick methods and schema references.
+        operations: The maximum number of operations of a path item, up to four.
+        depth: The number of levels of nested object properties of each component schema.
+        ref_density: The share of the references of operations that are kept as
+            `$ref`, between 0 and 1. The other ones are replaced by a copy of
+            their target.
+        unions: The number of `oneOf` union schemas added to the components. When
+            there are some, request bodies and half of the responses use them.
+
+    Returns:
+        dict: The generated specification.
+    """
+    if not 1 <= operations <= len(HTTP_METHODS):
+        raise ValueError(f"operations must be between 1 and {len(HTTP_METHODS)}")
+    if not 0 <= ref_density <= 1:
+        raise ValueError("ref_density must be between 0 and 1")
+
+    rng = random.Random(seed)
+    # Separate generators for the shape options, so that they do not change the
+    # choices made by `rng`
+    ref_rng = random.Random(f"{seed}/refs")
+    union_rng = random.Random(f"{seed}/unions")
+
+    spec = {
+        "openapi": "3.0.1",
+        "info": {
+            "title": "Generated API",
+            "version": "1.0.0",
+            "description": f"A generated API with {paths} paths",
+        },
+        "servers": [{"url": "https://api.example.com/v1"}],
+        "paths": {},
+        "components": {
+            "schemas": {},
+            "parameters": {
+                "limit": {
+                    "name": "limit",
+                    "in": "query",
+                    "required": False,
+                    "schema": {"type": "integer", "format": "int32"},
+                },
+            },
+            "responses": {
+                "Error": {
+                    "description": "unexpected error",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/Error"},
+                        },
+                    },
+                },
+            },
+        },
+    }
+
+    component_schemas = spec["components"]["schemas"]
+    component_schemas["Error"] = {
+        "type": "object",
+        "required": ["code", "message"],
+        "properties": {
+            "code": {"type": "integer", "format": "int32"},
+            "message": {"type": "string"},
+        },
+    }
+    for idx in range(schemas):
+        component_schemas[f"Model{idx}"] = {
+            "type": "object",
+            "required": ["id"],
+            "properties": {
+                "id": {"type": "integer", "format": "int64"},
+                "name": {"type": "string"},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "status": {"type": "string", "enum": ["active", "inactive"]},
+            },
+        }
+        if depth:
+            component_schemas[f"Model{idx}"]["properties"]["details"] = _generate_nested_schema(depth)
+
+    union_refs = []
+    for idx in range(unions):
+        members = union_rng.sample(range(schemas), min(schemas, 3)) if schemas else []
+        component_schemas[f"Union{idx}"] = {
+            "oneOf": [{"$ref": f"#/components/schemas/Model{member}"} for member in members]
+            or [{"$ref": "#/components/schemas/Error"}],
+        }
+        union_refs.append(f"#/components/schemas/Union{idx}")
+
+    def reference(ref):
+        # A `$ref`, or a copy of its target for the share of references not kept
+        if ref_density >= 1 or ref_rng.random() < ref_density:
+            return {"$ref": ref}
+
+        target = spec
+        for token in ref[2:].split("/"):
+            target = target[token]
+
+        return deepcopy(target)
+
+    for idx in range(paths):
+        model_ref = "#/components/schemas/Model{}".format(rng.randrange(schemas)) if schemas else "#/components/schemas/Error"
+        methods = HTTP_METHODS[:rng.randint(1, operations)]
+
+        path_item = {
+            "parameters": [
+                {
+                    "name": "itemId",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                },
+            ],
+        }
+        for method in methods:
+            union_ref = union_rng.choice(union_refs) if union_refs else None
+            path_item[method] = _generate_operation(idx, method, model_ref, union_ref, reference)
+
+        spec["paths"][f"/resource{idx}/{{itemId}}"] = path_item
+
+    return spec
+
+def _generate_nested_schema(depth):
+    schema = {"type": "string"}
+    for level in range(depth, 0, -1):
+        schema = {
+            "type": "object",
+            "properties": {
+                "level": {"type": "integer", "description": f"Nesting level {level}"},
+                "note": {"type": "string"},
+                "details": schema,
+            },
+        }
+
+    return schema
+
+def _generate_operation(idx, method, model_ref, union_ref, reference):
+    items_ref = union_ref if union_ref is not None and idx % 2 == 0 else model_ref
+    body_ref = union_ref if union_ref is not None else model_ref
+
+    operation = {
+        "operationId": f"{method}Resource{idx}",
+        "summary": f"{method.upper()} resource {idx}",
+        "tags": [f"tag{idx % 10}"],
+        "parameters": [
+            reference("#/components/parameters/limit"),
+        ],
+        "responses": {
+            "200": {
+                "description": "successful operation",
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "array",
+                            "items": reference(items_ref),
+                        },
+                    },
+                },
+            },
+            "default": reference("#/components/responses/Error"),
+        },
+    }
+
+    if method in {"post", "put"}:
+        operation["requestBody"] = {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": reference(body_ref),
+                },
+            },
+        }
+
+    return operation
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Time and measure the memory of each phase of processing a generated specification.
+
+The phases are run on a specification from `benchmarks.generator`, whose shape is
+set by the command line options. Each phase is timed over several runs, then run
+once more under `tracemalloc` to measure the peak memory it allocates. Results can
+be saved as JSON and compared with the results of an earlier run, in which case
+the phases that got slower or use more memory than a threshold are reported and
+the command exits with status 1.
+
+Usage::
+
+    python -m benchmarks.suite --paths 500 --output baseline.json
+    python -m benchmarks.suite --paths 500 --compare baseline.json
+    python -m benchmarks.suite --compare baseline.json current.json
+"""
+
+import sys
+import gc
+import json
+import argparse
+import platform
+import tracemalloc
+from io import StringIO
+from datetime import datetime, timezone
+from time import perf_counter
+
+from oaspec.__version__ import __version__
+from oaspec.schema import Schema, build_schema, registry
+from oaspec.schema.refs import walk
+from oaspec.utils import yaml, loaders
+
+from .generator import generate_spec
+
+# The version of the layout of result files
+RESULTS_FORMAT = 1
+
+# The options of `generate_spec` set from the command line
+GENERATOR_OPTIONS = ("paths", "schemas", "seed", "operations", "depth", "ref_density", "unions")
+
+class Phase(object):
+    """A step of processing a specification, timed and measured by the suite.
+
+    Parameters:
+        name: The name of the phase in the results.
+        run: The function measured, called with the value returned by `setup`.
+        setup: A function preparing the input of `run`, excluded from the measures.
+            Called before every run, since some phases modify their input.
+    """
+
+    def __init__(self, name, run, setup=None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+
+    def measure(self, repeat):
+        """Run the phase `repeat` times, then once more with `tracemalloc`.
+
+        Returns:
+            dict: The best and mean `time` of the runs, in seconds, and the
+                `peak_memory` allocated by the phase, in bytes.
+        """
+        times = []
+        for _ in range(repeat):
+            value = self.setup()
+            gc.collect()
+            start = perf_counter()
+            self.run(value)
+            times.append(perf_counter() - start)
+            del value
+
+        value = self.setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            self.run(value)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "time": min(times),
+            "mean_time": sum(times) / len(times),
+            "peak_memory": peak_memory,
+        }
+
+def build_phases(spec):
+    """Create the phases of the suite for a specification.
+
+    Parameters:
+        spec: The generated specification.
+
+    Returns:
+        list: The `Phase` objects, in the order they are run.
+    """
+    schema_class = registry.get(spec["openapi"])
+    schema_source = (registry.specs_dir / f"oas-{spec['openapi']}.json").read_bytes()
+
+    json_source = json.dumps(spec, indent=2).encode("utf-8")
+    buffer = StringIO()
+    yaml.dump(spec, buffer)
+    yaml_source = buffer.getvalue().encode("utf-8")
+
+    def parse(**kwargs):
+        return lambda: schema_class(json.loads(json_source), **kwargs)
+
+    def amend(root):
+        for path_item in root.paths._object_properties.values():
+            path_item._amend({"summary": {"__override": "Amended"}})
+
+    return [
+        Phase("load_json", lambda _: loaders.load(json_source, "json")),
+        Phase("load_yaml", lambda _: loaders.load(yaml_source, "safe_c")),
+        Phase(
+            "build_schema",
+            lambda validation_schema: build_schema(validation_schema, Schema, type("openapiObject", (Schema,), dict())),
+            lambda: json.loads(schema_source),
+        ),
+        Phase("validate", lambda _: schema_class.validate(spec, True)),
+        Phase("parse", lambda value: schema_class(value), lambda: json.loads(json_source)),
+        Phase("parse_once", lambda value: schema_class(value, validation="once"), lambda: json.loads(json_source)),
+        Phase("materialize", lambda root: sum(1 for _ in walk(root)), parse(lazy=True)),
+        Phase("raw", lambda root: root._raw(), parse()),
+        Phase("amend", amend, parse()),
+        Phase("serialize_json", lambda root: root._dump_json(), parse()),
+        Phase("serialize_yaml", lambda root: root._dump_yaml(), parse()),
+    ]
+
+def run_suite(generator_options, repeat=3, phases=None, report=None):
+    """Run the phases of the suite on a generated specification.
+
+    Parameters:
+        generator_options: The keyword arguments of `generate_spec`.
+        repeat: The number of timed runs of each phase.
+        phases: The names of the phases to run. Defaults to every phase.
+        report: A function called with the name and measures of each phase once
+            it is measured.
+
+    Returns:
+        dict: The results, as stored in result files.
+    """
+    spec = generate_spec(**generator_options)
+    nodes = sum(1 for _ in walk(registry.get(spec["openapi"])(spec)))
+
+    results = {
+        "format": RESULTS_FORMAT,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "oaspec": __version__,
+        },
+        "generator": dict(generator_options),
+        "nodes": nodes,
+        "repeat": repeat,
+        "phases": dict(),
+    }
+
+    for phase in build_phases(spec):
+        if phases is not None and phase.name not in phases:
+            continue
+
+        results["phases"][phase.name] = phase.measure(repeat)
+        if report is not None:
+            report(phase.name, results["phases"][phase.name])
+
+    return results
+
+def compare_results(baseline, current, threshold=0.1, memory_threshold=None, min_time=0.001):
+    """Compare the measures of two runs of the suite, phase by phase.
+
+    Parameters:
+        baseline: The results of the reference run.
+        current: The results of the run being checked.
+        threshold: The relative increase of the best time of a phase above which
+            the phase is flagged as a regression (0.1 for 10%).
+        memory_threshold: The same for the peak memory. Defaults to `threshold`.
+        min_time: Phases faster than this many seconds in both runs are never
+            flagged for their time, since their timings are mostly noise.
+
+    Returns:
+        list: A dict per phase and measure present in both runs, with the `phase`,
+            `metric`, `baseline` and `current` values, their `ratio` and whether
+            it is a `regression`.
+    """
+    if memory_threshold is None:
+        memory_threshold = threshold
+
+    comparison = []
+    for name, current_measures in current["phases"].items():
+        baseline_measures = baseline["phases"].get(name)
+        if baseline_measures is None:
+            continue
+
+        for metric, limit in (("time", threshold), ("peak_memory", memory_threshold)):
+            old, new = baseline_measures[metric], current_measures[metric]
+            ratio = new / old if old else float("inf") if new else 1.0
+            regression = ratio > 1 + limit
+            if metric == "time" and max(old, new) < min_time:
+                regression = False
+
+            comparison.append({
+                "phase": name,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "ratio": ratio,
+                "regression": regression,
+            })
+
+    return comparison
+
+def load_results(path):
+    """Read a result file written by the suite."""
+    with open(path, encoding="utf-8") as f:
+        results = json.load(f)
+
+    if results.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"{path} is not a result file of format {RESULTS_FORMAT}")
+
+    return results
+
+def format_measure(metric, value):
+    if metric == "time":
+        return f"{value * 1000:.1f}ms"
+
+    return f"{value / 2 ** 20:.2f}MB"
+
+def print_comparison(comparison):
+    print(f"  {'phase':16} {'metric':12} {'baseline':>11} {'current':>11} {'change':>8}")
+    for row in comparison:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"  {row['phase']:16} {row['metric']:12} "
+            f"{format_measure(row['metric'], row['baseline']):>11} "
+            f"{format_measure(row['metric'], row['current']):>11} "
+            f"{(row['ratio'] - 1) * 100:+7.1f}%{flag}"
+        )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=200)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--operations", type=int, default=4, help="Maximum number of operations per path")
+    parser.add_argument("--depth", type=int, default=0, help="Nesting depth of the component schemas")
+    parser.add_argument("--ref-density", type=float, default=1.0, help="Share of references kept as $ref")
+    parser.add_argument("--unions", type=int, default=0, help="Number of oneOf union schemas")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--phases", nargs="+", metavar="PHASE", help="Only run these phases")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--compare",
+        nargs="+",
+        metavar="RESULTS",
+        help="Compare with a baseline result file, or compare two result files without running the suite",
+    )
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown flagged as a regression")
+    parser.add_argument("--memory-threshold", type=float, help="Relative memory increase flagged as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline file and an optional file to compare it with")
+
+    if args.compare and len(args.compare) == 2:
+        baseline, results = (load_results(path) for path in args.compare)
+    else:
+        generator_options = {option: getattr(args, option) for option in GENERATOR_OPTIONS}
+        baseline = load_results(args.compare[0]) if args.compare else None
+
+        print("Generating a specification with " + ", ".join(f"{key}={value}" for key, value in generator_options.items()))
+
+        def report(name, measures):
+            print(
+                f"  {name:16} {format_measure('time', measures['time']):>10} "
+                f"(mean {format_measure('time', measures['mean_time'])})  "
+                f"peak memory {format_measure('peak_memory', measures['peak_memory'])}"
+            )
+
+        results = run_suite(generator_options, args.repeat, args.phases, report)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+                f.write("\n")
+
+    if baseline is None:
+        return 0
+
+    if baseline["generator"] != results["generator"]:
+        print("Warning: the results were measured on differently generated specifications")
+
+    comparison = compare_results(baseline, results, args.threshold, args.memory_threshold)
+    print(f"Comparison with the baseline from {baseline['created']}")
+    print_comparison(comparison)
+
+    regressions = [row for row in comparison if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above the threshold")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
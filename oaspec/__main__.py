@@ -25,5 +25,7 @@ from .__version__ import *
 if __name__ != '__main__':
     raise ImportError('Cannot directly import __main__.py')
 
-from .oaspec import main
-main()
+import sys
+
+from .cli import main
+sys.exit(main())
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Validate many specification files with a shared, compiled OAS schema."""
+
+import os
+from pathlib import Path
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+
+import jsonschema
+
+from . import schema
+from .spec import OASpecParser
+
+SPEC_SUFFIXES = {".yaml", ".yml", ".json"}
+
+def find_spec_files(paths):
+    """Expand files and directories into the list of specification files to validate.
+
+    Directories are searched recursively for files with a `.yaml`, `.yml` or
+    `.json` extension. Files named explicitly are always included.
+
+    Parameters:
+        paths: File and directory paths.
+
+    Returns:
+        list: The specification files, in a stable order.
+    """
+    spec_files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            spec_files.extend(sorted(
+                spec_file for spec_file in path.rglob("*")
+                if spec_file.suffix in SPEC_SUFFIXES and spec_file.is_file()
+            ))
+        else:
+            spec_files.append(path)
+
+    return spec_files
+
+def validate_file(spec_file, validation="once", loader=None, profile=False):
+    """Load, parse and validate a single specification file.
+
+    Parameters:
+        spec_file: The path of the specification file.
+        validation: The validation mode, see `OASpecParser.parse_spec`.
+        loader: The loader backend, see `OASpecParser`.
+        profile: Add the parser's statistics to the result, see `OASpecParser`.
+
+    Returns:
+        dict: The result for the file: its path, whether it is valid, the
+            error that made it invalid (with its message, type and location
+            in the specification) and the time it took in seconds. With
+            `profile`, the result also has the `ParseStats.as_dict()` of the file.
+    """
+    start = perf_counter()
+    result = {"file": str(spec_file), "valid": True}
+    stats = schema.ParseStats() if profile else None
+
+    try:
+        OASpecParser(Path(spec_file), loader=loader, profile=stats or False).parse_spec(validation=validation)
+    except jsonschema.ValidationError as e:
+        result["valid"] = False
+        result["error"] = {"type": type(e).__name__, "message": e.message, "path": list(e.path)}
+    except Exception as e:
+        # A single broken file must not stop the validation of the others
+        result["valid"] = False
+        result["error"] = {"type": type(e).__name__, "message": str(e), "path": []}
+
+    result["time"] = perf_counter() - start
+    if stats is not None:
+        result["profile"] = stats.as_dict()
+
+    return result
+
+def validate_files(paths, jobs=1, validation="once", loader=None, profile=False):
+    """Validate specification files, spreading them over a process pool.
+
+    The OAS schemas are compiled once, before the pool starts, so that the workers
+    inherit them or load them from the schema cache instead of compiling them again.
+    Results are generated in the order of the files as soon as they are available.
+
+    Parameters:
+        paths: Specification files and directories containing them.
+        jobs: The number of worker processes. 1 validates the files in the calling
+            process, and 0 uses one process per CPU.
+        validation: The validation mode, see `OASpecParser.parse_spec`.
+        loader: The loader backend, see `OASpecParser`.
+        profile: Add the parser's statistics to each result, see `validate_file`.
+
+    Yields:
+        dict: The result of `validate_file` for each file.
+    """
+    spec_files = find_spec_files(paths)
+    jobs = jobs or os.cpu_count() or 1
+
+    for schema_version in schema.registry.available_versions():
+        schema.registry.get(schema_version)
+
+    if jobs == 1 or len(spec_files) < 2:
+        for spec_file in spec_files:
+            yield validate_file(spec_file, validation, loader, profile)
+        return
+
+    # Small chunks keep the results flowing while amortizing the round trips
+    chunk_size = max(1, min(16, len(spec_files) // (jobs * 8)))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(
+            validate_file,
+            spec_files,
+            [validation] * len(spec_files),
+            [loader] * len(spec_files),
+            [profile] * len(spec_files),
+            chunksize=chunk_size,
+        )
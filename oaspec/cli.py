@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""The `oaspec` command line interface."""
+
+import sys
+import json
+import argparse
+from time import perf_counter
+
+from .__version__ import __version__
+from .utils.loaders import LOADERS
+from .batch import validate_files
+from .schema import ParseStats
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="oaspec", description="Work with OpenAPI 3 specifications.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    validate = commands.add_parser(
+        "validate",
+        help="validate specification files",
+        description=(
+            "Validate specification files and directories of them. One JSON object "
+            "is written per file, and the exit status is 1 if any file is invalid."
+        ),
+    )
+    validate.add_argument("paths", nargs="+", help="specification files or directories")
+    validate.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="the number of worker processes, or 0 for one per CPU (default: 1)",
+    )
+    validate.add_argument(
+        "--validation", choices=("node", "once"), default="once",
+        help="validate every node, or each whole file a single time (default: once)",
+    )
+    validate.add_argument("--loader", choices=LOADERS, help="the loader backend (default: by file format)")
+    validate.add_argument("-q", "--quiet", action="store_true", help="only write the results of invalid files")
+    validate.add_argument(
+        "--profile", action="store_true",
+        help="add timings and parse statistics to the results, and write their totals to stderr",
+    )
+
+    return parser
+
+def validate(args):
+    start = perf_counter()
+    total = invalid = 0
+    stats = ParseStats() if args.profile else None
+
+    results = validate_files(
+        args.paths, jobs=args.jobs, validation=args.validation, loader=args.loader, profile=args.profile
+    )
+    for result in results:
+        total += 1
+        if stats is not None:
+            stats.merge(result["profile"])
+
+        if not result["valid"]:
+            invalid += 1
+        elif args.quiet:
+            continue
+
+        sys.stdout.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+        sys.stdout.flush()
+
+    elapsed = perf_counter() - start
+    if stats is not None:
+        print(stats.report(), file=sys.stderr)
+    print(
+        f"{total} files, {invalid} invalid, {elapsed:.2f}s ({total / elapsed if elapsed else 0:.1f} files/s)",
+        file=sys.stderr
+    )
+
+    return 1 if invalid else 0
+
+def main(argv=None):
+    """Run the command line interface.
+
+    Parameters:
+        argv: The command line arguments, without the program name.
+
+    Returns:
+        int: The exit status.
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == "validate":
+        return validate(args)
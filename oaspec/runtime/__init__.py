@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from .validator import (
+    TrafficValidator,
+    TrafficError,
+    SchemaCompiler,
+)
+
+from .router import (
+    Router,
+    Route,
+    RouteMatch,
+)
+
+__all__ = (
+    "TrafficValidator",
+    "TrafficError",
+    "SchemaCompiler",
+    "Router",
+    "Route",
+    "RouteMatch",
+)
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+import re
+from itertools import product
+from urllib.parse import unquote
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+_TEMPLATE_PARAMETER = re.compile(r"{([^{}/]+)}")
+# The path of a server URL, which may be relative and hold variables in any part
+_URL_PATH = re.compile(r"^(?:[^:/?#{}]*:|{[^{}]*}:)?(?://[^/?#]*)?([^?#]*)")
+
+class Route(object):
+    """An operation of the router.
+
+    Attributes:
+        method: The HTTP method, in lowercase.
+        path: The path template, as written in the `paths` object.
+        server: The base path the route is served under, such as "/v1" (or "").
+        operation: The Operation Object node.
+        path_item: The Path Item Object node the operation belongs to.
+        names: The names of the values captured along the route, in order:
+            ("path", name) for path parameters and ("server", name) for server
+            variables.
+    """
+
+    __slots__ = ("method", "path", "server", "operation", "path_item", "names")
+
+    def __init__(self, method, path, server, operation, path_item, names):
+        self.method = method
+        self.path = path
+        self.server = server
+        self.operation = operation
+        self.path_item = path_item
+        self.names = names
+
+    def __repr__(self):
+        return f"Route({self.method.upper()} {self.server}{self.path})"
+
+class RouteMatch(object):
+    """The route matching a request, and the values captured from its path.
+
+    Attributes:
+        route: The matching `Route`.
+        path_parameters: The values of the path parameters, percent-decoded.
+        server_variables: The values of the server variables of the base path
+            that are not restricted to an enum.
+    """
+
+    __slots__ = ("route", "path_parameters", "server_variables")
+
+    def __init__(self, route, captures):
+        self.route = route
+        self.path_parameters = dict()
+        self.server_variables = dict()
+        for (kind, name), value in zip(route.names, captures):
+            if kind == "path":
+                self.path_parameters[name] = unquote(value)
+            else:
+                self.server_variables[name] = value
+
+    @property
+    def operation(self):
+        return self.route.operation
+
+class _Node(object):
+    # A segment of the tree: static children by segment, children matching a
+    # partially templated segment (such as "{id}.json") in precedence order, as
+    # (sort key, pattern, child) tuples,
+    # the child matching any segment, and the routes ending here by method
+
+    __slots__ = ("static", "patterns", "parameter", "routes")
+
+    def __init__(self):
+        self.static = dict()
+        self.patterns = []
+        self.parameter = None
+        self.routes = dict()
+
+class Router(object):
+    """Maps request paths and methods to the operations of a parsed specification.
+
+    The path templates are compiled into a tree of path segments, so that a path
+    is matched in a number of steps proportional to its number of segments rather
+    than to the number of templates. Base paths of the servers are prefixed to the
+    templates: the most specific `servers` list of an operation, its path item or
+    the document applies. Server variables with an `enum` are expanded into static
+    segments, the other ones match any segment.
+
+    Precedence is deterministic: at each segment, a static segment is tried first,
+    then partially templated segments (the ones with the most literal characters
+    first), then a segment that is a single template. When a more specific branch
+    does not lead to a route, the next one is tried. The path is matched before the
+    method: a request whose method is not served by the matching path does not
+    match another template. Templates whose parameter
+    names are the only difference designate the same route, the first one listed
+    in the `paths` object is kept.
+
+    Parameters:
+        root: The parsed `openapiObject`.
+        servers: Whether request paths include the base paths of the servers.
+    """
+
+    def __init__(self, root, servers=True):
+        self.root = _Node()
+        self.routes = []
+
+        root_servers = _base_paths(root) if servers else None
+        for path, path_item in resolved_items(root, "paths"):
+            path_item = path_item._resolve()
+            item_servers = (_base_paths(path_item) or root_servers) if servers else None
+            for method, operation in path_item._object_properties.items():
+                if method not in HTTP_METHODS:
+                    continue
+
+                operation_servers = (_base_paths(operation) or item_servers) if servers else None
+                for base_path in operation_servers or [("", ())]:
+                    self.add(method, path, operation, path_item, base_path)
+
+    def add(self, method, path, operation, path_item=None, base_path=("", ())):
+        """Add a route to the tree.
+
+        Parameters:
+            method: The HTTP method.
+            path: The path template.
+            operation: The Operation Object node.
+            path_item: The Path Item Object node.
+            base_path: The server base path and its segments, see `_base_paths`.
+
+        Returns:
+            Route: The route, or None if an equivalent route was already added.
+        """
+        server, server_segments = base_path
+        names = []
+        node = self.root
+        for kind, segment in (*server_segments, *(("path", segment) for segment in _split(path))):
+            parts = _TEMPLATE_PARAMETER.split(segment)
+            if len(parts) == 1:
+                node = node.static.setdefault(segment, _Node())
+                continue
+
+            names.extend((kind, name) for name in parts[1::2])
+            if parts[0] == parts[2] == "" and len(parts) == 3:
+                if node.parameter is None:
+                    node.parameter = _Node()
+                node = node.parameter
+            else:
+                node = self._pattern_child(node, parts)
+
+        method = method.lower()
+        if method in node.routes:
+            return None
+
+        route = node.routes[method] = Route(method, path, server, operation, path_item, tuple(names))
+        self.routes.append(route)
+        return route
+
+    @staticmethod
+    def _pattern_child(node, parts):
+        # The child for a partially templated segment, shared by the segments that
+        # only differ by their parameter names
+        source = "".join(re.escape(part) if i % 2 == 0 else "([^/]+?)" for i, part in enumerate(parts))
+        for _, pattern, child in node.patterns:
+            if pattern.pattern == source:
+                return child
+
+        child = _Node()
+        node.patterns.append((-len("".join(parts[::2])), re.compile(source), child))
+        # Most literal characters first, then by pattern for a stable order
+        node.patterns.sort(key=lambda item: (item[0], item[1].pattern))
+        return child
+
+    def lookup(self, path):
+        """Find the routes of a path.
+
+        Returns:
+            tuple: The routes by method and the values captured along the path,
+                or None and None if no template matches the path.
+        """
+        segments = _split(path)
+        end = len(segments)
+        # Depth-first, in precedence order: the last branch pushed is tried first
+        stack = [(self.root, 0, ())]
+        while stack:
+            node, index, captures = stack.pop()
+            if index == end:
+                if node.routes:
+                    return node.routes, captures
+                continue
+
+            segment = segments[index]
+            if node.parameter is not None and segment:
+                stack.append((node.parameter, index + 1, (*captures, segment)))
+            for _, pattern, child in reversed(node.patterns):
+                match = pattern.fullmatch(segment)
+                if match is not None:
+                    stack.append((child, index + 1, (*captures, *match.groups())))
+            child = node.static.get(segment)
+            if child is not None:
+                stack.append((child, index + 1, captures))
+
+        return None, None
+
+    def match(self, method, path):
+        """Find the route of a request.
+
+        Parameters:
+            method: The HTTP method of the request.
+            path: The path of the request URL, without the query string.
+
+        Returns:
+            RouteMatch: The matching route and its captured values, or None.
+        """
+        routes, captures = self.lookup(path)
+        if routes is None:
+            return None
+
+        route = routes.get(method.lower())
+        if route is None:
+            return None
+
+        return RouteMatch(route, captures)
+
+    def allowed_methods(self, path):
+        """Return the methods of the routes matching a path, in lowercase."""
+        routes, _ = self.lookup(path)
+        return sorted(routes) if routes is not None else []
+
+def _split(path):
+    # "/pets/{petId}" -> ["pets", "{petId}"]; "/" -> [""]
+    return path[1:].split("/") if path.startswith("/") else path.split("/")
+
+def _base_paths(node):
+    """Return the base paths of the servers listed by a node, if it lists any.
+
+    Returns:
+        list: (base path, segments) tuples, where the segments are (kind, text)
+            tuples ready to be added to the tree. Server variables with an `enum`
+            are expanded into one base path per value.
+    """
+    servers = node._object_properties.get("servers")
+    if servers is None:
+        return None
+
+    base_paths = []
+    for server in servers._raw() or ():
+        path = _URL_PATH.match(server.get("url", "")).group(1).rstrip("/")
+        variables = server.get("variables") or {}
+        names = [name for name in _TEMPLATE_PARAMETER.findall(path) if variables.get(name, {}).get("enum")]
+        for values in product(*(variables[name]["enum"] for name in names)):
+            expanded = path
+            for name, value in zip(names, values):
+                expanded = expanded.replace("{" + name + "}", str(value))
+            expanded = expanded.rstrip("/")
+
+            segments = tuple(("server", segment) for segment in _split(expanded)) if expanded else ()
+            if (expanded, segments) not in base_paths:
+                base_paths.append((expanded, segments))
+
+    return base_paths or None
+
+def resolved_items(node, key):
+    """Return the items of a mapping child of a node, like `paths` or `headers`.
+
+    A child that is a Reference object is resolved first. Without the child, there
+    are no items.
+    """
+    child = node._object_properties.get(key)
+    if child is None:
+        return ()
+
+    return child._resolve()._object_properties.items()
@@ -0,0 +1,466 @@
+# -*- coding: utf-8 -*-
+
+import json
+from urllib.parse import unquote
+
+import jsonschema
+
+from ..schema.refs import escape_token, unescape_token
+from .router import HTTP_METHODS, Router, RouteMatch, resolved_items
+
+# The keywords of a Schema Object whose values are subschemas, or lists or mappings of them
+_SUBSCHEMA_KEYWORDS = ("items", "additionalProperties", "not")
+_SUBSCHEMA_LIST_KEYWORDS = ("allOf", "anyOf", "oneOf")
+_SUBSCHEMA_MAPPING_KEYWORDS = ("properties",)
+
+class TrafficError(object):
+    """A reason an HTTP request or response does not match its specification.
+
+    Attributes:
+        location: Where the error is, such as ("query", "limit") or ("body", "items", 0).
+        message: The description of the error.
+    """
+
+    __slots__ = ("location", "message")
+
+    def __init__(self, location, message):
+        self.location = tuple(location)
+        self.message = message
+
+    def __eq__(self, other):
+        return isinstance(other, TrafficError) and (self.location, self.message) == (other.location, other.message)
+
+    def __repr__(self):
+        return "TrafficError({!r}, {!r})".format(self.location, self.message)
+
+class SchemaCompiler(object):
+    """Turns the Schema Objects of a parsed specification into JSON schemas.
+
+    OpenAPI schemas are a variant of JSON Schema: `nullable` is translated into a
+    "null" type (or an `anyOf` with one, for schemas without a type), and `$ref`s
+    are replaced by the schema they designate, so that validators do not resolve
+    them on every call. References are followed with `Schema._resolve`'s index,
+    whatever section of the document they point into, and references to missing
+    targets raise an `OASpecParserError`. Recursive references are kept, and
+    resolved against the converted schemas held by `resolver`. Converted schemas
+    are memoized by reference, so shared components are converted once.
+
+    Parameters:
+        root: The parsed `openapiObject`.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._converted = dict()
+
+        # The converted schemas by JSON pointer, for the references left in them
+        self._document = dict()
+        self.resolver = jsonschema.RefResolver("", self._document)
+
+        components = root._object_properties.get("components")
+        schemas = components._object_properties.get("schemas") if components is not None else None
+        if schemas is not None:
+            for name in schemas._object_properties:
+                self.resolve_ref("#/components/schemas/" + escape_token(name), ())
+
+    def compile(self, schema):
+        """Convert the raw value of a Schema Object (or Reference Object)."""
+        return self.convert(schema, ())
+
+    def convert(self, schema, stack):
+        if not isinstance(schema, dict):
+            return schema
+
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            return self.resolve_ref(ref, stack)
+
+        converted = dict(schema)
+        for keyword in _SUBSCHEMA_KEYWORDS:
+            if isinstance(converted.get(keyword), dict):
+                converted[keyword] = self.convert(converted[keyword], stack)
+        for keyword in _SUBSCHEMA_LIST_KEYWORDS:
+            if isinstance(converted.get(keyword), list):
+                converted[keyword] = [self.convert(subschema, stack) for subschema in converted[keyword]]
+        for keyword in _SUBSCHEMA_MAPPING_KEYWORDS:
+            if isinstance(converted.get(keyword), dict):
+                converted[keyword] = {
+                    key: self.convert(subschema, stack) for key, subschema in converted[keyword].items()
+                }
+
+        if converted.pop("nullable", False) is True:
+            if "type" in converted:
+                converted["type"] = [converted["type"], "null"]
+                if "enum" in converted and None not in converted["enum"]:
+                    converted["enum"] = [*converted["enum"], None]
+            else:
+                # Without a type, null is allowed besides the values the schema allows
+                converted = {"anyOf": [converted, {"type": "null"}]}
+
+        return converted
+
+    def resolve_ref(self, ref, stack):
+        converted = self._converted.get(ref)
+        if converted is not None:
+            return converted
+
+        if ref in stack:
+            # Recursive schemas are resolved when validating
+            return {"$ref": ref}
+
+        converted = self.convert(self.root._ref_index.resolve(ref)._raw(), (*stack, ref))
+        self._store(ref, converted)
+        if not stack:
+            # Conversions within a recursion may keep references to the schemas
+            # being converted, which are only complete at the top of the stack
+            self._converted[ref] = converted
+
+        return converted
+
+    def _store(self, ref, converted):
+        # Make a converted schema available to `resolver` under its reference
+        container = self._document
+        *parents, name = [unescape_token(token) for token in unquote(ref).split("/")[1:]]
+        for token in parents:
+            container = container.setdefault(token, dict())
+        container[name] = converted
+
+class Parameter(object):
+    """A compiled Parameter Object.
+
+    Attributes:
+        name: The name of the parameter (lowercase for headers).
+        location: "path", "query", "header" or "cookie".
+        required: Whether the parameter must be present.
+        schema: The converted JSON schema of the parameter's value.
+        validator: The jsonschema validator of `schema`.
+    """
+
+    def __init__(self, raw, compiler, format_checker=None):
+        self.location = raw["in"]
+        self.name = raw["name"].lower() if self.location == "header" else raw["name"]
+        self.required = raw.get("required", self.location == "path")
+        self.schema = compiler.compile(raw.get("schema", {}))
+        self.validator = _validator(self.schema, compiler, format_checker)
+
+    def validate(self, value, errors):
+        value = coerce(value, self.schema)
+        location = (self.location, self.name)
+        for error in self.validator.iter_errors(value):
+            errors.append(TrafficError((*location, *error.path), error.message))
+
+class Content(object):
+    """The compiled media types of a Request Body or Response Object.
+
+    Parameters:
+        content: The raw `content` mapping.
+        compiler: The `SchemaCompiler` of the specification.
+    """
+
+    def __init__(self, content, compiler, format_checker=None):
+        self.media_types = dict()
+        for media_type, media_type_object in (content or {}).items():
+            schema = media_type_object.get("schema")
+            if schema is not None:
+                validator = _validator(compiler.compile(schema), compiler, format_checker)
+            else:
+                validator = None
+            self.media_types[media_type.lower()] = validator
+
+    def validate(self, content_type, body, errors):
+        if not self.media_types:
+            return
+
+        media_type = (content_type or "").split(";", 1)[0].strip().lower()
+        for candidate in (media_type, media_type.split("/", 1)[0] + "/*", "*/*"):
+            if candidate in self.media_types:
+                validator = self.media_types[candidate]
+                break
+        else:
+            errors.append(TrafficError(("header", "content-type"), f"Unsupported media type '{media_type}'"))
+            return
+
+        if validator is None:
+            return
+
+        subtype = media_type.rpartition("/")[2]
+        if isinstance(body, (str, bytes, bytearray)):
+            if subtype != "json" and not subtype.endswith("+json"):
+                # Only JSON bodies are decoded; other bodies are checked as strings
+                if isinstance(body, str):
+                    self.check(validator, body, errors)
+                return
+
+            try:
+                body = json.loads(body)
+            except ValueError as e:
+                errors.append(TrafficError(("body",), f"Invalid JSON: {e}"))
+                return
+
+        self.check(validator, body, errors)
+
+    @staticmethod
+    def check(validator, body, errors):
+        for error in validator.iter_errors(body):
+            errors.append(TrafficError(("body", *error.path), error.message))
+
+class Operation(object):
+    """The validators of an operation, compiled from its Operation Object.
+
+    Attributes:
+        method: The HTTP method, in lowercase.
+        path: The path template of the operation.
+        operation_id: The `operationId` of the operation, if any.
+        parameters: The compiled `Parameter` objects, including the ones of the path item.
+        body: The `Content` of the request body, or None.
+        body_required: Whether the request must have a body.
+        responses: A `Response` per status code ("200", "2XX" or "default").
+    """
+
+    def __init__(self, method, path, path_item, operation, compiler, format_checker=None):
+        self.method = method
+        self.path = path
+        self.operation_id = _raw_value(operation, "operationId")
+
+        parameters = dict()
+        for container in (path_item, operation):
+            for parameter in _children(container, "parameters"):
+                raw = parameter._resolve()._raw()
+                parameters[(raw["name"], raw["in"])] = Parameter(raw, compiler, format_checker)
+        self.parameters = list(parameters.values())
+
+        request_body = operation._object_properties.get("requestBody")
+        if request_body is not None:
+            request_body = request_body._resolve()._raw()
+            self.body = Content(request_body.get("content"), compiler, format_checker)
+            self.body_required = request_body.get("required", False)
+        else:
+            self.body = None
+            self.body_required = False
+
+        responses = operation._object_properties.get("responses")
+        self.responses = {
+            str(status): Response(response._resolve(), compiler, format_checker)
+            for status, response in (responses._object_properties.items() if responses is not None else ())
+        }
+
+    def validate_request(self, path_parameters, headers, query, body, errors):
+        for parameter in self.parameters:
+            if parameter.location == "path":
+                source = path_parameters
+            elif parameter.location == "query":
+                source = query
+            elif parameter.location == "header":
+                source = headers
+            else:
+                source = _cookies(headers)
+
+            value = source.get(parameter.name)
+            if value is None:
+                if parameter.required:
+                    errors.append(TrafficError((parameter.location, parameter.name), "Missing required parameter"))
+                continue
+
+            parameter.validate(value, errors)
+
+        if self.body is not None:
+            if body is None:
+                if self.body_required:
+                    errors.append(TrafficError(("body",), "Missing required request body"))
+            else:
+                self.body.validate(headers.get("content-type"), body, errors)
+
+    def find_response(self, status):
+        status = str(status)
+        return self.responses.get(status) or self.responses.get(status[0] + "XX") or self.responses.get("default")
+
+class Response(object):
+    """The compiled headers and content of a Response Object."""
+
+    def __init__(self, response, compiler, format_checker=None):
+        self.headers = []
+        for name, header in resolved_items(response, "headers"):
+            raw = dict(header._resolve()._raw(), name=name, **{"in": "header"})
+            self.headers.append(Parameter(raw, compiler, format_checker))
+
+        self.content = Content(_raw_value(response, "content"), compiler, format_checker)
+
+    def validate(self, headers, body, errors):
+        for header in self.headers:
+            value = headers.get(header.name)
+            if value is None:
+                if header.required:
+                    errors.append(TrafficError(("header", header.name), "Missing required header"))
+                continue
+
+            header.validate(value, errors)
+
+        if body is not None:
+            self.content.validate(headers.get("content-type"), body, errors)
+
+class TrafficValidator(object):
+    """Validates HTTP requests and responses against a parsed specification.
+
+    A validator is compiled for every operation when the object is created: the
+    parameters of the operation and its path item, its request body per media type
+    and its responses per status code. References are resolved, and the Schema
+    Objects converted to JSON schemas (see `SchemaCompiler`), at that time, so
+    validating a message only runs the compiled jsonschema validators.
+
+    Parameter values are given as strings, like they are received, and converted
+    to the type of their schema before they are validated. Array parameters are
+    given as lists, or as comma separated strings. Bodies are given decoded, or as
+    strings or bytes, in which case JSON bodies are decoded.
+
+    Parameters:
+        root: The parsed `openapiObject`, see `OASpecParser.parse_spec`.
+        format_checker: A `jsonschema.FormatChecker` used to validate `format`s.
+        servers: Whether request paths include the base paths of the servers.
+    """
+
+    def __init__(self, root, format_checker=None, servers=False):
+        compiler = SchemaCompiler(root)
+        self.router = Router(root, servers=servers)
+
+        self.operations = dict()
+        for path, path_item in resolved_items(root, "paths"):
+            path_item = path_item._resolve()
+            self.operations[path] = {
+                method: Operation(method, path, path_item, operation, compiler, format_checker)
+                for method, operation in path_item._object_properties.items()
+                if method in HTTP_METHODS
+            }
+
+    def find_operation(self, method, path):
+        """Find the operation serving a request, see `Router`.
+
+        Parameters:
+            method: The HTTP method of the request.
+            path: The path of the request URL, without the query string.
+
+        Returns:
+            tuple: The `Operation` and the values of its path parameters, or None
+                and a `TrafficError` when no operation matches.
+        """
+        routes, captures = self.router.lookup(path)
+        if routes is None:
+            return None, TrafficError(("path",), f"No path matches '{path}'")
+
+        route = routes.get(method.lower())
+        if route is None:
+            return None, TrafficError(("method",), f"Method {method.upper()} is not allowed for '{path}'")
+
+        match = RouteMatch(route, captures)
+        return self.operations[route.path][route.method], match.path_parameters
+
+    def validate_request(self, method, path, headers=None, query=None, body=None):
+        """Validate an HTTP request.
+
+        Parameters:
+            method: The HTTP method.
+            path: The path of the request URL, without the query string.
+            headers: The request headers, by name.
+            query: The query parameters, by name. Repeated parameters are lists.
+            body: The request body, or None if it has none.
+
+        Returns:
+            list: The `TrafficError`s found, empty when the request is valid.
+        """
+        operation, path_parameters = self.find_operation(method, path)
+        if operation is None:
+            return [path_parameters]
+
+        errors = []
+        operation.validate_request(path_parameters, _lower_keys(headers), query or {}, body, errors)
+        return errors
+
+    def validate_response(self, method, path, status, headers=None, body=None):
+        """Validate the HTTP response to a request.
+
+        Parameters:
+            method: The HTTP method of the request.
+            path: The path of the request URL, without the query string.
+            status: The status code of the response.
+            headers: The response headers, by name.
+            body: The response body, or None if it has none.
+
+        Returns:
+            list: The `TrafficError`s found, empty when the response is valid.
+        """
+        operation, path_parameters = self.find_operation(method, path)
+        if operation is None:
+            return [path_parameters]
+
+        response = operation.find_response(status)
+        if response is None:
+            return [TrafficError(("status",), f"Status {status} is not documented")]
+
+        errors = []
+        response.validate(_lower_keys(headers), body, errors)
+        return errors
+
+def coerce(value, schema):
+    """Convert a parameter value received as a string to the type of its schema.
+
+    Values that cannot be converted are returned unchanged, so that validation
+    reports them.
+    """
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        schema_type = next((item for item in schema_type if item != "null"), None)
+
+    if schema_type == "array":
+        if isinstance(value, str):
+            value = value.split(",")
+        items = schema.get("items", {})
+        return [coerce(item, items) for item in value]
+
+    if isinstance(value, list):
+        # A repeated parameter whose schema is not an array
+        value = value[-1] if value else ""
+
+    if not isinstance(value, str):
+        return value
+
+    try:
+        if schema_type == "integer":
+            return int(value)
+        elif schema_type == "number":
+            return float(value)
+    except ValueError:
+        return value
+
+    if schema_type == "boolean" and value in ("true", "false"):
+        return value == "true"
+
+    return value
+
+def _validator(schema, compiler, format_checker):
+    return jsonschema.Draft4Validator(schema, resolver=compiler.resolver, format_checker=format_checker)
+
+def _children(node, key):
+    # The items of an array child of a node
+    child = node._object_properties.get(key)
+    if child is None or not isinstance(child.__dict__.get("_value"), list):
+        return ()
+
+    return child._value
+
+def _raw_value(node, key):
+    child = node._object_properties.get(key)
+    return child._raw() if child is not None else None
+
+def _lower_keys(headers):
+    if not headers:
+        return {}
+
+    return {name.lower(): value for name, value in headers.items()}
+
+def _cookies(headers):
+    cookies = dict()
+    for cookie in headers.get("cookie", "").split(";"):
+        name, _, value = cookie.strip().partition("=")
+        if name:
+            cookies[name] = value
+
+    return cookies
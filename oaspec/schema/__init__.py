@@ -8,6 +8,46 @@ from .schema import (
 
 from .exceptions import (
     OASpecParserError,
+    OverlayError,
+)
+
+from .incremental import (
+    reparse,
+)
+
+from .intern import (
+    InternTable,
+)
+
+from .snapshot import (
+    load_snapshot,
+)
+
+from .profile import (
+    ParseStats,
+)
+
+from .overlay import (
+    apply_overlays,
+    validate_overlay,
+    OverlayReport,
+)
+
+from .merge import (
+    merge_fragments,
+    MergeReport,
+)
+
+from .changes import (
+    diff,
+    SpecDiff,
+    SpecChange,
+)
+
+from .registry import (
+    SchemaRegistry,
+    registry,
+    get_schema,
 )
 
 __all__ = (
@@ -15,4 +55,20 @@ __all__ = (
     # "OASchema",
     "build_schema",
     "OASpecParserError",
+    "SchemaRegistry",
+    "registry",
+    "get_schema",
+    "reparse",
+    "InternTable",
+    "load_snapshot",
+    "ParseStats",
+    "OverlayError",
+    "apply_overlays",
+    "validate_overlay",
+    "OverlayReport",
+    "merge_fragments",
+    "MergeReport",
+    "diff",
+    "SpecDiff",
+    "SpecChange",
 )
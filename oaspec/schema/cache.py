@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import stat
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+
+from ..__version__ import __version__
+from .funcs import get_schema_classes
+
+# Attributes holding references to other Schema subclasses, grouped by the shape
+# of the reference so they can be swapped for class positions and back.
+_CLASS_MAPPINGS = ("_definitions", "_properties", "_pattern_properties")
+_CLASS_SCALARS = ("_items", "_additional_properties")
+_CLASS_LISTS = ("_boolean_subschema_classes",)
+
+# Attributes that are derived from others and rebuilt on load
+_DERIVED = {"__module__", "__doc__", "__dict__", "__weakref__", "_compiled_patterns", "_validators"}
+
+class SchemaCache(object):
+    """A persistent, on-disk cache of compiled Schema class trees.
+
+    Building the Schema subclasses with `build_schema` walks the whole OAS validation
+    schema, which dominates the start-up time of short-lived processes. The cache
+    stores the metadata of every compiled class and restores the class tree without
+    walking the validation schema again.
+
+    Entries are keyed by a SHA-256 hash of the validation schema file, the oaspec
+    version and the cache format, so editing the schema file or upgrading oaspec
+    invalidates them automatically.
+
+    Entries are unpickled, which can run arbitrary code, so the cache directory is
+    created private to the current user (mode 0700), and entries are only read from
+    and written to a directory owned by the current user that others cannot write
+    to. Entries that are not owned by the current user, or that others can write
+    to, are ignored.
+
+    Attributes:
+        cache_dir: The directory holding the cache files.
+    """
+
+    FORMAT_VERSION = 3
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+
+    @staticmethod
+    def default_dir():
+        """Return the user cache directory used when none is specified.
+
+        The `OASPEC_CACHE_DIR` environment variable takes precedence, followed by
+        `$XDG_CACHE_HOME/oaspec` and finally `~/.cache/oaspec`.
+
+        Returns:
+            Path: The default cache directory.
+        """
+        if os.environ.get("OASPEC_CACHE_DIR"):
+            return Path(os.environ["OASPEC_CACHE_DIR"])
+
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return Path(cache_home) / "oaspec"
+
+    def key(self, schema_source):
+        """Compute the cache key for the contents of a validation schema file.
+
+        Parameters:
+            schema_source: The raw bytes of the `oas-<version>.json` file.
+
+        Returns:
+            str: A hexadecimal digest identifying the compiled class tree.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"oaspec-{__version__}-format-{self.FORMAT_VERSION}\n".encode("utf-8"))
+        digest.update(schema_source)
+        return digest.hexdigest()
+
+    def load(self, schema_version, key, schema_base):
+        """Restore a compiled class tree from the cache.
+
+        Parameters:
+            schema_version: The OpenAPI version the class tree was built for.
+            key: The cache key returned by `key`.
+            schema_base: The base class used for every restored Schema subclass.
+
+        Returns:
+            tuple: The root Schema subclass and the validation schema it was built
+                from, or None if there is no usable cache entry, or it is not
+                trusted.
+        """
+        cache_file = self._cache_file(schema_version, key)
+
+        try:
+            with cache_file.open("rb") as f:
+                if not self._trusted(os.fstat(f.fileno())) or not self._trusted(self.cache_dir.stat()):
+                    return None
+                format_version, stored_key, payload = pickle.load(f)
+        except Exception:
+            # A missing, truncated or otherwise unreadable entry is treated as a
+            # miss and will be replaced by the next store.
+            return None
+
+        if format_version != self.FORMAT_VERSION or stored_key != key:
+            return None
+
+        return load_class_tree(payload, schema_base)
+
+    def store(self, schema_version, key, schema_class, validation_schema):
+        """Persist a compiled class tree, replacing stale entries for the version.
+
+        Failures to write the cache (such as a read-only home directory) are ignored,
+        since the cache only ever saves time.
+
+        Parameters:
+            schema_version: The OpenAPI version the class tree was built for.
+            key: The cache key returned by `key`.
+            schema_class: The root Schema subclass returned by `build_schema`.
+            validation_schema: The validation schema the class tree was built from.
+        """
+        cache_file = self._cache_file(schema_version, key)
+        payload = dump_class_tree(schema_class, validation_schema)
+
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if not self._trusted(self.cache_dir.stat()):
+                return
+
+            # Write to a temporary file first so concurrent readers never see a
+            # partially written entry.
+            fd, tmp_name = tempfile.mkstemp(dir=str(self.cache_dir), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump((self.FORMAT_VERSION, key, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, str(cache_file))
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+
+            for stale_file in self.cache_dir.glob(f"oas-{schema_version}-*.pickle"):
+                if stale_file != cache_file:
+                    stale_file.unlink()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _trusted(file_stat):
+        # Whether a cache file or directory belongs to the current user, and only
+        # the current user can write to it
+        if not hasattr(os, "getuid"):
+            return True
+
+        return file_stat.st_uid == os.getuid() and not file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def clear(self):
+        """Remove every cache entry from the cache directory."""
+        for cache_file in self.cache_dir.glob("oas-*.pickle"):
+            cache_file.unlink()
+
+    def _cache_file(self, schema_version, key):
+        return self.cache_dir / f"oas-{schema_version}-{key[:16]}.pickle"
+
+
+def dump_class_tree(schema_class, validation_schema):
+    """Convert a compiled class tree into plain, picklable data.
+
+    References between classes are replaced with the position of the referenced
+    class in the list returned by `get_schema_classes`.
+
+    Parameters:
+        schema_class: The root Schema subclass returned by `build_schema`.
+        validation_schema: The validation schema the class tree was built from.
+
+    Returns:
+        dict: The class names, class metadata and the validation schema.
+    """
+    classes = get_schema_classes(schema_class)
+    positions = {id(cls): idx for idx, cls in enumerate(classes)}
+
+    class_data = []
+    for cls in classes:
+        attrs = dict()
+        for name, value in cls.__dict__.items():
+            if name in _DERIVED:
+                continue
+            elif name in _CLASS_MAPPINGS:
+                value = {key: positions[id(subclass)] for key, subclass in value.items()}
+            elif name in _CLASS_SCALARS:
+                value = positions[id(value)]
+            elif name in _CLASS_LISTS:
+                value = [positions[id(subclass)] for subclass in value]
+
+            attrs[name] = value
+
+        class_data.append((cls.__name__, attrs))
+
+    return {
+        "classes": class_data,
+        "validation_schema": validation_schema,
+    }
+
+def load_class_tree(payload, schema_base):
+    """Rebuild a compiled class tree from the output of `dump_class_tree`.
+
+    Parameters:
+        payload: The data returned by `dump_class_tree`.
+        schema_base: The base class used for every restored Schema subclass.
+
+    Returns:
+        tuple: The root Schema subclass and the validation schema.
+    """
+
+    # Create bare classes first so that references can be resolved in any order
+    classes = [type(name, (schema_base,), dict()) for name, _ in payload["classes"]]
+
+    for cls, (_, attrs) in zip(classes, payload["classes"]):
+        for name, value in attrs.items():
+            if name in _CLASS_MAPPINGS:
+                value = {key: classes[position] for key, position in value.items()}
+            elif name in _CLASS_SCALARS:
+                value = classes[value]
+            elif name in _CLASS_LISTS:
+                value = [classes[position] for position in value]
+
+            setattr(cls, name, value)
+
+        cls._compiled_patterns = {
+            pattern: re.compile(pattern) for pattern in cls._pattern_properties
+        }
+
+    return classes[0], payload["validation_schema"]
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+
+from hashlib import blake2b
+
+from .lazy import Deferred
+from .overlay import value_key
+from .serialize import node_value
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# The kinds of the members of the `components` sections
+_COMPONENT_KINDS = {
+    "schemas": "schema",
+    "parameters": "parameter",
+    "responses": "response",
+    "requestBodies": "request_body",
+}
+
+def diff(old, new):
+    """Compare two parsed specifications.
+
+    The trees are walked together, and subtrees that are the same node (as the
+    unchanged subtrees of a `reparse` are) or that have the same `subtree_hash`
+    are skipped without being visited. Hashes are cached on the nodes, so once
+    they are computed the cost of a comparison depends on the size of the changes
+    rather than on the size of the specifications.
+
+    Changes are reported per path, operation, parameter (matched by name and
+    location, or by `$ref`), request body, response and component, with the
+    changes of their values, and are flagged as breaking when they can break
+    existing clients: removed paths, operations, responses and components, new
+    required parameters, request bodies and properties, changed types and
+    formats, narrowed enums and removed properties.
+
+    Parameters:
+        old: The parsed `openapiObject` of the previous version.
+        new: The parsed `openapiObject` of the new version.
+
+    Returns:
+        SpecDiff: The changes, in the order they were found.
+    """
+    differ = _Differ()
+    differ.compare(old, new, [])
+    for change in differ.entities.values():
+        change.classify()
+
+    return SpecDiff(list(differ.entities.values()))
+
+def subtree_hash(node):
+    """Return the content hash of a Schema object and its descendants.
+
+    The hash only depends on the raw value of the subtree (mappings are hashed
+    with sorted keys), so subtrees of different trees can be compared with it. It
+    is cached on the node, and dropped from the node and its ancestors when they
+    are modified (see `Schema._copy_on_write`). Children of lazy trees that were
+    not built yet are hashed from their raw value, and are not built.
+
+    Returns:
+        bytes: A 16 byte digest.
+    """
+    cached = node.__dict__.get("_subtree_hash")
+    if cached is not None:
+        return cached
+
+    kind, value = node_value(node)
+    if kind == "object":
+        parts = [b"{"]
+        for key in sorted(dict.keys(value), key=str):
+            parts.append(_scalar(key))
+            parts.append(_node_part(dict.get(value, key)))
+    elif kind == "array":
+        parts = [b"["]
+        parts.extend(_node_part(item) for item in value)
+    elif isinstance(value, (dict, list, tuple)):
+        return raw_hash(value)
+    else:
+        parts = [b"=", _scalar(value)]
+
+    result = node.__dict__["_subtree_hash"] = blake2b(b"".join(parts), digest_size=16).digest()
+    return result
+
+def raw_hash(value):
+    """Return the hash a subtree with a raw value has, see `subtree_hash`."""
+    if isinstance(value, dict):
+        parts = [b"{"]
+        for key in sorted(value, key=str):
+            parts.append(_scalar(key))
+            parts.append(_raw_part(value[key]))
+    elif isinstance(value, (list, tuple)):
+        parts = [b"["]
+        parts.extend(_raw_part(item) for item in value)
+    else:
+        parts = [b"=", _scalar(value)]
+
+    return blake2b(b"".join(parts), digest_size=16).digest()
+
+class SpecChange(object):
+    """A change of a part of a specification.
+
+    Attributes:
+        kind: "path", "operation", "parameter", "request_body", "response",
+            "schema", "component" (for the other members of `components`) or
+            "document" for values outside of these.
+        action: "added", "removed" or "changed".
+        path: The keys leading to the part in the specification tree.
+        name: A readable name of the part, like "GET /pets" or "query limit".
+        changes: For changed parts, the changed values: dicts with the `path`,
+            the `action` and the `old` and `new` raw values.
+        breaking: Whether the change can break existing clients.
+        reasons: Why the change is breaking.
+    """
+
+    def __init__(self, kind, action, path, name, node):
+        self.kind = kind
+        self.action = action
+        self.path = path
+        self.name = name
+        self.changes = []
+        self.breaking = False
+        self.reasons = []
+        self._node = node
+
+    def classify(self):
+        # Flag breaking changes, see `diff`
+        raw = self._node._raw() if self._node is not None and self.action == "added" else None
+        self._node = None
+
+        if self.action == "removed":
+            if self.kind not in ("parameter", "request_body", "document") or self.path[0] == "components":
+                self.flag(f"{self.kind.replace('_', ' ')} removed")
+        elif self.action == "added":
+            if self.kind == "parameter" and isinstance(raw, dict) and (raw.get("required") or raw.get("in") == "path"):
+                self.flag("new required parameter")
+            elif self.kind == "request_body" and isinstance(raw, dict) and raw.get("required"):
+                self.flag("new required request body")
+
+        for change in self.changes:
+            keyword = change["path"][-1]
+            if len(change["path"]) > 1 and change["path"][-2] == "properties":
+                if change["action"] == "removed":
+                    self.flag(f"property `{keyword}` removed")
+                continue
+
+            old, new = change["old"], change["new"]
+            if keyword == "required":
+                if new is True and not old:
+                    self.flag("became required")
+                elif isinstance(new, list):
+                    added = _missing(new, old if isinstance(old, list) else [])
+                    if added:
+                        self.flag("new required properties: " + ", ".join(map(str, added)))
+            elif keyword in ("type", "format") and change["action"] != "removed":
+                self.flag(f"{keyword} changed from {old!r} to {new!r}")
+            elif keyword == "enum" and isinstance(new, list):
+                removed = _missing(old, new) if isinstance(old, list) else None
+                if removed is None or removed:
+                    self.flag("enum narrowed" if removed is None else "enum values removed: " + ", ".join(map(str, removed)))
+
+    def flag(self, reason):
+        self.breaking = True
+        self.reasons.append(reason)
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "action": self.action,
+            "path": list(self.path),
+            "name": self.name,
+            "breaking": self.breaking,
+            "reasons": list(self.reasons),
+            "changes": [dict(change) for change in self.changes],
+        }
+
+    def __repr__(self):
+        return f"SpecChange({self.kind} {self.action}: {self.name})"
+
+class SpecDiff(object):
+    """The result of `diff`.
+
+    Attributes:
+        changes: The `SpecChange` objects.
+    """
+
+    def __init__(self, changes):
+        self.changes = changes
+
+    @property
+    def breaking(self):
+        """The breaking changes."""
+        return [change for change in self.changes if change.breaking]
+
+    def summary(self):
+        """Return the number of changes per kind and action, as "kind action" keys."""
+        counts = dict()
+        for change in self.changes:
+            key = f"{change.kind} {change.action}"
+            counts[key] = counts.get(key, 0) + 1
+
+        return counts
+
+    def as_dict(self):
+        """Return the changes as plain, JSON serializable data."""
+        return {
+            "changes": [change.as_dict() for change in self.changes],
+            "breaking": len(self.breaking),
+        }
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+def _child_hash(child):
+    if type(child) is Deferred:
+        return raw_hash(child.value)
+
+    return subtree_hash(child)
+
+def _node_part(child):
+    # How a child contributes to the hash of its parent: scalars are included
+    # as they are, without hashing and caching them on their own
+    if type(child) is Deferred:
+        return _raw_part(child.value)
+
+    kind, value = node_value(child)
+    if kind == "value" and not isinstance(value, (dict, list, tuple)):
+        return b"=" + _scalar(value)
+
+    return b"#" + subtree_hash(child)
+
+def _raw_part(value):
+    if isinstance(value, (dict, list, tuple)):
+        return b"#" + raw_hash(value)
+
+    return b"=" + _scalar(value)
+
+def _scalar(value):
+    # The type name keeps equal values of different types (1, 1.0 and True) apart
+    if type(value) is str:
+        data = value.encode("utf-8")
+        return b"s" + len(data).to_bytes(4, "little") + data
+
+    data = f"{type(value).__name__}:{value!r}".encode("utf-8")
+    return b"v" + len(data).to_bytes(4, "little") + data
+
+def _missing(values, others):
+    # The values that are not in others
+    keys = {value_key(other) for other in others}
+    return [value for value in values if value_key(value) not in keys]
+
+def _entity_kind(path):
+    # The kind of part of the specification at a path, if it is one
+    size = len(path)
+    if not size:
+        return None
+    elif path[0] == "paths":
+        if size == 2:
+            return "path"
+        elif size == 3 and path[2] in HTTP_METHODS:
+            return "operation"
+        elif size in (4, 5) and path[-2] == "parameters" and isinstance(path[-1], int):
+            return "parameter"
+        elif size == 4 and path[3] == "requestBody":
+            return "request_body"
+        elif size == 5 and path[3] == "responses":
+            return "response"
+    elif path[0] == "components" and size == 3:
+        return _COMPONENT_KINDS.get(path[1], "component")
+
+    return None
+
+def _entity_name(kind, path, node):
+    if kind == "operation":
+        return f"{path[2].upper()} {path[1]}"
+    elif kind == "parameter":
+        raw = node._raw()
+        if isinstance(raw, dict) and "name" in raw:
+            return f"{raw.get('in')} {raw['name']}"
+        elif isinstance(raw, dict) and "$ref" in raw:
+            return raw["$ref"]
+
+    return str(path[-1]) if path else ""
+
+def _parameter_key(node, position):
+    # Parameters are identified by their location and name, or by their reference
+    raw = node._raw()
+    if isinstance(raw, dict):
+        if "$ref" in raw:
+            return ("$ref", raw["$ref"])
+        elif "name" in raw:
+            return (raw.get("in"), raw["name"])
+
+    return ("position", position)
+
+
+class _Differ(object):
+
+    def __init__(self):
+        # The changes of the parts of the specification, and the names of the
+        # changed parts, by path
+        self.entities = dict()
+        self.names = dict()
+
+    def compare(self, old, new, path):
+        if old is new or subtree_hash(old) == subtree_hash(new):
+            return
+
+        kind = _entity_kind(path)
+        if kind is not None:
+            self.names[tuple(path)] = _entity_name(kind, path, new)
+
+        old_kind, old_value = node_value(old)
+        new_kind, new_value = node_value(new)
+        if old_kind == new_kind == "object":
+            for key in dict.keys(old_value):
+                if key not in new_value:
+                    self.removed(path + [key], old_value[key])
+            for key in dict.keys(new_value):
+                if key not in old_value:
+                    self.added(path + [key], new_value[key])
+                elif _child_hash(dict.get(old_value, key)) != _child_hash(dict.get(new_value, key)):
+                    self.compare(old_value[key], new_value[key], path + [key])
+        elif old_kind == new_kind == "array" and path and path[-1] == "parameters":
+            self.compare_parameters(old_value, new_value, path)
+        else:
+            self.value_changed(path, "changed", old._raw(), new._raw())
+
+    def compare_parameters(self, old_items, new_items, path):
+        # Parameters are reported at their position in the new list, or in the
+        # old one when they were removed
+        old_parameters = {_parameter_key(item, position): (position, item) for position, item in enumerate(old_items)}
+        new_keys = set()
+        for position, item in enumerate(new_items):
+            key = _parameter_key(item, position)
+            new_keys.add(key)
+            if key in old_parameters:
+                self.compare(old_parameters[key][1], item, path + [position])
+            else:
+                self.added(path + [position], item)
+
+        for key, (position, item) in old_parameters.items():
+            if key not in new_keys:
+                self.removed(path + [position], item)
+
+    def added(self, path, node):
+        kind = _entity_kind(path)
+        if kind is not None:
+            self.entities[tuple(path)] = SpecChange(kind, "added", path, _entity_name(kind, path, node), node)
+        else:
+            self.value_changed(path, "added", None, node._raw())
+
+    def removed(self, path, node):
+        kind = _entity_kind(path)
+        if kind is not None:
+            self.entities[tuple(path)] = SpecChange(kind, "removed", path, _entity_name(kind, path, node), None)
+        else:
+            self.value_changed(path, "removed", node._raw(), None)
+
+    def value_changed(self, path, action, old, new):
+        # Changes are attributed to the closest part of the specification around them
+        for size in range(len(path) - 1, -1, -1):
+            kind = _entity_kind(path[:size])
+            if kind is not None:
+                entity_path = path[:size]
+                break
+        else:
+            kind, entity_path = "document", []
+
+        entity = self.entities.get(tuple(entity_path))
+        if entity is None:
+            name = self.names.get(tuple(entity_path), "")
+            entity = self.entities[tuple(entity_path)] = SpecChange(kind, "changed", entity_path, name, None)
+
+        entity.changes.append({"path": path, "action": action, "old": old, "new": new})
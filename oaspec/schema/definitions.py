@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from copy import deepcopy
+
+import jsonschema
+
+from .funcs import def_key, get_all_refs
+
+class DefinitionStore(object):
+    """The `definitions` of a validation schema, shared by every class built from it.
+
+    The reference graph of the definitions and its transitive closures are computed
+    once, when the store is created. The `_parsing_schema` of each Schema subclass
+    then lists the definitions it needs, directly or through other definitions, as
+    references to the store's schemas rather than private copies.
+
+    Validators of every class resolve their refs through a single `RefResolver`
+    per thread (see `resolver`), whose document holds all the definitions.
+
+    Attributes:
+        definitions: The raw definition schemas, by name.
+        graph: The refs of the definitions each definition references directly,
+            keyed by the ref of the definition.
+        closures: The refs of every definition reachable from each definition.
+    """
+
+    def __init__(self, definitions):
+        self.definitions = deepcopy(definitions)
+        self.graph = {
+            def_key(name): {ref for ref in get_all_refs(schema) if self._is_definition(ref)}
+            for name, schema in self.definitions.items()
+        }
+        self.closures = self._transitive_closures(self.graph)
+        self._local = threading.local()
+
+    def definitions_for(self, schema):
+        """Return the definitions a schema references, directly or transitively.
+
+        Parameters:
+            schema: A raw subschema of the validation schema.
+
+        Returns:
+            dict: The definition schemas by name. The schemas are shared with the
+                store and must not be modified.
+        """
+        refs = set()
+        for ref in get_all_refs(schema):
+            if self._is_definition(ref):
+                refs.add(ref)
+                refs.update(self.closures[ref])
+
+        return {ref.split("/")[-1]: self.definitions[ref.split("/")[-1]] for ref in sorted(refs)}
+
+    def resolver(self):
+        """Return the `RefResolver` shared by the validators of the current thread.
+
+        jsonschema resolvers keep a stack of resolution scopes while validating, so
+        each thread has its own, like each thread has its own validators.
+        """
+        resolver = getattr(self._local, "resolver", None)
+        if resolver is None:
+            resolver = self._local.resolver = jsonschema.RefResolver("", {"definitions": self.definitions})
+
+        return resolver
+
+    def _is_definition(self, ref):
+        return ref.startswith("#/definitions/") and ref.split("/")[-1] in self.definitions
+
+    @staticmethod
+    def _transitive_closures(graph):
+        closures = dict()
+        for ref in graph:
+            reachable = set()
+            pending = list(graph[ref])
+            while pending:
+                next_ref = pending.pop()
+                if next_ref not in reachable:
+                    reachable.add(next_ref)
+                    pending.extend(graph[next_ref])
+
+            closures[ref] = frozenset(reachable)
+
+        return closures
+
+    def __getstate__(self):
+        # Resolvers are per thread and rebuilt on demand
+        state = dict(self.__dict__)
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
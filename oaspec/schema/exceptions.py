@@ -10,6 +10,23 @@ class OASpecParserError(ValueError):
         self.msg = msg
         self.field = field
 
+class OverlayError(OASpecParserError):
+    """Raised by `apply_overlays` when overlay documents are invalid.
+
+    Attributes:
+        errors: (overlay position, path, message) tuples, one per problem found.
+    """
+
+    def __init__(self, errors):
+        position, path, msg = errors[0]
+        field = ".".join(str(key) for key in path)
+        if len(errors) > 1:
+            msg = f"{msg} (and {len(errors) - 1} more errors)"
+
+        OASpecParserError.__init__(self, f"{msg} in overlay {position}", field)
+
+        self.errors = errors
+
 class OASpecParserWarning(RuntimeWarning):
 
     def __init__(self, msg, location=None):
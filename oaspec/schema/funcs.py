@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
 import re
-from copy import deepcopy
+import json
+import hashlib
 
 def def_key(key):
     """Compute a definition ref from a key.
@@ -40,52 +41,241 @@ def get_all_refs(schema):
 
     return all_refs
 
-def get_def_classes(schema, def_objects, ignore_keys=None):
-    """Return the definition objects represented by relative refs in a schema.
+def schema_hash(schema):
+    """Generate a string-based hash of a schema object.
 
-    Gets all of the relative refs present in a schema object and returns a mapping
-    of refs to schema objects, recursively resolving references listed in the
-    retrieved schema definitions. This function is used to collect the referenced
-    definitions that will be added to each schema class's `_parsing_schema` attribute.
+    The hash is derived from the content of the schema alone, so it is identical
+    across processes (unlike the built-in `hash`, which is salted per process) and
+    can be used in generated class names and persistent cache keys.
 
-    Parameters:
-        schema: The schema to parse for relative refs.
-        def_objects: A mapping of relative ref keys and the Schema sub-classes to which they
-            correspond. The `_parsing_schema` will be extracted from each referenced class.
-        ignore_keys: A set of keys that should be skipped when encountered during traversal,
-            in order to prevent infinite recursion when encountering circular references.
+    Returns:
+        str: Schema hash.
+
+    """
+    return stable_hash(schema)[:16]
+
+def same_value(value, other):
+    """Compare two JSON-compatible values, and the types of their scalars.
+
+    Python finds `1`, `1.0` and `True` equal, while a JSON schema does not: a value
+    that validates as an integer may not validate as a boolean. Mappings and
+    sequences are compared as such whatever their class, so that the values of
+    different loaders can be compared.
 
     Returns:
-        dict: A mapping of of relative ref keys and their corresponding raw definitions.
+        bool: Whether the values are equal, with scalars of the same types.
 
     """
+    if isinstance(value, dict):
+        if not isinstance(other, dict) or len(value) != len(other):
+            return False
+
+        for key, item in value.items():
+            if key not in other or not same_value(item, other[key]):
+                return False
+
+        return True
+    elif isinstance(value, (list, tuple)):
+        if not isinstance(other, (list, tuple)) or len(value) != len(other):
+            return False
+
+        return all(same_value(item, other_item) for item, other_item in zip(value, other))
 
-    # Traverse the schema to get all relative ref links
-    all_refs = get_all_refs(schema)
+    return type(value) is type(other) and value == other
 
-    if not all_refs:
-        return {}
+def stable_hash(value):
+    """Generate a deterministic content hash of a JSON-compatible value.
 
-    def_classes = {}
-    for key in all_refs:
-        subkey = key.split("/")[-1]
-        if ignore_keys and subkey in ignore_keys:
+    Mappings are hashed with sorted keys, so two values that compare equal produce
+    the same hash regardless of key order.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the value's canonical JSON form.
+
+    """
+    if isinstance(value, bytes):
+        encoded = value
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+    else:
+        encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+    return hashlib.sha256(encoded).hexdigest()
+
+def get_schema_classes(schema_class):
+    """Collect every Schema subclass reachable from a compiled class tree.
+
+    Traverses the definitions, properties, pattern properties, array items,
+    additional properties and boolean subschemas of the class tree in a fixed order,
+    so that the position of a class in the returned list is the same every time the
+    same OAS schema is built. The positions are used as class identifiers when
+    compiled class trees are persisted or sent to other processes.
+
+    Parameters:
+        schema_class: The root Schema subclass returned by `build_schema`.
+
+    Returns:
+        list: All distinct Schema subclasses in the tree, starting with the root.
+
+    """
+
+    classes = []
+    seen = set()
+    pending = [schema_class]
+
+    while pending:
+        cls = pending.pop()
+        if id(cls) in seen:
             continue
 
-        subschema = deepcopy(def_objects[key]._parsing_schema)
+        seen.add(id(cls))
+        classes.append(cls)
 
-        def_classes[subkey] = subschema
+        attrs = cls.__dict__
+        children = []
+        children.extend(attrs.get("_definitions", dict()).values())
+        children.extend(attrs.get("_properties", dict()).values())
+        children.extend(attrs.get("_pattern_properties", dict()).values())
+        if "_items" in attrs:
+            children.append(attrs["_items"])
+        if "_additional_properties" in attrs:
+            children.append(attrs["_additional_properties"])
+        children.extend(attrs.get("_boolean_subschema_classes", list()))
 
-        # Recursively de-reference ref links found in retrieve definition objects
-        def_classes.update(get_def_classes(def_classes[subkey], def_objects, def_classes.keys()))
+        # Push in reverse so that children are visited in declaration order
+        pending.extend(reversed(children))
 
-    return def_classes
+    return classes
 
-def schema_hash(schema):
-    """Generate a string-based hash of a schema object.
+# Python types accepted by each JSON schema type (draft 4), used by `json_type`
+_JSON_TYPES = {
+    "null": ("null",),
+    "boolean": ("boolean",),
+    "integer": ("integer", "number"),
+    "number": ("number",),
+    "string": ("string",),
+    "array": ("array",),
+    "object": ("object",),
+}
+
+def json_type(value):
+    """Return the JSON type name of a parsed value.
 
     Returns:
-        str: Schema hash.
+        str: One of "null", "boolean", "integer", "number", "string", "array" or
+            "object", or None for values without a JSON equivalent (such as dates).
 
     """
-    return str(abs(hash(str(schema))))
+    if value is None:
+        return "null"
+    elif isinstance(value, bool):
+        return "boolean"
+    elif isinstance(value, int):
+        return "integer"
+    elif isinstance(value, float):
+        return "number"
+    elif isinstance(value, str):
+        return "string"
+    elif isinstance(value, list):
+        return "array"
+    elif isinstance(value, dict):
+        return "object"
+
+    return None
+
+def build_subschema_index(subschema_classes):
+    """Precompute a dispatch index for the subschemas of a boolean (allOf/anyOf/oneOf) schema.
+
+    The index records the cheap constraints of each subschema that can rule it out
+    without running a full validation: its `type`, its `required` keys, a top-level
+    string `enum` and string `enum`s on its properties. Subschemas are grouped by the
+    JSON type of the values they accept, so that the candidates for a value are found
+    with a single lookup. Only constraints that are guaranteed to fail validation are
+    recorded, so a subschema ruled out by the index can never be the matching one.
+
+    Parameters:
+        subschema_classes: The Schema subclasses listed in `_boolean_subschema_classes`.
+
+    Returns:
+        dict: The dispatch index, holding subschema positions rather than classes.
+
+    """
+
+    by_type = {type_name: [] for type_name in _JSON_TYPES}
+    by_type[None] = []
+    constraints = []
+
+    for position, subschema_class in enumerate(subschema_classes):
+        parsing_schema = subschema_class._parsing_schema
+
+        schema_types = parsing_schema.get("type")
+        if isinstance(schema_types, str):
+            schema_types = [schema_types]
+
+        for type_name, accepted in _JSON_TYPES.items():
+            if schema_types is None or any(accepted_type in schema_types for accepted_type in accepted):
+                by_type[type_name].append(position)
+
+        # Values without a JSON type only pass subschemas that don't restrict the type
+        if schema_types is None:
+            by_type[None].append(position)
+
+        enum = parsing_schema.get("enum")
+        if not (isinstance(enum, list) and all(isinstance(item, str) for item in enum)):
+            enum = None
+
+        property_enums = dict()
+        for prop, prop_schema in parsing_schema.get("properties", dict()).items():
+            prop_enum = prop_schema.get("enum") if isinstance(prop_schema, dict) else None
+            if isinstance(prop_enum, list) and all(isinstance(item, str) for item in prop_enum):
+                property_enums[prop] = frozenset(prop_enum)
+
+        constraints.append((
+            frozenset(parsing_schema.get("required", [])),
+            frozenset(enum) if enum is not None else None,
+            property_enums,
+        ))
+
+    return {
+        "by_type": {type_name: tuple(positions) for type_name, positions in by_type.items()},
+        "constraints": constraints,
+    }
+
+def match_subschema_index(index, value):
+    """Return the positions of the subschemas that a value could validate against.
+
+    Parameters:
+        index: A dispatch index returned by `build_subschema_index`.
+        value: The raw value being parsed.
+
+    Returns:
+        list: The candidate subschema positions, in their original order.
+
+    """
+
+    candidates = index["by_type"][json_type(value)]
+    constraints = index["constraints"]
+
+    if isinstance(value, dict):
+        matches = []
+        for position in candidates:
+            required, _, property_enums = constraints[position]
+            if required and not required.issubset(value.keys()):
+                continue
+
+            if property_enums and any(
+                prop in value and isinstance(value[prop], str) and value[prop] not in allowed
+                for prop, allowed in property_enums.items()
+            ):
+                continue
+
+            matches.append(position)
+
+        return matches
+    elif isinstance(value, str):
+        return [
+            position for position in candidates
+            if constraints[position][1] is None or value in constraints[position][1]
+        ]
+
+    return list(candidates)
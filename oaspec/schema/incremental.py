@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+from copy import deepcopy
+
+import jsonschema
+
+from .lazy import Deferred, LazyProperties
+from .funcs import same_value, stable_hash, match_subschema_index
+
+# The keywords of the schema of a mapping that `check_keys` checks, or that only
+# apply to its children, which are checked on their own
+_KEY_KEYWORDS = {
+    "type", "required", "properties", "patternProperties", "additionalProperties",
+    "definitions", "description", "default", "$id", "$schema",
+}
+
+def reparse(previous, spec, gentle_validation=False, validation="once", lazy=None, zero_copy=None, stats=None):
+    """Parse an edited specification, reusing the unchanged parts of a previous parse.
+
+    The new document is compared with the raw specification each node of the
+    previous tree was built from. Unchanged subtrees are reused as they are,
+    without being validated or built again. Changed subtrees are built and
+    validated from scratch, and the mappings containing them are rebuilt around
+    their reused and new children, checking only their own keys (required and
+    allowed properties), since their children are checked on their own. Mappings
+    whose schema has other constraints (such as an `anyOf`), and changed arrays,
+    are validated as a whole, since their constraints apply to their children
+    together. Array items are matched by a fingerprint of their content, so that
+    items that moved within an array are reused too.
+
+    Reused nodes are moved into the new tree, so the previous tree must not be
+    used afterwards, other than to compare it with the new one with `diff`. It
+    must also not have been modified since it was parsed, as modified nodes no
+    longer match the raw specification they were built from.
+
+    Parameters:
+        previous: The root of the previous parse result.
+        spec: The new raw specification.
+        gentle_validation: Continue parsing when the specification fails validation.
+        validation: The validation mode used for changed subtrees, see
+            `OASpecParser.parse_spec`.
+        lazy: Whether new mapping objects build their children on first access.
+            Defaults to the mode of the previous parse.
+        zero_copy: Whether new nodes reference the new document instead of copying
+            it. Defaults to the mode of the previous parse.
+        stats: A dict that receives the number of `reused` subtrees, of `rebuilt`
+            mappings and arrays, and of subtrees `built` from scratch.
+
+    Returns:
+        Schema: The root of the new parse result.
+    """
+    if lazy is None:
+        lazy = previous._lazy
+    if zero_copy is None:
+        zero_copy = previous._raw_spec_shared
+
+    # References resolved in the previous tree must not be used in the new one
+    previous._drop_ref_index()
+
+    reparser = _Reparser(gentle_validation, validation, lazy, zero_copy)
+    root = reparser.reparse(type(previous), previous, spec, None, None, list(previous._path_prefix) or None)
+
+    if stats is not None:
+        stats.update(reused=reparser.reused, rebuilt=reparser.rebuilt, built=reparser.built)
+
+    return root
+
+
+class _Reparser(object):
+
+    def __init__(self, gentle_validation, validation, lazy, zero_copy):
+        self.gentle_validation = gentle_validation
+        self.validation = validation
+        self.lazy = lazy
+        self.zero_copy = zero_copy
+        self.reused = 0
+        self.rebuilt = 0
+        self.built = 0
+
+    def reparse(self, schema_class, old, value, parent, key, path=None):
+        # Equality is checked first, as it rules out most changed values faster
+        if old is not None and old._raw_spec == value and same_value(old._raw_spec, value):
+            self.reused += 1
+            if parent is not None:
+                old._parent = parent
+                old._key = key
+            return old
+
+        # Only mappings and arrays are rebuilt around their children. Everything else
+        # is built from scratch, as are nodes that now belong to another subschema.
+        if old is None or self.dispatch(schema_class, value) is not type(old):
+            return self.build(schema_class, value, parent, key, path)
+        elif isinstance(value, dict) and hasattr(old, "_object_properties"):
+            return self.rebuild(type(old), old, value, parent, key, path)
+        elif isinstance(value, list) and old._type == "array":
+            return self.rebuild_array(type(old), old, value, parent, key, path)
+
+        return self.build(schema_class, value, parent, key, path)
+
+    def dispatch(self, schema_class, value):
+        # Find the class a node of `schema_class` would become for `value`, when
+        # the dispatch index of a boolean subschema leaves a single candidate
+        if not schema_class._boolean_subschema:
+            return schema_class
+
+        candidates = match_subschema_index(schema_class._subschema_index, value)
+        if len(candidates) != 1:
+            return None
+
+        return self.dispatch(schema_class._boolean_subschema_classes[candidates[0]], value)
+
+    def build(self, schema_class, value, parent, key, path=None):
+        self.built += 1
+        return schema_class(
+            value,
+            path,
+            self.gentle_validation,
+            self.validation,
+            self.lazy,
+            self.zero_copy,
+            parent,
+            key,
+        )
+
+    def rebuild(self, schema_class, old, value, parent, key, path=None):
+        self.rebuilt += 1
+        if schema_class._parsing_schema.keys() - _KEY_KEYWORDS:
+            self.check_subtree(schema_class, value, old if parent is None else parent, key)
+        else:
+            self.check_keys(schema_class, value, old if parent is None else parent, key)
+
+        node = self.new_node(schema_class, value, parent, key, path)
+        if not self.zero_copy:
+            node._raw_spec = type(value)()
+        node._present_properties = set()
+        node._object_properties = LazyProperties(node) if self.lazy else dict()
+
+        old_children = old._object_properties
+        for prop in schema_class._property_order(value):
+            child_class = schema_class._validate_property(prop)[1]
+            old_child = dict.get(old_children, prop)
+            child_value = value[prop]
+
+            if type(old_child) is Deferred:
+                # Children that were never read are kept as they are when unchanged
+                if self.lazy and old_child.value == child_value and same_value(old_child.value, child_value):
+                    child = old_child
+                elif self.lazy:
+                    child = self.defer(child_class, child_value, node, prop)
+                else:
+                    child = self.reparse(child_class, None, child_value, node, prop)
+            elif self.lazy and old_child is None:
+                child = self.defer(child_class, child_value, node, prop)
+            else:
+                child = self.reparse(child_class, old_child, child_value, node, prop)
+
+            node._present_properties.add(prop)
+            dict.__setitem__(node._object_properties, prop, child)
+
+        if not self.zero_copy:
+            # Share the raw specification of the children, like a copying parse would
+            for prop, prop_value in value.items():
+                child = dict.get(node._object_properties, prop)
+                if child is None:
+                    node._raw_spec[prop] = deepcopy(prop_value)
+                elif type(child) is Deferred:
+                    node._raw_spec[prop] = child.value
+                else:
+                    node._raw_spec[prop] = child._raw_spec
+
+        node._set_object_methods()
+        return node
+
+    def defer(self, schema_class, value, node, key):
+        # Deferred children are not built, so they are validated now
+        self.check_subtree(schema_class, value, node, key)
+        return Deferred(schema_class, value if self.zero_copy else deepcopy(value))
+
+    def rebuild_array(self, schema_class, old, value, parent, key, path=None):
+        self.rebuilt += 1
+        self.check_subtree(schema_class, value, old if parent is None else parent, key)
+
+        node = self.new_node(schema_class, value, parent, key, path)
+
+        old_items = dict()
+        for item in old._value:
+            old_items.setdefault(stable_hash(item._raw_spec), []).append(item)
+
+        node._value = []
+        for item_value in value:
+            candidates = old_items.get(stable_hash(item_value), ())
+            # The hashes of strings and of the numbers they spell are the same
+            match = next((idx for idx, item in enumerate(candidates) if same_value(item._raw_spec, item_value)), None)
+            if match is not None:
+                item = candidates.pop(match)
+                item._parent = node
+                item._key = "array"
+                self.reused += 1
+            else:
+                item = self.build(schema_class._items, item_value, node, "array")
+
+            node._value.append(item)
+
+        if not self.zero_copy:
+            node._raw_spec = [item._raw_spec for item in node._value]
+
+        return node
+
+    def new_node(self, schema_class, value, parent, key, path):
+        # Set up the state `Schema.__init__` gives every node
+        node = schema_class.__new__(schema_class)
+        if parent is not None:
+            node._parent = parent
+            node._key = key
+        elif path:
+            node._path_prefix = tuple(path)
+
+        node._raw_spec = value
+        node._raw_spec_shared = self.zero_copy
+        node._lazy = self.lazy
+        node._gentle_validation = False
+        node._validation = "node" if self.validation == "node" else "none"
+
+        return node
+
+    def check_subtree(self, schema_class, value, node, key):
+        # Validate a value and all its descendants against the schema of its class
+        if self.gentle_validation or self.validation == "none":
+            return
+
+        try:
+            schema_class.validate(value, True)
+        except jsonschema.ValidationError as e:
+            e.path.extendleft(reversed(node._path if key is None else node._generate_path(key)))
+            raise e
+
+    def check_keys(self, schema_class, value, node, key):
+        # The keys of a rebuilt mapping are the only part of it that is not checked
+        # by the validation of its children
+        if self.gentle_validation or self.validation == "none":
+            return
+
+        path = node._path if key is None else node._generate_path(key)
+
+        missing = sorted(schema_class._required - value.keys())
+        if missing:
+            raise jsonschema.ValidationError(f"{missing[0]!r} is a required property", path=path, validator="required")
+
+        for prop in value:
+            if prop != "$schema" and not schema_class._validate_property(prop, return_class=False):
+                raise jsonschema.ValidationError(
+                    f"Additional properties are not allowed ({prop!r} was unexpected)",
+                    path=path,
+                    validator="additionalProperties",
+                )
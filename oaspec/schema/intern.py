@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from hashlib import blake2b
+
+# The table used by the parse running in the current thread, if it interns nodes
+_active = threading.local()
+
+def active_table():
+    """Return the `InternTable` of the parse running in the current thread, if any."""
+    return getattr(_active, "table", None)
+
+class InternTable(object):
+    """Shares one Schema object between structurally identical subtrees of a parse.
+
+    Specifications repeat the same schemas, responses, headers and parameters many
+    times. While a specification is parsed with interning, each child is looked up
+    by its Schema class and a fingerprint of its raw value, and an identical child
+    that was already built is reused instead of building (and validating) a copy.
+
+    Fingerprints are computed bottom-up, once per mapping or sequence of the raw
+    specification, and are sensitive to key order, so a shared node always has the
+    same `_raw()` as the subtree it replaces.
+
+    A shared node keeps the parent and key of its first occurrence, so its `_path`
+    is the path of the first occurrence. The other occurrences are listed in its
+    `_shared_by` attribute, and are given a private copy when the node is modified
+    (see `Schema._copy_on_write` and `Schema._own_child`).
+
+    Attributes:
+        built: The number of nodes built and added to the table.
+        shared: The number of children replaced by a shared node.
+        saved_nodes: The number of nodes that did not have to be built.
+    """
+
+    def __init__(self):
+        self._nodes = dict()
+        self._fingerprints = dict()
+        self.built = 0
+        self.shared = 0
+        self.saved_nodes = 0
+        # The tables that were active when this one was activated
+        self._previous = []
+
+    def intern(self, schema_class, value, build):
+        """Return the shared node for a child, building it on first use.
+
+        Parameters:
+            schema_class: The Schema subclass of the child.
+            value: The raw specification of the child.
+            build: A callable returning a new Schema object for the child.
+
+        Returns:
+            tuple: The Schema object and whether it was already built.
+        """
+        fingerprint, size = self.fingerprint(value)
+        key = (schema_class, fingerprint)
+
+        node = self._nodes.get(key)
+        if node is not None:
+            self.shared += 1
+            self.saved_nodes += size
+            return node, True
+
+        node = build()
+        self._nodes[key] = node
+        self.built += 1
+        return node, False
+
+    def fingerprint(self, value):
+        """Compute the fingerprint of a raw value and the number of values it contains.
+
+        Parameters:
+            value: A raw specification value.
+
+        Returns:
+            tuple: The digest of the value and the size of the subtree.
+        """
+        if isinstance(value, (dict, list)):
+            cached = self._fingerprints.get(id(value))
+            if cached is not None:
+                return cached[1], cached[2]
+
+            digest = blake2b(b"{" if isinstance(value, dict) else b"[", digest_size=16)
+            size = 1
+            for key, item in (value.items() if isinstance(value, dict) else enumerate(value)):
+                digest.update(self._scalar(key))
+                item_digest, item_size = self.fingerprint(item)
+                digest.update(item_digest)
+                size += item_size
+
+            # The value is kept with its fingerprint so that its id cannot be reused
+            self._fingerprints[id(value)] = (value, digest.digest(), size)
+            return digest.digest(), size
+
+        return blake2b(self._scalar(value), digest_size=16).digest(), 1
+
+    def finish(self):
+        """Drop the nodes and fingerprints once the parse is complete, keeping the counters."""
+        self._nodes.clear()
+        self._fingerprints.clear()
+
+    def stats(self):
+        """Report how much the parse was deduplicated.
+
+        Returns:
+            dict: The number of nodes `built` and `shared`, the number of nodes the
+                parse would have built without interning (`total_nodes`), the nodes
+                saved and the deduplication ratio (`total_nodes / built`).
+        """
+        total_nodes = self.built + self.saved_nodes
+        return {
+            "built": self.built,
+            "shared": self.shared,
+            "saved_nodes": self.saved_nodes,
+            "total_nodes": total_nodes,
+            "dedup_ratio": total_nodes / self.built if self.built else 1.0,
+        }
+
+    @staticmethod
+    def _scalar(value):
+        # The type name keeps equal values of different types (1, 1.0 and True) apart
+        data = f"{type(value).__name__}:{value!r}".encode("utf-8")
+        return len(data).to_bytes(4, "little") + data
+
+    def __enter__(self):
+        self._previous.append(active_table())
+        _active.table = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _active.table = self._previous.pop()
+        self.finish()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+class Deferred(object):
+    """A placeholder for a child node that has not been built yet.
+
+    Attributes:
+        schema_class: The Schema subclass that will be used to build the child.
+        value: The raw specification of the child.
+    """
+
+    __slots__ = ("schema_class", "value")
+
+    def __init__(self, schema_class, value):
+        self.schema_class = schema_class
+        self.value = value
+
+    def __reduce__(self):
+        from .registry import registry
+
+        return _restore_deferred, (registry.locate(self.schema_class), self.value)
+
+def _restore_deferred(location, value):
+    from .registry import registry
+
+    return Deferred(registry.get_class(*location), value)
+
+
+class LazyProperties(dict):
+    """The `_object_properties` mapping of a lazily parsed Schema object.
+
+    Children are stored as `Deferred` placeholders and turned into Schema objects
+    the first time they are read, after which the built object replaces the
+    placeholder. Keys are always available without building any children, so
+    membership tests, `keys()` and iteration over keys are as cheap as for a dict.
+    Reading values in bulk (`values()`, `items()`, comparisons) builds every child.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner):
+        dict.__init__(self)
+        self._owner = owner
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is Deferred:
+            value = self._materialize(key, value)
+
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+
+        return default
+
+    def pop(self, key, *default):
+        if key in self:
+            self[key]
+
+        return dict.pop(self, key, *default)
+
+    def values(self):
+        self.materialize_all()
+        return dict.values(self)
+
+    def items(self):
+        self.materialize_all()
+        return dict.items(self)
+
+    def copy(self):
+        self.materialize_all()
+        return dict(self)
+
+    def __eq__(self, other):
+        self.materialize_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self.materialize_all()
+        return dict.__repr__(self)
+
+    def is_materialized(self, key):
+        """Return whether the child stored under a key has been built."""
+        return type(dict.__getitem__(self, key)) is not Deferred
+
+    def materialize_all(self):
+        """Build every child that is still deferred."""
+        for key, value in list(dict.items(self)):
+            if type(value) is Deferred:
+                self._materialize(key, value)
+
+    def _materialize(self, key, deferred):
+        value = self._owner._create_child(deferred.schema_class, deferred.value, key)
+        dict.__setitem__(self, key, value)
+        return value
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+OVERWRITE_SUBKEYS = "__overwrite_subkeys"
+
+def merge_fragments(base, fragments, no_override=False, overwrites_config=None):
+    """Merge many specification fragments into a tree in one traversal.
+
+    The result is the same as calling `base._update(fragment, ...)` for every
+    fragment in order, but the keys of all the fragments are gathered per node, so
+    each node of `base` is visited once however many fragments contribute to it,
+    and the `overwrites_config` of a key is looked up once.
+
+    As with `_update`, keys missing from `base` take the node of the first fragment
+    that has them, primitive values are replaced by the ones of later fragments
+    (unless `no_override` is set), objects are merged recursively (with
+    `no_override`, only the ones configured with "__overwrite_subkeys"), and arrays
+    already in `base` are kept.
+
+    Parameters:
+        base: The Schema object to merge into.
+        fragments: Schema objects of the same class as `base`, in the order they apply.
+        no_override: Whether values of `base` (and of earlier fragments) are kept.
+        overwrites_config: A mapping of keys to "__overwrite_subkeys", which lets
+            fragments merge into that object even with `no_override`, or to the
+            configuration of the keys of that object.
+
+    Returns:
+        MergeReport: Which fragment supplied each path, and the conflicts found.
+    """
+    report = MergeReport()
+    sources = [(position, fragment) for position, fragment in enumerate(fragments)]
+    _merge(base, sources, no_override, overwrites_config, list(base._path), report)
+    return report
+
+def key_config(overwrites_config, key):
+    """Return how the `overwrites_config` of `_update` and `merge_fragments` applies to a key.
+
+    The configuration of a key only applies to that key and its descendants, not to
+    the keys that follow it in the same mapping.
+
+    Returns:
+        tuple: Whether the object under the key is merged even with `no_override`,
+            and the configuration of its own keys (or None).
+    """
+    if not overwrites_config or key not in overwrites_config:
+        return False, None
+
+    if overwrites_config[key] == OVERWRITE_SUBKEYS:
+        return True, None
+
+    return False, overwrites_config[key]
+
+class MergeReport(object):
+    """What `merge_fragments` did.
+
+    Attributes:
+        provenance: The position of the fragment that supplied each path, by path
+            tuple. Paths added by a fragment are listed once, for the top of the
+            subtree it supplied.
+        conflicts: One dict per path where fragments supplied different values:
+            the `path`, the `fragments` that supplied a value, in order, and the
+            fragment whose value was `kept` (None when `base` kept its own).
+    """
+
+    def __init__(self):
+        self.provenance = dict()
+        self.conflicts = []
+
+    def source(self, path):
+        """Return the position of the fragment that supplied a path, or None.
+
+        A path inside a subtree supplied by a fragment belongs to that fragment,
+        unless a later fragment replaced it.
+        """
+        path = tuple(path)
+        while path:
+            position = self.provenance.get(path)
+            if position is not None:
+                return position
+            path = path[:-1]
+
+        return None
+
+    def as_dict(self):
+        """Return the report as plain, JSON serializable data."""
+        return {
+            "provenance": [{"path": list(path), "fragment": position} for path, position in self.provenance.items()],
+            "conflicts": [dict(conflict) for conflict in self.conflicts],
+        }
+
+def _merge(base, sources, no_override, overwrites_config, path, report):
+    base._copy_on_write()
+
+    # The children of every fragment, by key, in the order the keys first appear
+    grouped = dict()
+    for position, fragment in sources:
+        for key, child in fragment._object_properties.items():
+            grouped.setdefault(key, []).append((position, child))
+
+    for key, children in grouped.items():
+        allow_overwrite_subkeys, new_overwrites = key_config(overwrites_config, key)
+
+        key_path = path + [key]
+        suppliers = children
+        added_by = None
+        if key not in base:
+            # The subtree is copied, so that it belongs to `base` and not to the
+            # fragment it comes from
+            added_by, child = children[0]
+            base[key] = child._clone_tree(base, key)
+            report.provenance[tuple(key_path)] = added_by
+            children = children[1:]
+            if not children:
+                continue
+
+        current = base[key]
+        if current._is_primitive():
+            kept = added_by if no_override else children[-1][0]
+            if len(suppliers) > 1:
+                _check_conflict(key_path, [(position, child._value) for position, child in suppliers], report, kept)
+            if no_override:
+                continue
+
+            position, child = children[-1]
+            base._own_child(key)._value = child._value
+            report.provenance[tuple(key_path)] = position
+        elif current._is_object():
+            if not allow_overwrite_subkeys and no_override:
+                continue
+
+            _merge(base._own_child(key), children, no_override, new_overwrites, key_path, report)
+        elif current._is_array():
+            # Arrays already in the tree are kept
+            if len(suppliers) > 1:
+                _check_conflict(key_path, [(position, child._raw()) for position, child in suppliers], report, added_by)
+
+def _check_conflict(path, values, report, kept):
+    # Fragments conflict when they supply different values for the same path
+    first = values[0][1]
+    if any(value != first for _, value in values[1:]):
+        report.conflicts.append({
+            "path": path,
+            "fragments": [position for position, _ in values],
+            "kept": kept,
+        })
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+from .exceptions import OverlayError
+from .lazy import Deferred
+
+# Overlay directives, see `Schema._amend`
+OVERRIDE = "__override"
+ORIGINAL = "__original"
+DELETE = "__del"
+DELETE_ALL = "__del *"
+
+def apply_overlays(node, overlays, validate=True):
+    """Apply overlay documents to a tree, in one pass over the nodes they amend.
+
+    Overlays use the format of `Schema._amend`: a mapping of the properties to
+    amend, where values of the properties that are present are amendments of their
+    own, and values of the properties that are not are added. Primitive values are
+    replaced with `{"__override": value}`. Arrays are amended with
+    `{"__original": [...], "__override": [...]}`: the values of `__override` are
+    inserted first, followed by the items of the array that are listed in either
+    list, without the ones deleted by `"__del <value>"` (or all the items of
+    `__original`, with `"__del *"`).
+
+    The amendments of all the overlays are gathered per property, so each node is
+    visited once, and the overlays apply in the order they are given. Array values
+    are hashed once per amendment, which makes amending an array linear in the
+    number of its items and of the values of the amendment.
+
+    Parameters:
+        node: The Schema object to amend.
+        overlays: The overlay documents, in the order they apply.
+        validate: Whether to check every overlay with `validate_overlay` before any
+            of them is applied, so that an invalid overlay leaves the tree as it was.
+
+    Returns:
+        OverlayReport: The changes made to the tree.
+
+    Raises:
+        OverlayError: If `validate` is set and an overlay is invalid.
+    """
+    overlays = list(overlays)
+    if validate:
+        errors = []
+        for position, overlay in enumerate(overlays):
+            errors.extend(
+                (position, path, message) for path, message in validate_overlay(node, overlay)
+            )
+
+        if errors:
+            raise OverlayError(errors)
+
+    report = OverlayReport()
+    _OverlayApplier(report).apply(node, overlays)
+    return report
+
+def amend(node, amendments_spec):
+    """Apply a single overlay without validating it, see `Schema._amend`."""
+    _OverlayApplier(None).apply(node, [amendments_spec])
+
+def validate_overlay(node, overlay):
+    """Check the structure of an overlay document against a tree.
+
+    The properties of the overlay must be allowed by the Schema classes of the
+    nodes they amend or add, and directives must be used where the class of the
+    node supports them: `__override` for primitive values, and `__original` and a
+    list of `__override` values for arrays. The values of added properties are
+    validated when they are built.
+
+    Parameters:
+        node: The Schema object the overlay applies to.
+        overlay: The overlay document.
+
+    Returns:
+        list: (path, message) tuples, empty when the overlay is valid.
+    """
+    errors = []
+    _check(type(node), node, overlay, list(node._path), errors)
+    return errors
+
+class OverlayReport(object):
+    """The changes made by `apply_overlays`.
+
+    Attributes:
+        changes: One entry per change, in the order they were made: a dict with
+            the `path` of the node, the `action` ("add" for an added property,
+            "replace" for a primitive value, "array" for an amended array) and the
+            values involved (`value`, `old` and `new`, or `added` and `removed`).
+    """
+
+    def __init__(self):
+        self.changes = []
+
+    def add(self, path, action, **values):
+        self.changes.append(dict(path=path, action=action, **values))
+
+    def summary(self):
+        """Return the number of changes per action."""
+        counts = dict()
+        for change in self.changes:
+            counts[change["action"]] = counts.get(change["action"], 0) + 1
+
+        return counts
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+def value_key(value):
+    """Return a hashable key for a JSON-compatible value.
+
+    Values that compare equal, such as mappings with the same items, have the
+    same key, so that array items can be looked up in sets rather than compared
+    with every value of an amendment.
+    """
+    if isinstance(value, dict):
+        return ("__dict__", frozenset((key, value_key(item)) for key, item in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return ("__list__", tuple(value_key(item) for item in value))
+
+    return value
+
+def _check(node_class, node, overlay, path, errors, present=False):
+    # `node` is None below properties that are added by the overlay, and for
+    # present children that were not built yet
+    present = present or node is not None
+    if node_class._is_object():
+        if not isinstance(overlay, dict):
+            errors.append((path, "Expected a mapping of amendments"))
+            return
+
+        for prop, amendments in overlay.items():
+            prop_path = path + [prop]
+            # Read the child without building it, if it is deferred
+            child = dict.get(node._object_properties, prop) if node is not None else None
+            if type(child) is Deferred:
+                _check(child.schema_class, None, amendments, prop_path, errors, present=True)
+                continue
+            elif child is not None:
+                _check(type(child), child, amendments, prop_path, errors)
+                continue
+
+            _, prop_class = node_class._validate_property(prop)
+            if prop_class is None:
+                errors.append((prop_path, f"Property `{prop}` is not allowed"))
+            elif isinstance(amendments, dict) and OVERRIDE in amendments:
+                override = amendments[OVERRIDE]
+                if prop_class._is_array() and override and not isinstance(override, (list, tuple)):
+                    errors.append((prop_path, f"`{OVERRIDE}` of an array must be a list"))
+                elif prop_class._is_object() and override:
+                    errors.append((prop_path, f"`{OVERRIDE}` cannot add an object, give its value instead"))
+            elif isinstance(amendments, dict) and prop_class._is_object():
+                _check(prop_class, None, amendments, prop_path, errors)
+    elif node_class._is_array():
+        if not present:
+            # A new array is given as its value
+            return
+        if not isinstance(overlay, dict) or not isinstance(overlay.get(OVERRIDE), list):
+            errors.append((path, f"Expected a mapping with an `{OVERRIDE}` list"))
+            return
+        if not isinstance(overlay.get(ORIGINAL), list):
+            errors.append((path, f"Expected an `{ORIGINAL}` list"))
+
+        for item in overlay[OVERRIDE]:
+            if isinstance(item, str) and item.startswith(DELETE) and item != DELETE_ALL and not item.startswith(DELETE + " "):
+                errors.append((path, f"Unknown directive `{item}`"))
+    elif node_class._is_primitive():
+        if present and (not isinstance(overlay, dict) or OVERRIDE not in overlay):
+            errors.append((path, f"Expected a mapping with an `{OVERRIDE}` value"))
+
+
+class _OverlayApplier(object):
+
+    def __init__(self, report):
+        self.report = report
+
+    def apply(self, node, specs):
+        from .schema import Schema
+
+        if any(isinstance(spec, Schema) for spec in specs):
+            raise RuntimeError("Amending a spec with another spec is not currently supported")
+
+        node._copy_on_write()
+
+        if node._is_object():
+            grouped = dict()
+            for spec in specs:
+                for prop, amendments in spec.items():
+                    grouped.setdefault(prop, []).append(amendments)
+
+            for prop, amendments in grouped.items():
+                position = 0
+                # The first amendments of a missing property add it, the next ones amend it
+                while position < len(amendments) and prop not in node:
+                    self.add_property(node, prop, amendments[position])
+                    position += 1
+
+                if position < len(amendments):
+                    self.apply(node._own_child(prop), amendments[position:])
+        elif node._is_array():
+            for spec in specs:
+                self.amend_array(node, spec)
+        elif node._is_primitive():
+            for spec in specs:
+                if spec[OVERRIDE]:
+                    if self.report is not None:
+                        self.report.add(node._path, "replace", old=node._value, new=spec[OVERRIDE])
+                    node._value = spec[OVERRIDE]
+
+    def add_property(self, node, prop, amendments):
+        prop_type, prop_class = node._validate_property(prop)
+        if isinstance(amendments, dict) and OVERRIDE in amendments:
+            if not amendments[OVERRIDE]:
+                return
+
+            if prop_class._is_primitive():
+                amendments = amendments[OVERRIDE]
+            elif prop_class._is_array():
+                if isinstance(amendments[OVERRIDE], list):
+                    amendments = amendments[OVERRIDE]
+                else:
+                    amendments = list(amendments[OVERRIDE])
+
+        node._present_properties.add(prop)
+        node._object_properties[prop] = prop_class(amendments, None, node._gentle_validation, parent=node, key=prop)
+        if self.report is not None:
+            self.report.add(node._generate_path(prop), "add", value=amendments)
+
+    def amend_array(self, node, spec):
+        original = {value_key(value) for value in spec[ORIGINAL]}
+        # Items are kept when they are listed, even as a directive
+        listed = set()
+        delete_items = set()
+        revised_list = list()
+        for item in spec[OVERRIDE]:
+            listed.add(value_key(item))
+            if not item:
+                continue
+            elif item == DELETE_ALL:
+                delete_items = set(original)
+            elif isinstance(item, str) and item.startswith(DELETE):
+                delete_items.add(item[6:])
+            else:
+                revised_list.append(node._items(item, parent=node, key="array"))
+
+        added = len(revised_list)
+        removed = []
+        for item in node._value:
+            key = value_key(item._raw())
+            if (key in original or key in listed) and key not in delete_items:
+                revised_list.append(item)
+            else:
+                removed.append(item)
+
+        kept = {id(item) for item in revised_list}
+        for item in node._value:
+            if id(item) not in kept:
+                node._release_child("array", item)
+
+        node._value = revised_list
+        if self.report is not None and (added or removed):
+            self.report.add(
+                node._path,
+                "array",
+                added=[item._raw() for item in revised_list[:added]],
+                removed=[item._raw() for item in removed],
+            )
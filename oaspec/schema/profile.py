@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from time import perf_counter
+from collections import Counter
+from contextlib import contextmanager
+
+# The statistics collected for the current thread, if it is being profiled
+_active = threading.local()
+
+def active_stats():
+    """Return the `ParseStats` collecting statistics in the current thread, if any."""
+    return getattr(_active, "stats", None)
+
+class ParseStats(object):
+    """Statistics collected while specifications are loaded and parsed.
+
+    Profiling is opt-in: the hooks in `Schema` only look up the active statistics
+    of their thread, and do nothing else when there are none. Statistics are
+    collected in the thread that activated them, with `with stats:` or by an
+    `OASpecParser` created with `profile=True`. Nodes parsed in worker processes
+    (see `parse_spec(workers=...)`) are not counted.
+
+    Attributes:
+        phases: The wall time spent in each phase (such as "load" or "parse"),
+            in seconds, in the order the phases first ran.
+        nodes: The number of Schema objects built, by class name.
+        validations: The number of jsonschema validations.
+        validation_time: The time spent in jsonschema validations, in seconds.
+        failed_trials: The number of subschemas tried and rejected while picking
+            the class of an allOf/anyOf/oneOf node, by class name of the node.
+        warnings: The number of warnings issued, by warning class name.
+    """
+
+    def __init__(self):
+        self.phases = dict()
+        self.nodes = Counter()
+        self.validations = 0
+        self.validation_time = 0.0
+        self.failed_trials = Counter()
+        self.warnings = Counter()
+        self._previous = []
+
+    @contextmanager
+    def phase(self, name):
+        """Time a phase, adding its wall time to `phases`.
+
+        The statistics are active during the phase, so that the nodes it builds
+        and the validations it runs are counted.
+        """
+        start = perf_counter()
+        with self:
+            try:
+                yield self
+            finally:
+                self.phases[name] = self.phases.get(name, 0.0) + perf_counter() - start
+
+    def as_dict(self):
+        """Return the statistics as plain, JSON serializable data."""
+        return {
+            "phases": dict(self.phases),
+            "nodes": dict(self.nodes.most_common()),
+            "total_nodes": sum(self.nodes.values()),
+            "validations": self.validations,
+            "validation_time": self.validation_time,
+            "failed_trials": dict(self.failed_trials.most_common()),
+            "warnings": dict(self.warnings.most_common()),
+        }
+
+    def merge(self, stats):
+        """Add the statistics of another parse, such as ones collected by another process.
+
+        Parameters:
+            stats: A `ParseStats` object or the output of its `as_dict`.
+        """
+        if isinstance(stats, ParseStats):
+            stats = stats.as_dict()
+
+        for name, elapsed in stats["phases"].items():
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+        self.nodes.update(stats["nodes"])
+        self.validations += stats["validations"]
+        self.validation_time += stats["validation_time"]
+        self.failed_trials.update(stats["failed_trials"])
+        self.warnings.update(stats["warnings"])
+
+    def report(self, limit=10):
+        """Format the statistics as a human readable report.
+
+        Parameters:
+            limit: The number of classes listed for the node and trial counts.
+
+        Returns:
+            str: The report, one line per measure.
+        """
+        lines = ["Phases:"]
+        lines.extend(f"  {name:24} {elapsed * 1000:10.1f}ms" for name, elapsed in self.phases.items())
+        lines.append(
+            f"Validations: {self.validations} ({self.validation_time * 1000:.1f}ms)"
+        )
+        lines.append(f"Nodes built: {sum(self.nodes.values())}")
+        lines.extend(f"  {name:40} {count:8}" for name, count in self.nodes.most_common(limit))
+        lines.append(f"Failed subschema trials: {sum(self.failed_trials.values())}")
+        lines.extend(f"  {name:40} {count:8}" for name, count in self.failed_trials.most_common(limit))
+        lines.append(f"Warnings: {sum(self.warnings.values())}")
+        lines.extend(f"  {name:40} {count:8}" for name, count in self.warnings.most_common())
+
+        return "\n".join(lines)
+
+    def __enter__(self):
+        self._previous.append(active_stats())
+        _active.stats = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _active.stats = self._previous.pop()
+
+    def __getstate__(self):
+        # The activation stack only makes sense in the thread that built it
+        state = dict(self.__dict__)
+        state["_previous"] = []
+        return state
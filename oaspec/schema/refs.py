@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+from urllib.parse import unquote
+
+from .exceptions import OASpecParserError
+
+def reference_of(node):
+    """Return the `$ref` of a Reference object, or None for any other node.
+
+    References are recognized by their content rather than their class, since
+    a `$ref` can appear wherever the OAS schema allows any value.
+    """
+    properties = node.__dict__.get("_object_properties")
+    if properties is None or "$ref" not in properties:
+        return None
+
+    ref = properties["$ref"]
+    ref = getattr(ref, "_value", ref)
+    return ref if isinstance(ref, str) else None
+
+def escape_token(key):
+    """Escape a key for use in a JSON pointer (RFC 6901)."""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+def unescape_token(token):
+    """Turn a JSON pointer token back into the key it was escaped from."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+class RefIndex(object):
+    """Resolves the local `$ref` links of a parsed specification.
+
+    The members of the `components` sections, which are the targets of almost
+    every reference, are indexed by their JSON pointer when the index is built.
+    Any other pointer is walked from its closest indexed parent the first time it
+    is looked up, and is indexed from then on. Resolved chains of references are
+    memoized, so each reference of a specification is followed once.
+
+    The index is built on demand by `Schema._resolve` and stored on the root of
+    the tree. It is dropped, and marked as no longer `valid`, when any node of
+    the tree is modified through `_amend`, `_update` or `__setitem__`.
+
+    Parameters:
+        root: The root Schema object of the parsed specification.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.valid = True
+        self._nodes = {"#": root}
+        self._resolved = dict()
+
+        components = self._child(root, "components")
+        if components is None:
+            return
+
+        for section in list(components._object_properties):
+            container = self._child(components, section)
+            if container is None:
+                continue
+
+            section_pointer = "#/components/" + escape_token(section)
+            self._nodes[section_pointer] = container
+            for key in list(container._object_properties):
+                self._nodes[section_pointer + "/" + escape_token(key)] = container[key]
+
+    def lookup(self, pointer):
+        """Return the node a local JSON pointer points at, without following references.
+
+        Parameters:
+            pointer: A local reference, such as "#/components/schemas/Pet".
+
+        Returns:
+            Schema: The node at the pointer.
+        """
+        node = self._nodes.get(pointer)
+        if node is not None:
+            return node
+
+        if not pointer.startswith("#/"):
+            raise OASpecParserError("Only local references (starting with '#/') are supported", pointer)
+
+        normalized = unquote(pointer)
+        if normalized != pointer:
+            node = self.lookup(normalized)
+        else:
+            parent_pointer, _, token = pointer.rpartition("/")
+            node = self._child(self.lookup(parent_pointer), unescape_token(token))
+            if node is None:
+                raise OASpecParserError("Reference target not found", pointer)
+
+        self._nodes[pointer] = node
+        return node
+
+    def resolve(self, ref):
+        """Follow a reference, and the references it leads to, to the node they designate.
+
+        Parameters:
+            ref: A local reference, such as "#/components/schemas/Pet".
+
+        Returns:
+            Schema: The first node of the chain that is not a Reference object.
+        """
+        node = self._resolved.get(ref)
+        if node is not None:
+            return node
+
+        chain = [ref]
+        node = self.lookup(ref)
+        next_ref = reference_of(node)
+        while next_ref is not None:
+            if next_ref in self._resolved:
+                node = self._resolved[next_ref]
+                break
+            elif next_ref in chain:
+                raise OASpecParserError(
+                    "Circular reference: {}".format(" -> ".join([*chain, next_ref])),
+                    ref
+                )
+
+            chain.append(next_ref)
+            node = self.lookup(next_ref)
+            next_ref = reference_of(node)
+
+        for chain_ref in chain:
+            self._resolved[chain_ref] = node
+
+        return node
+
+    @staticmethod
+    def _child(node, key):
+        # The child of a mapping or array node, or None when it has none under `key`
+        properties = node.__dict__.get("_object_properties")
+        if properties is not None:
+            return properties.get(key)
+
+        value = node.__dict__.get("_value")
+        if isinstance(value, list):
+            try:
+                return value[int(key)]
+            except (ValueError, IndexError):
+                return None
+
+        return None
+
+def walk(node, follow_refs=False):
+    """Iterate over a node and its descendants, depth first.
+
+    With `follow_refs`, each Reference object is replaced by the node it resolves
+    to when it is reached, and the walk continues into that node. Nothing is
+    resolved or built (in lazy trees) before the walk gets to it. Every node is
+    walked into once: a target that was already reached, such as a shared
+    component or a recursive schema, is yielded again but not walked into again.
+
+    Parameters:
+        node: The Schema object to start from.
+        follow_refs: Whether to follow references.
+
+    Yields:
+        tuple: The keys leading from `node` to each descendant, and the descendant.
+    """
+    index = node._ref_index if follow_refs else None
+    yield from _walk(node, (), index, set())
+
+def _walk(node, keys, index, walked):
+    target = node
+    if index is not None:
+        ref = reference_of(node)
+        if ref is not None:
+            target = index.resolve(ref)
+            if id(target) in walked:
+                yield keys, target
+                return
+
+    yield keys, target
+
+    properties = target.__dict__.get("_object_properties")
+    if properties is not None:
+        children = ((key, properties[key]) for key in list(properties))
+    elif isinstance(target.__dict__.get("_value"), list):
+        children = enumerate(list(target._value))
+    else:
+        return
+
+    if index is not None:
+        walked.add(id(target))
+
+    for key, child in children:
+        yield from _walk(child, (*keys, key), index, walked)
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import json
+import hashlib
+import threading
+from time import perf_counter
+
+from ..__version__ import __root_dir__
+from .exceptions import OASpecParserError
+from .schema import Schema, build_schema
+from .cache import SchemaCache
+from .funcs import get_schema_classes
+
+class SchemaRegistry(object):
+    """A process-wide store of compiled Schema class trees.
+
+    Building the Schema subclasses for an OAS validation schema is expensive, so
+    the registry builds the class tree for each OpenAPI version once, on first use,
+    and hands the same root class to every caller. Builds are guarded by a lock
+    per version, so concurrent callers wait for a single build instead of racing.
+
+    Compiled class trees can also be persisted in a `SchemaCache`, so that a new
+    process can restore them from disk instead of building them. Cache entries are
+    unpickled, so the persistent cache is opt-in: it is used when `cache` is True
+    (in the default directory) or a `SchemaCache`, or when `cache` is None and the
+    `OASPEC_CACHE_DIR` environment variable is set, unless `OASPEC_NO_CACHE` is set.
+
+    Attributes:
+        specs_dir: The directory containing the `oas-<version>.json` schema files.
+        cache: The `SchemaCache` used to persist class trees, or None.
+    """
+
+    def __init__(self, specs_dir=None, cache=None):
+        self.specs_dir = specs_dir or (__root_dir__ / "specs")
+
+        if cache is None:
+            cache = bool(os.environ.get("OASPEC_CACHE_DIR")) and not os.environ.get("OASPEC_NO_CACHE")
+        if cache is True:
+            cache = SchemaCache()
+        self.cache = cache or None
+
+        self._lock = threading.Lock()
+        self._version_locks = dict()
+        self._entries = dict()
+        self._stats = dict()
+        self._class_lists = dict()
+        self._class_positions = dict()
+        self._digests = dict()
+
+    def get(self, schema_version):
+        """Return the compiled root Schema class for an OpenAPI version.
+
+        Parameters:
+            schema_version: The OpenAPI version string, such as "3.0.1".
+
+        Returns:
+            Schema: The `openapiObject` Schema subclass shared by all parsers.
+        """
+        schema_class = self._get_entry(schema_version)[0]
+
+        with self._lock:
+            self._stats[schema_version]["requests"] += 1
+
+        return schema_class
+
+    def get_validation_schema(self, schema_version):
+        """Return the raw OAS validation schema the class tree was built from.
+
+        Parameters:
+            schema_version: The OpenAPI version string, such as "3.0.1".
+
+        Returns:
+            dict: The loaded `oas-<version>.json` schema.
+        """
+        return self._get_entry(schema_version)[1]
+
+    def get_class(self, schema_version, position):
+        """Return a Schema subclass by its position in a compiled class tree.
+
+        Parameters:
+            schema_version: The OpenAPI version string, such as "3.0.1".
+            position: The position of the class in the list returned by
+                `get_schema_classes` for the version's root class.
+
+        Returns:
+            Schema: The Schema subclass.
+        """
+        return self._get_class_list(schema_version)[position]
+
+    def locate(self, schema_class):
+        """Find the OpenAPI version and position of a compiled Schema subclass.
+
+        Classes are not importable by name since they are created at runtime, so
+        they are identified across processes by their version and position, which
+        are the same every time the same OAS schema is built (see `get_class`).
+
+        Parameters:
+            schema_class: A Schema subclass from a class tree built by the registry.
+
+        Returns:
+            tuple: The OpenAPI version string and the position of the class.
+        """
+        for schema_version in list(self._entries):
+            self._get_class_list(schema_version)
+            position = self._class_positions[schema_version].get(schema_class)
+            if position is not None:
+                return schema_version, position
+
+        raise LookupError(f"Schema class {schema_class.__name__} was not built by the registry")
+
+    def schema_digest(self, schema_version):
+        """Return a digest of the validation schema a class tree is built from.
+
+        Class positions (see `locate`) only identify the same classes for the same
+        validation schema, so data referencing classes by position records this
+        digest along with them.
+
+        Parameters:
+            schema_version: The OpenAPI version string, such as "3.0.1".
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the `oas-<version>.json` file.
+        """
+        digest = self._digests.get(schema_version)
+        if digest is None:
+            digest = hashlib.sha256(self._spec_file(schema_version).read_bytes()).hexdigest()
+            with self._lock:
+                self._digests[schema_version] = digest
+
+        return digest
+
+    def available_versions(self):
+        """List the OpenAPI versions with a validation schema in `specs_dir`.
+
+        Returns:
+            list: The version strings, sorted.
+        """
+        return sorted(spec_file.stem[4:] for spec_file in self.specs_dir.glob("oas-*.json"))
+
+    def stats(self, schema_version=None):
+        """Report how often each class tree was built and requested.
+
+        Parameters:
+            schema_version: Limit the report to a single OpenAPI version.
+
+        Returns:
+            dict: A mapping of versions to their `builds`, `cache_loads`, `build_time`
+                (in seconds, including cache loads) and `requests` counters, or the
+                counters of a single version.
+        """
+        with self._lock:
+            if schema_version is not None:
+                return dict(self._stats.get(schema_version, self._empty_stats()))
+
+            return {version: dict(stats) for version, stats in self._stats.items()}
+
+    def clear(self):
+        """Drop every compiled class tree and reset the counters."""
+        with self._lock:
+            self._version_locks.clear()
+            self._entries.clear()
+            self._stats.clear()
+            self._class_lists.clear()
+            self._class_positions.clear()
+            self._digests.clear()
+
+    def _get_entry(self, schema_version):
+        with self._lock:
+            entry = self._entries.get(schema_version)
+            if entry is not None:
+                return entry
+
+            version_lock = self._version_locks.setdefault(schema_version, threading.Lock())
+
+        with version_lock:
+            # Another thread may have finished the build while this one was waiting
+            entry = self._entries.get(schema_version)
+            if entry is not None:
+                return entry
+
+            start = perf_counter()
+            entry, from_cache = self._build(schema_version)
+            elapsed = perf_counter() - start
+
+            with self._lock:
+                self._entries[schema_version] = entry
+                stats = self._stats.setdefault(schema_version, self._empty_stats())
+                stats["cache_loads" if from_cache else "builds"] += 1
+                stats["build_time"] += elapsed
+
+        return entry
+
+    def _get_class_list(self, schema_version):
+        classes = self._class_lists.get(schema_version)
+        if classes is None:
+            classes = get_schema_classes(self._get_entry(schema_version)[0])
+            positions = {cls: position for position, cls in enumerate(classes)}
+
+            with self._lock:
+                self._class_positions[schema_version] = positions
+                self._class_lists[schema_version] = classes
+
+        return classes
+
+    def _build(self, schema_version):
+        spec_file = self._spec_file(schema_version)
+        schema_source = spec_file.read_bytes()
+
+        if self.cache is not None:
+            key = self.cache.key(schema_source)
+            entry = self.cache.load(schema_version, key, Schema)
+            if entry is not None:
+                return entry, True
+
+        validation_schema = json.loads(schema_source.decode("utf-8"))
+
+        schema_class = build_schema(
+            validation_schema,
+            Schema,
+            type("openapiObject", (Schema,), dict()),
+        )
+
+        if self.cache is not None:
+            self.cache.store(schema_version, key, schema_class, validation_schema)
+
+        return (schema_class, validation_schema), False
+
+    def _spec_file(self, schema_version):
+        spec_file = self.specs_dir / "oas-{}.json".format(schema_version)
+
+        if re.fullmatch(r"\A3\.\d{1,2}\.\d{1,2}\Z", schema_version) is None:
+            raise OASpecParserError("Invalid OpenAPI version number. oaspec only supports OpenAPI 3.*.*", "openapi")
+        if not spec_file.exists():
+            available_versions = "\n\t- ".join(self.available_versions())
+            raise OASpecParserError(
+                "Schema file is missing for specified version '{}'.\nSupported versions:\n\t- {}:".format(
+                    schema_version,
+                    available_versions
+                ),
+                "openapi"
+            )
+
+        return spec_file
+
+    @staticmethod
+    def _empty_stats():
+        return {"builds": 0, "cache_loads": 0, "build_time": 0.0, "requests": 0}
+
+
+registry = SchemaRegistry()
+
+def get_schema(schema_version):
+    """Return the shared root Schema class for an OpenAPI version.
+
+    Parameters:
+        schema_version: The OpenAPI version string, such as "3.0.1".
+
+    Returns:
+        Schema: The compiled `openapiObject` class from the process-wide registry.
+    """
+    return registry.get(schema_version)
+
+def restore_schema_object(schema_version, position):
+    """Create an empty Schema object of a registry class, used when unpickling.
+
+    Parameters:
+        schema_version: The OpenAPI version string of the class tree.
+        position: The position of the class returned by `SchemaRegistry.locate`.
+
+    Returns:
+        Schema: A new, uninitialized object whose state is set by pickle.
+    """
+    schema_class = registry.get_class(schema_version, position)
+    return schema_class.__new__(schema_class)
+
+def restore_schema_class(schema_version, position):
+    """Return a registry class by its location, used when unpickling Schema classes.
+
+    Parameters:
+        schema_version: The OpenAPI version string of the class tree.
+        position: The position of the class returned by `SchemaRegistry.locate`.
+
+    Returns:
+        Schema: The Schema subclass.
+    """
+    return registry.get_class(schema_version, position)
@@ -1,18 +1,63 @@
 # -*- coding: utf-8 -*-
 
 import re
+import copyreg
+import threading
 import jsonschema
-from copy import deepcopy
+from jsonschema.exceptions import best_match
+from copy import copy, deepcopy
 from warnings import warn
-from io import StringIO, IOBase
-from pathlib import Path
-import json
+from io import StringIO
+from time import perf_counter
+
+from .exceptions import OASpecParserWarning
+from .lazy import Deferred, LazyProperties
+from .intern import active_table
+from .profile import active_stats
+from .refs import RefIndex, reference_of, walk
+from .funcs import def_key, schema_hash, build_subschema_index, match_subschema_index
+from .definitions import DefinitionStore
+from . import serialize, overlay, merge, changes
+
+class SchemaType(type):
+    """The metaclass of `Schema` and of the subclasses `build_schema` creates.
+
+    Schema subclasses are created at runtime and cannot be pickled by name. The
+    metaclass gives them a type of their own, for which `copyreg` registers a
+    reducer that pickles the classes of the registry by their OpenAPI version and
+    position in the class tree (see `SchemaRegistry.locate`), so that classes can
+    be sent to other processes like Schema objects can.
+    """
+
+def _reduce_schema_class(schema_class):
+    from .registry import registry, restore_schema_class
+
+    try:
+        return restore_schema_class, registry.locate(schema_class)
+    except LookupError:
+        # Classes defined in a module, like Schema itself, are pickled by name
+        return schema_class.__qualname__
+
+copyreg.pickle(SchemaType, _reduce_schema_class)
+
+# The ids of the Schema objects whose state is being pickled by this thread, see
+# `Schema.__reduce_ex__`
+_pickling = threading.local()
 
-from .exceptions import OASpecParserError, OASpecParserWarning
-from .funcs import def_key, get_all_refs, get_def_classes, schema_hash
-from ..utils import yaml
+class _PickledState(object):
+    # The last entry of the pickled state of a Schema object with children. It is
+    # pickled after the rest of the state, when the object has been pickled.
 
-class Schema(object):
+    __slots__ = ("node_id",)
+
+    def __init__(self, node_id):
+        self.node_id = node_id
+
+    def __reduce__(self):
+        _pickling.nodes.discard(self.node_id)
+        return bool, ()
+
+class Schema(object, metaclass=SchemaType):
 
     _PRIMITIVES = {
         "string",
@@ -21,39 +66,69 @@ class Schema(object):
         "integer",
     }
 
-    def __init__(self, spec, path=None, gentle_validation=False):
-        self._raw_spec = deepcopy(spec)
-
+    # Validation modes: "node" validates every node against its own schema, "once"
+    # validates the node's whole subtree a single time and builds its descendants
+    # without validation, and "none" skips validation entirely.
+    _VALIDATION_MODES = {"node", "once", "none"}
+
+    # Nodes store a link to their parent and their key within it, and compute their
+    # full path on demand (see `_path`). Only top-level nodes built with an explicit
+    # `path` store it, as the prefix of the paths of their descendants.
+    _parent = None
+    _key = None
+    _path_prefix = ()
+
+    # The `DefinitionStore` shared by the classes built from the same validation schema
+    _definition_store = None
+
+    def __init__(self, spec, path=None, gentle_validation=False, validation="node", lazy=False, zero_copy=False,
+                 parent=None, key=None):
+        if parent is not None:
+            self._parent = parent
+            self._key = key
+        elif path:
+            self._path_prefix = tuple(path)
+
+        # Zero-copy nodes keep a reference to their part of the loaded document
+        # instead of a private deep copy (see `_copy_on_write`). Descendants always
+        # reference their part of the raw specification of their parent, so that a
+        # copying parse copies the document once.
+        self._raw_spec = spec if zero_copy else deepcopy(spec)
+        self._raw_spec_shared = zero_copy
+        self._lazy = lazy
+
+        if validation not in self._VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode: {validation}")
+
+        # Whether this node is known to satisfy its schema, either because it was just
+        # validated or because an ancestor validated it (or validation is disabled)
+        trusted = True
         try:
-            self.validate(self._raw_spec, True)
+            if validation == "node":
+                self.validate(self._raw_spec, True)
+            elif validation == "once":
+                self._validate_once(self._raw_spec)
             self._gentle_validation = False
         except jsonschema.ValidationError as e:
             if not gentle_validation:
                 raise e
+            trusted = False
             self._gentle_validation = False
 
+        # Descendants of a node validated with "once" are already covered by its validation
+        self._validation = "node" if validation == "node" else "none"
+
         # If the class has the _boolean_subschema attribute set to something
         # other than False, detect which definition is present in the parsed
         # specification and reinitialize the object as the corresponding class
         if self._boolean_subschema:
-            # print("Raw spec name:", type(self._raw_spec).__name__, )
-            # if issubclass(type(self._raw_spec), Schema):
-            #     if type(self.)
-
-            for subschema_cls in self._boolean_subschema_classes:
-                if subschema_cls.validate(self._raw_spec):
-                    self.__class__ = subschema_cls
-                    self.__init__(self._raw_spec, path, self._gentle_validation)
-                    return
-
-
-            # print(self._raw_spec._raw_spec)
-            # print(self._boolean_subschema_classes)
-            # print(type(self._raw_spec).__name__)
-            # print(path)
-            raise RuntimeError("Could not find matching subschema")
+            self.__class__ = self._select_subschema(trusted)
+            self.__init__(self._raw_spec, path, self._gentle_validation, self._validation, lazy, zero_copy, parent, key)
+            return
 
-        self._path = deepcopy(path) if path else []
+        stats = active_stats()
+        if stats is not None:
+            stats.nodes[type(self).__name__] += 1
 
         # if "type" in self._raw_spec:
         #     print(self._path, self._raw_spec["type"], self._type)
@@ -69,25 +144,57 @@ class Schema(object):
             # Create a new object for each item in the array using the class
             # specified in the _items attribute
             self._value = [
-                self._items(
-                    item,
-                    self._generate_path("array"),
-                    self._gentle_validation
-                ) for item in spec
+                self._create_child(self._items, item, "array") for item in self._raw_spec
             ]
         elif not isinstance(spec, dict):
-            self._value = deepcopy(spec)
+            self._value = spec if zero_copy else deepcopy(spec)
         else:
             self._set_properties()
             self._set_object_methods()
             # if len(self._path) > 2 and self._path[-2] == "ssh_keys":
             #     exit()
 
+    def _select_subschema(self, trusted):
+        """Pick the subschema class matching this node's raw specification.
+
+        The class's dispatch index rules out the subschemas that cannot match, which
+        usually leaves a single candidate. The remaining candidates are validated in
+        order and the first one that passes is used. When the node is already known
+        to satisfy the boolean schema, the validation of the last remaining candidate
+        (or, for allOf, of every candidate) is skipped, since it must pass.
+
+        Parameters:
+            trusted: Whether this node is known to satisfy the boolean schema.
+
+        Returns:
+            Schema: The Schema subclass to reinitialize this node as.
+        """
+        candidates = [
+            self._boolean_subschema_classes[position]
+            for position in match_subschema_index(self._subschema_index, self._raw_spec)
+        ]
+
+        if trusted and candidates and self._boolean_subschema == "allOf":
+            return candidates[0]
+
+        last = len(candidates) - 1
+        for idx, subschema_cls in enumerate(candidates):
+            if trusted and idx == last:
+                return subschema_cls
+            elif subschema_cls.validate(self._raw_spec):
+                return subschema_cls
+
+            stats = active_stats()
+            if stats is not None:
+                stats.failed_trials[type(self).__name__] += 1
+
+        raise RuntimeError("Could not find matching subschema")
+
     def _set_properties(self):
         # print(self._path)
         # if not hasattr(self, "_present_properties"):
         self._present_properties = set()
-        self._object_properties = dict()
+        self._object_properties = LazyProperties(self) if self._lazy else dict()
 
         # Set named properties by looking at each property present
         # in the schema definition and checking if it exists in the spec
@@ -103,7 +210,7 @@ class Schema(object):
         for prop, value in self._raw_spec.items():
             if prop in self._properties:
                 self._present_properties.add(prop)
-                self._object_properties[prop] = self._properties[prop](value, self._generate_path(prop), self._gentle_validation)
+                self._add_child(self._properties[prop], value, prop)
                 # if "ssh_keys" in self._path:
                 #     print(prop)
                 #     print(value)
@@ -124,7 +231,7 @@ class Schema(object):
                 if self._compiled_patterns[pattern].search(prop):
                     self._present_properties.add(prop)
                     # setattr(self, prop, prop_class(value))
-                    self._object_properties[prop] = prop_class(value, self._generate_path(prop), self._gentle_validation)
+                    self._add_child(prop_class, value, prop)
 
 
         # Set additional properties by parsing every key in the spec that
@@ -138,7 +245,7 @@ class Schema(object):
 
                 self._present_properties.add(prop)
                 # setattr(self, prop, self._additional_properties(value))
-                self._object_properties[prop] = self._additional_properties(value, self._generate_path(prop), self._gentle_validation)
+                self._add_child(self._additional_properties, value, prop)
 
         for prop in self._present_properties:
             if hasattr(self.__class__, prop):
@@ -154,26 +261,31 @@ class Schema(object):
                     OASpecParserWarning
                 )
 
-    def _validate_property(self, prop, return_class=True):
-        if prop in self._properties:
+                stats = active_stats()
+                if stats is not None:
+                    stats.warnings[OASpecParserWarning.__name__] += 1
+
+    @classmethod
+    def _validate_property(cls, prop, return_class=True):
+        if prop in cls._properties:
             if return_class:
-                return "schema_property", self._properties[prop]
+                return "schema_property", cls._properties[prop]
             return True
 
-        for pattern, prop_class in self._pattern_properties.items():
-            if self._compiled_patterns[pattern].search(prop):
+        for pattern, prop_class in cls._pattern_properties.items():
+            if cls._compiled_patterns[pattern].search(prop):
                 if return_class:
                     return "pattern_property", prop_class
                 return True
 
-        if self._additional_properties is not False:
+        if cls._additional_properties is not False:
             if prop == "$schema":
                 if return_class:
                     return False, None
                 return False
 
             if return_class:
-                return "additional_property", self._additional_properties
+                return "additional_property", cls._additional_properties
             return True
 
         if return_class:
@@ -181,98 +293,94 @@ class Schema(object):
         return False
 
 
-    def _set_object_methods(self):
-        self._keys = self.__keys__
+    @classmethod
+    def _property_order(cls, keys):
+        """Order the keys of a mapping the way `_set_properties` adds them.
 
-    def _amend(self, amendments_spec):
-        if isinstance(amendments_spec, Schema):
-            raise RuntimeError("Amending a spec with another spec is not currently supported")
+        Parameters:
+            keys: The keys of the mapping, in their original order.
 
-        # if self._path and self._path[-1] == "ssh_keys":
-            # print(self)
-            # print(self._id)
-            # print(self._parsing_schema)
-            # print(amendments_spec)
-            # exit()
-        if self._is_object():
-            for prop, amendments in amendments_spec.items():
-                if prop in self:
-                    self[prop]._amend(amendments)
-                    continue
+        Returns:
+            list: The keys that are properties of the class, in parsing order.
+        """
+        ordered = [key for key in keys if key in cls._properties]
+        present = set(ordered)
 
-                prop_type, prop_class = self._validate_property(prop)
-                if isinstance(amendments, dict) and "__override" in amendments:
-                    if not amendments["__override"]:
-                        continue
+        for pattern in cls._pattern_properties:
+            for key in keys:
+                if key not in present and cls._compiled_patterns[pattern].search(key):
+                    ordered.append(key)
+                    present.add(key)
 
-                    if prop_class._is_primitive():
-                        amendments = amendments["__override"]
-                    elif prop_class._is_array():
-                        if isinstance(amendments["__override"], list):
-                            amendments = amendments["__override"]
-                        else:
-                            amendments = list(amendments["__override"])
+        if cls._additional_properties is not False:
+            for key in keys:
+                if key not in present and key != "$schema":
+                    ordered.append(key)
+                    present.add(key)
 
+        return ordered
 
-                self._present_properties.add(prop)
-                self._object_properties[prop] = prop_class(amendments, self._generate_path(prop), self._gentle_validation)
-        elif self._is_array():
-            # print(self._generate_path("array"))
-            revised_list = list()
-            delete_items = set()
-            for item in amendments_spec["__override"]:
-                if not item:
-                    continue
-                elif item == "__del *":
-                    delete_items = set(amendments_spec["__original"])
-                elif item.startswith("__del"):
-                    delete_items.add(item[6:])
-                else:
-                    revised_list.append(self._items(item, self._generate_path("array")))
-
-            for item in self._value:
-                if item in amendments_spec["__original"] or item in amendments_spec["__override"]:
-                    if item._value in delete_items:
-                        continue
+    def _set_object_methods(self):
+        self._keys = self.__keys__
+
+    def _amend(self, amendments_spec):
+        """Apply an overlay to this node, see `oaspec.schema.overlay.apply_overlays`."""
+        overlay.amend(self, amendments_spec)
 
-                    revised_list.append(item)
+    def _apply_overlays(self, overlays, validate=True):
+        """Apply several overlays in one pass and report the changes.
 
-            self._value = revised_list
-        elif self._is_primitive():
-            if amendments_spec["__override"]:
-                self._value = amendments_spec["__override"]
+        Parameters:
+            overlays: The overlay documents, in the format of `_amend`.
+            validate: Whether to check the overlays before applying any of them.
+
+        Returns:
+            OverlayReport: The changes made, see `oaspec.schema.overlay.apply_overlays`.
+        """
+        return overlay.apply_overlays(self, overlays, validate)
 
     def _update(self, other, no_override=False, overwrites_config=None):
         self.__update(self, other, no_override, overwrites_config)
 
+    def _merge(self, fragments, no_override=False, overwrites_config=None):
+        """Merge many fragments into this node in one traversal.
+
+        Parameters:
+            fragments: Schema objects of the same class, in the order they apply.
+            no_override: Whether existing values are kept, as with `_update`.
+            overwrites_config: The configuration of the keys, as with `_update`.
+
+        Returns:
+            MergeReport: See `oaspec.schema.merge.merge_fragments`.
+        """
+        return merge.merge_fragments(self, fragments, no_override, overwrites_config)
+
     @staticmethod
     def __update(base, other, no_override=False, overwrites_config=None):
-        allow_overwrite_subkeys = False
-        new_overwrites = None
+        base._copy_on_write()
+
         for key in other:
-            if overwrites_config:
-                if key in overwrites_config:
-                    if overwrites_config[key] == "__overwrite_subkeys":
-                        allow_overwrite_subkeys = True
-                    else:
-                        new_overwrites = overwrites_config[key]
+            allow_overwrite_subkeys, new_overwrites = merge.key_config(overwrites_config, key)
 
             if key in base:
                 if base[key]._is_primitive():
                     if no_override:
                         continue
 
-                    base[key]._value = other[key]._value
+                    base._own_child(key)._value = other[key]._value
                 elif base[key]._is_object():
                     if not allow_overwrite_subkeys:
                         if no_override:
                             continue
-                    Schema.__update(base[key], other[key], no_override, new_overwrites)
+                    Schema.__update(base._own_child(key), other[key], no_override, new_overwrites)
             else:
                 # print(key)
                 base[key] = other[key]
 
     def __setitem__(self, key, value):
+        self._copy_on_write()
+
+        self._release_child(key, dict.get(self._object_properties, key))
 
         prop_type, prop_class = self._validate_property(key)
 
@@ -287,7 +395,7 @@ class Schema(object):
                     self._object_properties[key] = value
         else:
             self._present_properties.add(key)
-            self._object_properties[key] = prop_class(value, self._generate_path(key), True)
+            self._object_properties[key] = prop_class(value, None, True, parent=self, key=key)
 
     @classmethod
     def _is_primitive(cls):
@@ -323,8 +431,12 @@ class Schema(object):
                 validation failure if `raise_on_failure` is False.
         """
 
+        stats = active_stats()
+        if stats is not None:
+            start = perf_counter()
+
         try:
-            jsonschema.validate(spec, cls._parsing_schema)
+            cls._get_validator().validate(spec)
             return True
         except jsonschema.ValidationError as e:
             if raise_on_failure:
@@ -333,9 +445,311 @@ class Schema(object):
             return False
         except Exception as e:
             raise e
+        finally:
+            if stats is not None:
+                stats.validations += 1
+                stats.validation_time += perf_counter() - start
+
+    @classmethod
+    def _get_validator(cls):
+        """Return the compiled jsonschema validator for this class's `_parsing_schema`.
+
+        Validators are created once per class and reused, rather than being rebuilt
+        (and having their schema checked) on every call. jsonschema resolvers keep
+        per-call state while following refs, so each thread gets its own validator.
+
+        Returns:
+            jsonschema.IValidator: The validator for this class.
+        """
+        local = cls.__dict__.get("_validators")
+        if local is None:
+            local = threading.local()
+            cls._validators = local
+
+        validator = getattr(local, "validator", None)
+        if validator is None:
+            validator_cls = jsonschema.validators.validator_for(cls._parsing_schema)
+            if cls._definition_store is not None:
+                validator = validator_cls(cls._parsing_schema, resolver=cls._definition_store.resolver())
+            else:
+                validator = validator_cls(cls._parsing_schema)
+            local.validator = validator
+
+        return validator
+
+    def _validate_once(self, spec):
+        """Validate a whole subtree and raise the most relevant error, if any.
+
+        The error's path is extended with the path of this node, so that it points
+        at the failing node in the full specification.
+        """
+        stats = active_stats()
+        if stats is not None:
+            start = perf_counter()
+
+        error = best_match(self._get_validator().iter_errors(spec))
+
+        if stats is not None:
+            stats.validations += 1
+            stats.validation_time += perf_counter() - start
+
+        if error is not None:
+            error.path.extendleft(reversed(self._path))
+            raise error
+
+    def _create_child(self, schema_class, value, key):
+        table = active_table()
+        if table is None:
+            return self._build_child(schema_class, value, key)
+
+        child, shared = table.intern(schema_class, value, lambda: self._build_child(schema_class, value, key))
+        if shared:
+            # The child keeps the parent and key of its first occurrence
+            child.__dict__.setdefault("_shared_by", []).append((self, key))
+
+        return child
+
+    def _build_child(self, schema_class, value, key):
+        return schema_class(
+            value,
+            None,
+            self._gentle_validation,
+            self._validation,
+            self._lazy,
+            True,
+            self,
+            key,
+        )
+
+    def _copy_on_write(self):
+        """Detach a zero-copy node from the shared document before it is mutated.
+
+        Zero-copy nodes reference the loaded document rather than holding a copy
+        of it. Before `_amend`, `_update` or `__setitem__` change a node, the node
+        takes a shallow copy of its own raw mapping, so that the shared document is
+        never modified through, or attributed to, a node that no longer matches it.
+        Only the mutated node's own level is copied; unchanged children keep sharing
+        the document. Values passed to the mutating methods are always deep copied
+        into the nodes built from them.
+
+        Nodes shared between several parents by an `InternTable` are detached the
+        same way: the other parents are given a copy of the node, so that the change
+        only affects the occurrence at the node's `_path`.
+        """
+        self._drop_ref_index()
+        self._drop_subtree_hash()
+
+        shared_by = self.__dict__.pop("_shared_by", None)
+        if shared_by:
+            for parent, key in shared_by:
+                parent._replace_child(key, self, self._clone_shared(parent, key))
+
+        if self._raw_spec_shared:
+            if isinstance(self._raw_spec, (dict, list)):
+                self._raw_spec = copy(self._raw_spec)
+            self._raw_spec_shared = False
+
+    @property
+    def _ref_index(self):
+        """The `RefIndex` of the tree this node belongs to, built on first use."""
+        root = self
+        while root._parent is not None:
+            root = root._parent
+
+        index = root.__dict__.get("_ref_index")
+        if index is None:
+            index = root.__dict__["_ref_index"] = RefIndex(root)
+
+        return index
+
+    def _drop_ref_index(self):
+        root = self
+        while root._parent is not None:
+            root = root._parent
+
+        index = root.__dict__.pop("_ref_index", None)
+        if index is not None:
+            index.valid = False
+
+    def _drop_subtree_hash(self):
+        # The cached hashes of this node and of its ancestors no longer match their content
+        node = self
+        while node is not None:
+            node.__dict__.pop("_subtree_hash", None)
+            node = node._parent
+
+    def _subtree_hash(self):
+        """Return the cached content hash of this subtree, see `oaspec.schema.changes.subtree_hash`."""
+        return changes.subtree_hash(self)
+
+    def _resolve(self):
+        """Return the node a Reference object refers to.
+
+        Chains of references are followed to the first node that is not a Reference
+        object, and the result is memoized for every reference of the chain (see
+        `RefIndex`). The referenced node is also stored on the Reference object, until
+        the tree is modified. Only local references are supported, and circular
+        chains raise an `OASpecParserError`.
+
+        Returns:
+            Schema: The referenced node, or this node if it is not a Reference object.
+        """
+        resolved = self.__dict__.get("_resolved")
+        if resolved is not None and resolved[0].valid:
+            return resolved[1]
+
+        ref = reference_of(self)
+        if ref is None:
+            return self
+
+        index = self._ref_index
+        target = index.resolve(ref)
+        self._resolved = (index, target)
+        return target
+
+    def _walk(self, follow_refs=False):
+        """Iterate over this node and its descendants, see `oaspec.schema.refs.walk`."""
+        return walk(self, follow_refs)
+
+    def _own_child(self, key):
+        """Return the child stored under a key, ready to be modified in place.
+
+        A child shared with other parents by an `InternTable` is replaced by a
+        private copy when this node is not its first occurrence, and detached from
+        the other parents otherwise.
+        """
+        child = self[key]
+        if isinstance(child, Schema):
+            # The hashes of this node and its ancestors were dropped by `_copy_on_write`
+            child.__dict__.pop("_subtree_hash", None)
+        if not isinstance(child, Schema) or not child.__dict__.get("_shared_by"):
+            return child
+
+        if child._parent is self and child._key == key:
+            child._copy_on_write()
+            return child
+
+        self._release_child(key, child)
+        clone = child._clone_shared(self, key)
+        self._replace_child(key, child, clone)
+        return clone
+
+    def _clone_shared(self, parent, key):
+        # A shallow copy of a shared node for another of its parents. The raw
+        # specification and the children are shared with the original, which are
+        # copied on write like any other shared node.
+        clone = type(self).__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone._parent = parent
+        clone._key = key
+        clone._raw_spec_shared = self._raw_spec_shared = True
+
+        if isinstance(self.__dict__.get("_value"), list):
+            clone._value = list(self._value)
+            children = [("array", item) for item in clone._value]
+        elif "_object_properties" in self.__dict__:
+            clone._present_properties = set(self._present_properties)
+            if isinstance(self._object_properties, LazyProperties):
+                clone._object_properties = LazyProperties(clone)
+                dict.update(clone._object_properties, dict.items(self._object_properties))
+            else:
+                clone._object_properties = dict(self._object_properties)
+            clone._set_object_methods()
+            children = dict.items(clone._object_properties)
+        else:
+            children = ()
+
+        for child_key, child in children:
+            if isinstance(child, Schema):
+                child.__dict__.setdefault("_shared_by", []).append((clone, child_key))
+
+        return clone
+
+    def _clone_tree(self, parent, key):
+        # A copy of a node and its descendants, linked to another parent. The raw
+        # specifications are shared with the original, and copied on write.
+        state = self.__dict__
+        state["_raw_spec_shared"] = True
+        state = dict(state)
+        for attribute in ("_shared_by", "_ref_index", "_resolved", "_path_prefix"):
+            if attribute in state:
+                del state[attribute]
+        state["_parent"] = parent
+        state["_key"] = key
+
+        clone = type(self).__new__(type(self))
+        clone.__dict__ = state
+
+        value = state.get("_value")
+        if type(value) is list:
+            state["_value"] = [item._clone_tree(clone, "array") if isinstance(item, Schema) else item for item in value]
+        elif "_object_properties" in state:
+            properties = state["_object_properties"]
+            clone_properties = LazyProperties(clone) if type(properties) is LazyProperties else dict()
+            for child_key, child in dict.items(properties):
+                if isinstance(child, Schema):
+                    child = child._clone_tree(clone, child_key)
+                dict.__setitem__(clone_properties, child_key, child)
+
+            state["_object_properties"] = clone_properties
+            state["_present_properties"] = set(state["_present_properties"])
+            state["_keys"] = clone.__keys__
+
+        return clone
+
+    def _replace_child(self, key, child, replacement):
+        if key == "array" and isinstance(self.__dict__.get("_value"), list):
+            # Identical items of an array may share a node, any of them can be replaced
+            for idx in reversed(range(len(self._value))):
+                if self._value[idx] is child:
+                    self._value[idx] = replacement
+                    return
+        else:
+            self._object_properties[key] = replacement
+
+    def _release_child(self, key, child):
+        # Forget this node as one of the parents of a shared child it no longer holds
+        shared_by = child.__dict__.get("_shared_by") if isinstance(child, Schema) else None
+        if not shared_by:
+            return
+
+        for idx, (parent, parent_key) in enumerate(shared_by):
+            if parent is self and parent_key == key:
+                del shared_by[idx]
+                break
+        else:
+            # This node was the first occurrence, the next one takes its place
+            child._parent, child._key = shared_by.pop(0)
+
+        if not shared_by:
+            del child._shared_by
+
+    def _add_child(self, schema_class, value, key):
+        # Lazily parsed objects keep the raw value until the child is first read
+        if self._lazy:
+            self._object_properties[key] = Deferred(schema_class, value)
+        else:
+            self._object_properties[key] = self._create_child(schema_class, value, key)
+
+    @property
+    def _path(self):
+        """The keys leading from the top of the specification to this node.
+
+        Returns:
+            list: A new list of keys, built by following the parent links.
+        """
+        keys = []
+        node = self
+        while node._parent is not None:
+            keys.append(node._key)
+            node = node._parent
+
+        keys.extend(reversed(node._path_prefix))
+        keys.reverse()
+        return keys
 
     def _generate_path(self, next_key):
-        new_path = deepcopy(self._path)
+        new_path = self._path
         new_path.append(next_key)
         return new_path
 
@@ -397,33 +811,101 @@ class Schema(object):
             pass
 
     def _dump_yaml(self, fp=None):
-        if not fp:
+        """Dump the object as YAML, to a string or to a file.
+
+        The tree is written as it is walked (see `serialize.write_yaml`), without
+        building the `_raw` copy of it first.
+
+        Parameters:
+            fp: A path, or a text or binary file object. Without one, the YAML
+                document is returned as a string.
+        """
+        if fp is None:
             buffer = StringIO()
-            yaml.dump(self._raw(), buffer)
+            serialize.write_yaml(self, buffer)
             return buffer.getvalue()
 
-        if isinstance(fp, Path):
-            with fp.open("w", encoding="utf-8") as f:
-                yaml.dump(self._raw(), f)
-        elif isinstance(fp, IOBase):
-            yaml.dump(self._raw(), fp)
-
-    def _dump_json(self, fp=None):
-        if not fp:
-            return json.dumps(
-                self._raw(),
-                ensure_ascii=False,
-                indent=2,
-            )
+        serialize.write_yaml(self, fp)
 
-        if isinstance(fp, Path):
-            with fp.open("w", encoding="utf-8") as f:
-                json.dump(
-                    self._raw(),
-                    f,
-                    ensure_ascii=False,
-                    indent=2,
-                )
+    def _dump_json(self, fp=None, mode="pretty"):
+        """Dump the object as JSON, to a string or to a file.
+
+        The tree is written as it is walked (see `serialize.iter_json`), without
+        building the `_raw` copy of it first.
+
+        Parameters:
+            fp: A path, or a text or binary file object. Without one, the JSON
+                document is returned as a string.
+            mode: "pretty" (indented), "compact" (without whitespace) or "canonical"
+                (compact, with the keys of every mapping sorted).
+        """
+        if fp is None:
+            return "".join(serialize.iter_json(self, mode))
+
+        serialize.write_json(self, fp, mode)
+
+    def _dump_snapshot(self, fp=None):
+        """Dump the object and its descendants as a binary snapshot.
+
+        Snapshots are reloaded with `oaspec.schema.load_snapshot`, without parsing
+        or validating the specification again (see `snapshot.dump_snapshot`).
+
+        Parameters:
+            fp: A path or a binary file object. Without one, the snapshot is
+                returned as bytes.
+        """
+        from .snapshot import dump_snapshot
+
+        return dump_snapshot(self, fp)
+
+    def __reduce_ex__(self, protocol):
+        """Pickle the object with a reference to its class in the schema registry.
+
+        Schema subclasses are created at runtime and cannot be pickled by name,
+        so the class is stored as its OpenAPI version and position in the class
+        tree (see `SchemaRegistry.locate`). Only objects of classes built by
+        the registry can be pickled.
+
+        The top object of the pickle is pickled without its parent, with its
+        path as its path prefix, so that pickling a subtree does not pickle the
+        rest of the tree. Its descendants keep the links to their parents.
+        """
+        from .registry import registry, restore_schema_object
+
+        nodes = getattr(_pickling, "nodes", None)
+        if nodes is None:
+            nodes = _pickling.nodes = set()
+
+        state = dict(self.__dict__)
+        # The bound method is recreated by __setstate__
+        state.pop("_keys", None)
+        state.pop("_ref_index", None)
+        state.pop("_resolved", None)
+
+        ancestor = self._parent
+        while ancestor is not None and id(ancestor) not in nodes:
+            ancestor = ancestor._parent
+
+        if ancestor is None:
+            # The other parents of a shared object are left out as well
+            state.pop("_parent", None)
+            state.pop("_key", None)
+            state.pop("_shared_by", None)
+            path = self._path
+            if path:
+                state["_path_prefix"] = tuple(path)
+
+        if "_object_properties" in state or isinstance(state.get("_value"), list):
+            nodes.add(id(self))
+            state["_pickled"] = _PickledState(id(self))
+
+        return restore_schema_object, registry.locate(type(self)), state
+
+    def __setstate__(self, state):
+        state.pop("_pickled", None)
+        self.__dict__.update(state)
+        if "_object_properties" in state:
+            self._set_object_methods()
 
     def __repr__(self):
         return str(self._value)
@@ -450,7 +932,7 @@ class Schema(object):
             if isinstance(key, Schema):
                 key = key._value
 
-            return key in [item._value for item in self._value]
+            return any(item._value == key for item in self._value)
 
         raise NotImplementedError("Object cannot check for contains")
 
@@ -496,7 +978,7 @@ class Schema(object):
 
 # OASchema = type("openapiObject", (Schema,), dict())
 
-def build_schema(schema, schema_base, schema_class, object_defs=None):
+def build_schema(schema, schema_base, schema_class, object_defs=None, definition_store=None):
     """Recursively build the Schema tree sub-classes for an entire OAS validation schema.
 
     Parameters:
@@ -510,6 +992,8 @@ def build_schema(schema, schema_base, schema_class, object_defs=None):
         object_defs: The Schema subclasses corresponding to the `definitions` property
             in an OAS schema. Definition classes are created on the first function call and
             should be passed directly on recursive calls to this function.
+        definition_store: The `DefinitionStore` of the `definitions` property. Like
+            `object_defs`, it is created on the first call and passed on recursive calls.
 
     Returns:
         Schema: Returns a subclass of the Schema class containing the metadata present
@@ -566,11 +1050,15 @@ def build_schema(schema, schema_base, schema_class, object_defs=None):
                 schema_base,
                 type(subschema_name, (schema_base,), dict()),
                 object_defs,
+                definition_store,
             )
 
             schema_class._boolean_subschema_classes.append(subschema_class)
 
         schema_class._raw_schema[bool_type] = [subschema._raw_schema for subschema in schema_class._boolean_subschema_classes]
+
+        # Precompute the constraints used to pick a subclass without trial validation
+        schema_class._subschema_index = build_subschema_index(schema_class._boolean_subschema_classes)
     else:
         schema_class._boolean_subschema = False
 
@@ -606,14 +1094,20 @@ def build_schema(schema, schema_base, schema_class, object_defs=None):
             for key, value in defs.items()
         }
         object_defs = schema_class._definitions
+
+        # The reference graph of the definitions is computed once, and every class
+        # shares the definition schemas of the store instead of copying them
+        definition_store = DefinitionStore(defs)
     else:
         # Subclasses need to have referenced definitions included in their _parsing_schema
-        # for schema validation to succeed. This extracts the ref links from the schema
-        # and adds the referenced raw objects to the `definitions` of the parsing schema
-        sub_definitions = get_def_classes(schema_class._parsing_schema, object_defs)
+        # for schema validation to succeed. The store lists the definitions referenced
+        # by the schema, and the ones they reference in turn.
+        sub_definitions = definition_store.definitions_for(schema_class._parsing_schema) if definition_store else None
         if sub_definitions:
             schema_class._parsing_schema["definitions"] = sub_definitions
 
+    schema_class._definition_store = definition_store
+
 
     # After bare classes have been created for all definitions, actually add metadata from schema.
     # This section will only run at the top level of the schema.
@@ -629,7 +1123,8 @@ def build_schema(schema, schema_base, schema_class, object_defs=None):
             value,
             schema_base,
             subschema_class,
-            object_defs
+            object_defs,
+            definition_store,
         )
 
     # Process the named properties defined in the OAS schema and created a subclass
@@ -657,7 +1152,8 @@ def build_schema(schema, schema_base, schema_class, object_defs=None):
             value,
             schema_base,
             type(prop_object_name, (schema_base,), dict()),
-            object_defs
+            object_defs,
+            definition_store,
         )
 
         schema_class._properties[prop] = subschema
@@ -685,6 +1181,7 @@ def build_schema(schema, schema_base, schema_class, object_defs=None):
             schema_base,
             type(items_object_name, (schema_base,), dict()),
             object_defs,
+            definition_store,
         )
 
         schema_class._raw_schema["items"] = schema_class._items._raw_schema
@@ -707,6 +1204,7 @@ def build_schema(schema, schema_base, schema_class, object_defs=None):
             schema_base,
             type(pattern_prop_name, (schema_base,), dict()),
             object_defs,
+            definition_store,
         )
 
         schema_class._pattern_properties[pattern] = subschema
@@ -732,6 +1230,7 @@ def build_schema(schema, schema_base, schema_class, object_defs=None):
             schema_base,
             type(additional_props_name, (schema_base,), dict()),
             object_defs,
+            definition_store,
         )
 
         # schema_class._raw_schema["additionalProperties"] = schema_class._additional_properties._raw_schema
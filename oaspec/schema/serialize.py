@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+from pathlib import Path
+from contextlib import contextmanager
+
+from ruamel.yaml import YAML
+from ruamel.yaml.events import (
+    DocumentStartEvent, DocumentEndEvent, MappingStartEvent, MappingEndEvent,
+    SequenceStartEvent, SequenceEndEvent, ScalarEvent,
+)
+from ruamel.yaml.nodes import ScalarNode, MappingNode, SequenceNode
+
+from ..utils import yaml as round_trip_yaml
+
+# JSON output modes: "pretty" is indented like `json.dumps(indent=2)`, "compact" has
+# no whitespace, and "canonical" also sorts the keys of every mapping.
+JSON_MODES = {
+    "pretty": dict(indent=2, separators=(",", ": "), sort_keys=False),
+    "compact": dict(indent=None, separators=(",", ":"), sort_keys=False),
+    "canonical": dict(indent=None, separators=(",", ":"), sort_keys=True),
+}
+
+# Chunks are gathered up to this many characters before being written out
+_BUFFER_SIZE = 65536
+
+def iter_json(node, mode="pretty"):
+    """Serialize a Schema tree to JSON, one chunk at a time.
+
+    The tree is walked directly instead of being converted by `Schema._raw` first,
+    so the memory used does not depend on the size of the tree. The output is the
+    same as `json.dumps(node._raw(), ensure_ascii=False, ...)` with the options of
+    the mode.
+
+    Parameters:
+        node: The Schema object to serialize.
+        mode: One of `JSON_MODES`.
+
+    Yields:
+        str: Consecutive parts of the JSON document.
+    """
+    if mode not in JSON_MODES:
+        raise ValueError("Unknown JSON mode '{}'. Supported modes: {}".format(mode, ", ".join(JSON_MODES)))
+
+    options = JSON_MODES[mode]
+    return _JSONWriter(**options).iter_node(node, 0)
+
+def write_json(node, fp, mode="pretty"):
+    """Write a Schema tree to a file as JSON, see `iter_json`.
+
+    Parameters:
+        node: The Schema object to serialize.
+        fp: A path, or a text or binary file object.
+        mode: One of `JSON_MODES`.
+    """
+    with _open_output(fp) as write:
+        buffer = []
+        size = 0
+        for chunk in iter_json(node, mode):
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= _BUFFER_SIZE:
+                write("".join(buffer))
+                buffer.clear()
+                size = 0
+
+        write("".join(buffer))
+
+def write_yaml(node, fp):
+    """Write a Schema tree to a file as YAML.
+
+    The tree is walked directly and turned into ruamel.yaml emitter events, so no
+    copy of the tree is built. The output is the same as dumping `node._raw()` with
+    `oaspec.utils.yaml`.
+
+    Parameters:
+        node: The Schema object to serialize.
+        fp: A path, or a text or binary file object.
+    """
+    if isinstance(fp, (str, Path)):
+        with Path(fp).open("w", encoding="utf-8") as f:
+            return write_yaml(node, f)
+
+    _YAMLWriter(fp).write(node)
+
+def node_value(node):
+    """Return how a node is serialized, mirroring `Schema._raw`.
+
+    Returns:
+        tuple: "object" and the mapping of children, "array" and the list of items,
+            or "value" and the raw value of the node.
+    """
+    if node._is_primitive():
+        return "value", node._value
+    elif node._is_array():
+        return "array", node._value
+    elif node._is_object():
+        return "object", node._object_properties
+
+    return "value", None
+
+@contextmanager
+def _open_output(fp):
+    # Yields a function writing text to a path or to a text or binary file object
+    if isinstance(fp, (str, Path)):
+        with Path(fp).open("w", encoding="utf-8") as f:
+            yield f.write
+    elif isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(fp, "mode", ""):
+        yield lambda text: fp.write(text.encode("utf-8"))
+    else:
+        yield fp.write
+
+
+class _JSONWriter(object):
+
+    def __init__(self, indent, separators, sort_keys):
+        self.indent = indent
+        self.item_separator, self.key_separator = separators
+        self.sort_keys = sort_keys
+        self.encode_string = json.encoder.encode_basestring
+
+    def iter_node(self, node, level):
+        kind, value = node_value(node)
+        if kind == "object":
+            return self.iter_mapping(value, level, True)
+        elif kind == "array":
+            return self.iter_sequence(value, level, True)
+
+        return self.iter_value(value, level)
+
+    def iter_value(self, value, level):
+        # Raw values of primitive nodes, which may hold mappings and sequences
+        # after a gentle validation
+        if isinstance(value, dict):
+            return self.iter_mapping(value, level, False)
+        elif isinstance(value, (list, tuple)):
+            return self.iter_sequence(value, level, False)
+
+        return iter((self.encode_scalar(value),))
+
+    def iter_mapping(self, mapping, level, nodes):
+        if not mapping:
+            yield "{}"
+            return
+
+        newline, separator, closing = self.layout(level)
+        items = mapping.items()
+        if self.sort_keys:
+            items = sorted(items)
+
+        yield "{" + newline
+        first = True
+        for key, value in items:
+            if first:
+                first = False
+            else:
+                yield separator
+
+            yield self.encode_key(key) + self.key_separator
+            yield from (self.iter_node(value, level + 1) if nodes else self.iter_value(value, level + 1))
+
+        yield closing + "}"
+
+    def iter_sequence(self, sequence, level, nodes):
+        if not sequence:
+            yield "[]"
+            return
+
+        newline, separator, closing = self.layout(level)
+
+        yield "[" + newline
+        first = True
+        for item in sequence:
+            if first:
+                first = False
+            else:
+                yield separator
+
+            yield from (self.iter_node(item, level + 1) if nodes else self.iter_value(item, level + 1))
+
+        yield closing + "]"
+
+    def layout(self, level):
+        # The text opening the first item, separating items, and preceding the closing bracket
+        if self.indent is None:
+            return "", self.item_separator, ""
+
+        newline = "\n" + " " * (self.indent * (level + 1))
+        return newline, self.item_separator + newline, "\n" + " " * (self.indent * level)
+
+    def encode_scalar(self, value):
+        if isinstance(value, str):
+            return self.encode_string(value)
+        elif value is None:
+            return "null"
+        elif value is True:
+            return "true"
+        elif value is False:
+            return "false"
+        elif isinstance(value, int):
+            return int.__repr__(value)
+        elif isinstance(value, float):
+            return self.encode_float(value)
+
+        raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+    def encode_key(self, key):
+        if isinstance(key, str):
+            return self.encode_string(key)
+        elif isinstance(key, (int, float)) or key is None:
+            # Like `json`, other keys are turned into strings
+            return self.encode_string(self.encode_scalar(key))
+
+        raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
+    @staticmethod
+    def encode_float(value):
+        if value != value:
+            return "NaN"
+        elif value == float("inf"):
+            return "Infinity"
+        elif value == -float("inf"):
+            return "-Infinity"
+
+        return float.__repr__(value)
+
+
+class _YAMLWriter(object):
+
+    def __init__(self, stream):
+        # A new YAML object per document, since emitters keep the state of their output
+        self.yaml = YAML()
+        for setting in ("width", "preserve_quotes", "map_indent", "sequence_indent", "sequence_dash_offset"):
+            setattr(self.yaml, setting, getattr(round_trip_yaml, setting))
+
+        self.stream = stream
+        self.serializer, self.representer, self.emitter = self.yaml.get_serializer_representer_emitter(stream, None)
+        self.resolver = self.yaml.resolver
+
+        # The tags and flow styles the representer gives to mappings and sequences
+        self.mapping_node = self.representer.represent_data({"key": "value"})
+        self.sequence_node = self.representer.represent_data(["value"])
+        self.representer.represented_objects = dict()
+        self.representer.object_keeper = []
+
+    def write(self, node):
+        kind, _ = node_value(node)
+        if kind != "value":
+            # Values are represented as nested values, not as the document itself
+            # (which matters for `None`, written as an empty scalar when nested)
+            self.representer.represented_objects[None] = None
+
+        serializer = self.serializer
+        serializer.open()
+        try:
+            self.emitter.emit(DocumentStartEvent(
+                explicit=serializer.use_explicit_start,
+                version=serializer.use_version,
+                tags=serializer.use_tags,
+            ))
+            self.emit_node(node)
+            self.emitter.emit(DocumentEndEvent(explicit=serializer.use_explicit_end))
+            serializer.close()
+        finally:
+            self.emitter.dispose()
+
+    def emit_node(self, node):
+        kind, value = node_value(node)
+        if kind == "object":
+            self.emit_mapping(value, True)
+        elif kind == "array":
+            self.emit_sequence(value, True)
+        else:
+            self.emit_value(value)
+
+    def emit_value(self, value):
+        if isinstance(value, dict):
+            self.emit_mapping(value, False)
+        elif isinstance(value, (list, tuple)):
+            self.emit_sequence(value, False)
+        else:
+            self.emit_scalar(value)
+
+    def emit_mapping(self, mapping, nodes):
+        template = self.mapping_node
+        self.emitter.emit(MappingStartEvent(
+            None,
+            template.ctag,
+            template.ctag == self.resolver.resolve(MappingNode, None, True),
+            flow_style=template.flow_style,
+            nr_items=len(mapping),
+        ))
+
+        for key, value in mapping.items():
+            self.emit_scalar(key)
+            if nodes:
+                self.emit_node(value)
+            else:
+                self.emit_value(value)
+
+        self.emitter.emit(MappingEndEvent())
+
+    def emit_sequence(self, sequence, nodes):
+        template = self.sequence_node
+        self.emitter.emit(SequenceStartEvent(
+            None,
+            template.ctag,
+            template.ctag == self.resolver.resolve(SequenceNode, None, True),
+            flow_style=template.flow_style,
+        ))
+
+        for item in sequence:
+            if nodes:
+                self.emit_node(item)
+            else:
+                self.emit_value(item)
+
+        self.emitter.emit(SequenceEndEvent())
+
+    def emit_scalar(self, value):
+        # The same event the serializer emits for the node of a represented scalar
+        node = self.representer.represent_data(value)
+        if not isinstance(node, ScalarNode):
+            raise TypeError(f"Object of type {value.__class__.__name__} cannot be written as a YAML scalar")
+
+        detected_tag = self.resolver.resolve(ScalarNode, node.value, (True, False))
+        default_tag = self.resolver.resolve(ScalarNode, node.value, (False, True))
+        implicit = (
+            node.ctag == detected_tag,
+            node.ctag == default_tag,
+            node.tag.startswith("tag:yaml.org,2002:"),
+        )
+        self.emitter.emit(ScalarEvent(None, node.ctag, implicit, node.value, style=node.style))
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import struct
+from array import array
+from pathlib import Path
+
+from .lazy import Deferred, LazyProperties
+
+# Snapshots start with the magic bytes and the format version, followed by the pickled
+# snapshot tables. Snapshots of another format version are rejected by `load_snapshot`.
+MAGIC = b"OASPECSNAP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<10sH")
+
+# The kinds of nodes in a snapshot
+_OBJECT = 0
+_ARRAY = 1
+_VALUE = 2
+_DEFERRED = 3
+# Nodes without a value, see `Schema._raw`
+_EMPTY = 4
+# Nodes whose value is their raw specification, which is not stored twice
+_RAW_VALUE = 5
+
+def dump_snapshot(node, fp=None):
+    """Write a parsed tree in the compact binary snapshot format.
+
+    A snapshot lists the nodes of the tree in depth-first order, as the index of
+    their class in a table of the registry classes they use (see
+    `SchemaRegistry.locate`), their kind and the keys or value they hold. The raw
+    specification is stored once, for the top node: nodes whose raw specification
+    is the value under their key in their parent's get a reference to it on load,
+    like the nodes of a `zero_copy` parse. Children of a lazy tree that were not
+    built yet are stored as they are, and are only built after the snapshot is
+    loaded if they are accessed.
+
+    Nodes shared by an `InternTable` are stored, and loaded, once per occurrence.
+
+    Parameters:
+        node: The Schema object to snapshot. Its class, and the classes of its
+            descendants, must come from the schema registry.
+        fp: A path or a binary file object. Without one, the snapshot is returned
+            as bytes.
+
+    Returns:
+        bytes: The snapshot, when no `fp` is given.
+    """
+    payload = _SnapshotWriter().dump(node)
+    data = _HEADER.pack(MAGIC, FORMAT_VERSION) + pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+    if fp is None:
+        return data
+
+    if isinstance(fp, (str, Path)):
+        Path(fp).write_bytes(data)
+    else:
+        fp.write(data)
+
+def load_snapshot(source):
+    """Load a tree from a snapshot written by `dump_snapshot` or `Schema._dump_snapshot`.
+
+    The nodes are recreated from the snapshot tables: the specification is not
+    parsed, built or validated again.
+
+    Parameters:
+        source: The snapshot as bytes, a path or a binary file object.
+
+    Returns:
+        Schema: The top node of the snapshot.
+    """
+    if isinstance(source, (str, Path)):
+        data = Path(source).read_bytes()
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    else:
+        data = source.read()
+
+    if len(data) < _HEADER.size:
+        raise ValueError("Not an oaspec snapshot")
+
+    magic, format_version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not an oaspec snapshot")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot format version {format_version} (expected {FORMAT_VERSION})"
+        )
+
+    payload = pickle.loads(memoryview(data)[_HEADER.size:])
+    return _SnapshotReader(payload).load()
+
+
+class _SnapshotWriter(object):
+
+    def __init__(self):
+        from .registry import registry
+
+        self.registry = registry
+        # Indices in the tables of classes and of node settings, by class and by settings
+        self.class_ids = dict()
+        self.setting_ids = dict()
+
+        self.node_classes = array("I")
+        self.node_kinds = array("B")
+        self.node_settings = array("H")
+        self.values = []
+        # The raw specifications and keys that cannot be derived from the parent node,
+        # and the present properties that are not the keys of the node, by node index
+        self.raw_specs = dict()
+        self.keys = dict()
+        self.present_properties = dict()
+
+    def dump(self, node):
+        self.write_node(node, None, None, None)
+
+        locations = [self.registry.locate(schema_class) for schema_class in self.class_ids]
+
+        return {
+            "classes": locations,
+            "settings": list(self.setting_ids),
+            "digests": {
+                version: self.registry.schema_digest(version)
+                for version in {version for version, _ in locations}
+            },
+            "path": tuple(node._path),
+            "raw_spec": node._raw_spec,
+            "node_classes": self.node_classes,
+            "node_kinds": self.node_kinds,
+            "node_settings": self.node_settings,
+            "values": self.values,
+            "raw_specs": self.raw_specs,
+            "keys": self.keys,
+            "present_properties": self.present_properties,
+        }
+
+    def write_node(self, node, parent_raw, key, default_key):
+        index = len(self.node_classes)
+        self.write_class(type(node))
+
+        settings = (node._lazy, node._gentle_validation, node._validation)
+        setting_id = self.setting_ids.get(settings)
+        if setting_id is None:
+            setting_id = self.setting_ids[settings] = len(self.setting_ids)
+        self.node_settings.append(setting_id)
+
+        raw_spec = node._raw_spec
+        if parent_raw is not None and not self.is_derived(raw_spec, parent_raw, key):
+            self.raw_specs[index] = raw_spec
+        if parent_raw is not None and node._key != default_key:
+            self.keys[index] = node._key
+
+        properties = node.__dict__.get("_object_properties")
+        if properties is not None:
+            self.node_kinds.append(_OBJECT)
+            self.values.append(tuple(properties))
+            if node._present_properties != set(properties):
+                self.present_properties[index] = tuple(node._present_properties)
+
+            raw_mapping = raw_spec if isinstance(raw_spec, dict) else dict()
+            # Read the children without building the deferred ones
+            for child_key, child in dict.items(properties):
+                if type(child) is Deferred:
+                    self.write_deferred(child, raw_mapping, child_key)
+                else:
+                    self.write_node(child, raw_mapping, child_key, child_key)
+        elif node._is_array():
+            self.node_kinds.append(_ARRAY)
+            self.values.append(len(node._value))
+
+            raw_list = raw_spec if isinstance(raw_spec, list) else []
+            for position, item in enumerate(node._value):
+                self.write_node(item, raw_list, position, "array")
+        elif "_value" in node.__dict__:
+            if self.is_derived(node._value, [raw_spec], 0):
+                self.node_kinds.append(_RAW_VALUE)
+                self.values.append(None)
+            else:
+                self.node_kinds.append(_VALUE)
+                self.values.append(node._value)
+        else:
+            self.node_kinds.append(_EMPTY)
+            self.values.append(None)
+
+    def write_deferred(self, deferred, parent_raw, key):
+        index = len(self.node_classes)
+        self.write_class(deferred.schema_class)
+        self.node_kinds.append(_DEFERRED)
+        self.node_settings.append(0)
+        self.values.append(None)
+
+        if not self.is_derived(deferred.value, parent_raw, key):
+            self.raw_specs[index] = deferred.value
+
+    def write_class(self, schema_class):
+        class_id = self.class_ids.get(schema_class)
+        if class_id is None:
+            class_id = self.class_ids[schema_class] = len(self.class_ids)
+        self.node_classes.append(class_id)
+
+    @staticmethod
+    def is_derived(raw_spec, parent_raw, key):
+        # Whether the raw specification of a node is the value under its key in its
+        # parent's, which is always the case unless a node was modified
+        try:
+            parent_value = parent_raw[key]
+        except (KeyError, IndexError):
+            return False
+
+        return parent_value is raw_spec
+
+
+class _SnapshotReader(object):
+
+    def __init__(self, payload):
+        from .registry import registry
+
+        for version, digest in payload["digests"].items():
+            if registry.schema_digest(version) != digest:
+                raise ValueError(
+                    f"The snapshot was written with another validation schema for OpenAPI {version}"
+                )
+
+        self.classes = [registry.get_class(version, position) for version, position in payload["classes"]]
+        self.settings = payload["settings"]
+        self.node_classes = payload["node_classes"]
+        self.node_kinds = payload["node_kinds"]
+        self.node_settings = payload["node_settings"]
+        self.values = payload["values"]
+        self.raw_specs = payload["raw_specs"]
+        self.keys = payload["keys"]
+        self.present_properties = payload["present_properties"]
+
+        self.path = payload["path"]
+        self.raw_spec = payload["raw_spec"]
+        self.position = 0
+
+    def load(self):
+        node = self.read_node(None, None, None, None)
+        if self.path:
+            node._path_prefix = self.path
+        # The top node owns the raw specification, which was copied by pickle
+        node._raw_spec = self.raw_spec
+        node._raw_spec_shared = False
+
+        return node
+
+    def read_node(self, parent, parent_raw, raw_key, key):
+        index = self.position
+        self.position += 1
+
+        schema_class = self.classes[self.node_classes[index]]
+        node = schema_class.__new__(schema_class)
+        if parent is not None:
+            node._parent = parent
+            node._key = self.keys.get(index, key)
+
+        raw_spec = self.raw_specs.get(index, _MISSING)
+        if raw_spec is _MISSING:
+            raw_spec = self.raw_spec if parent is None else parent_raw[raw_key]
+            node._raw_spec_shared = True
+        else:
+            node._raw_spec_shared = False
+        node._raw_spec = raw_spec
+
+        node._lazy, node._gentle_validation, node._validation = self.settings[self.node_settings[index]]
+
+        kind = self.node_kinds[index]
+        value = self.values[index]
+        if kind == _OBJECT:
+            properties = LazyProperties(node) if node._lazy else dict()
+            for child_key in value:
+                if self.node_kinds[self.position] == _DEFERRED:
+                    dict.__setitem__(properties, child_key, self.read_deferred(raw_spec, child_key))
+                else:
+                    dict.__setitem__(properties, child_key, self.read_node(node, raw_spec, child_key, child_key))
+
+            node._object_properties = properties
+            present_properties = self.present_properties.get(index)
+            node._present_properties = set(properties if present_properties is None else present_properties)
+            node._set_object_methods()
+        elif kind == _ARRAY:
+            # Items are created with the key "array", see `Schema.__init__`
+            node._value = [self.read_node(node, raw_spec, position, "array") for position in range(value)]
+        elif kind == _VALUE:
+            node._value = value
+        elif kind == _RAW_VALUE:
+            node._value = raw_spec
+
+        return node
+
+    def read_deferred(self, parent_raw, key):
+        index = self.position
+        self.position += 1
+
+        value = self.raw_specs.get(index, _MISSING)
+        if value is _MISSING:
+            value = parent_raw[key]
+
+        return Deferred(self.classes[self.node_classes[index]], value)
+
+_MISSING = object()
@@ -3,7 +3,17 @@
 from .spec import (
     OASpecParser,
 )
+from .stream import (
+    OASpecStreamParser,
+)
+from .bundle import (
+    FileCache,
+    bundle,
+)
 
 __all__ = (
     "OASpecParser",
+    "OASpecStreamParser",
+    "FileCache",
+    "bundle",
 )
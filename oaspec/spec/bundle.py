@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+from copy import deepcopy
+from pathlib import Path
+from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from ..schema import OASpecParserError
+from ..schema.refs import escape_token, unescape_token
+from ..utils import loaders
+
+class FileCache(object):
+    """A thread-safe cache of loaded documents, keyed by their path.
+
+    A cached document is reused as long as the modification time and size of its
+    file are unchanged, so fragments shared by several specifications, or by
+    successive bundles of the same specification, are read and loaded once.
+    Cached documents are shared and must not be modified.
+
+    Attributes:
+        hits: The number of documents served from the cache.
+        misses: The number of documents loaded from their file.
+    """
+
+    def __init__(self):
+        self._documents = dict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, loader=None):
+        """Return the loaded document of a file, loading it if it changed since it was cached.
+
+        Parameters:
+            path: The absolute path of the file.
+            loader: The loader used for the file, see `oaspec.utils.loaders.load`.
+
+        Returns:
+            The loaded document.
+        """
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size, loader)
+
+        with self._lock:
+            cached = self._documents.get(path)
+            if cached is not None and cached[0] == key:
+                self.hits += 1
+                return cached[1]
+
+        document = loaders.load(path.read_bytes(), loader)
+
+        with self._lock:
+            self._documents[path] = (key, document)
+            self.misses += 1
+
+        return document
+
+    def clear(self):
+        """Forget every cached document."""
+        with self._lock:
+            self._documents.clear()
+
+# The cache used by `bundle` and `load_documents` unless they are given another one
+file_cache = FileCache()
+
+def split_ref(ref, base_file):
+    """Split a reference into the file and the JSON pointer it designates.
+
+    Parameters:
+        ref: A reference, such as "./schemas/user.yaml#/User" or "#/components/schemas/User".
+        base_file: The absolute path of the file containing the reference.
+
+    Returns:
+        tuple: The absolute path of the referenced file and the decoded JSON
+            pointer within it ("" for the whole file).
+    """
+    file_part, _, pointer = ref.partition("#")
+    if "://" in file_part:
+        raise OASpecParserError("Only references to local files are supported", ref)
+
+    target_file = base_file
+    if file_part:
+        target_file = Path(os.path.normpath(base_file.parent / unquote(file_part)))
+
+    return target_file, unquote(pointer)
+
+def resolve_pointer(document, pointer, ref=None):
+    """Return the value a decoded JSON pointer designates within a document."""
+    value = document
+    for token in pointer.split("/")[1:]:
+        token = unescape_token(token)
+        try:
+            value = value[int(token)] if isinstance(value, list) else value[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise OASpecParserError("Reference target not found", ref or pointer) from None
+
+    return value
+
+def iter_refs(value):
+    """Yield every `$ref` string of a loaded document."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "$ref" and isinstance(item, str):
+                yield item
+            else:
+                yield from iter_refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_refs(item)
+
+def load_documents(spec_file, loader=None, workers=None, cache=None):
+    """Load a specification file and every file it references, directly or not.
+
+    Files are loaded on a thread pool as soon as a loaded file is found to
+    reference them, so that reading them overlaps with loading the others.
+
+    Parameters:
+        spec_file: The path of the root specification file.
+        loader: The loader used for every file, see `oaspec.utils.loaders.load`.
+        workers: The number of threads loading files.
+        cache: The `FileCache` to use. Defaults to the process-wide `file_cache`.
+
+    Returns:
+        dict: The loaded documents by absolute path, starting with the root file.
+    """
+    cache = file_cache if cache is None else cache
+    root_file = Path(spec_file).resolve(strict=True)
+    documents = dict()
+    # The files in the order they were discovered in, starting with the root file
+    discovered = [root_file]
+    seen = {root_file}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(cache.get, root_file, loader): root_file}
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                documents[path] = future.result()
+
+                for ref in iter_refs(documents[path]):
+                    target_file = split_ref(ref, path)[0]
+                    if target_file not in seen:
+                        seen.add(target_file)
+                        discovered.append(target_file)
+                        pending[executor.submit(cache.get, target_file, loader)] = target_file
+
+    return {path: documents[path] for path in discovered}
+
+def bundle(spec_file, loader=None, workers=None, cache=None):
+    """Bundle a specification split across several files into a single document.
+
+    References to other files are replaced by the value they designate the first
+    time they are found, and later references to the same value point at that
+    first occurrence with a local reference, like `swagger-cli bundle` does. The
+    `components` of the root file are bundled first, so that shared values end up
+    there when the root file references them. References within the root file are
+    kept as they are.
+
+    Parameters:
+        spec_file: The path of the root specification file.
+        loader, workers, cache: See `load_documents`.
+
+    Returns:
+        dict: The bundled specification. The loaded files are left unchanged.
+    """
+    documents = load_documents(spec_file, loader, workers, cache)
+    root_file = next(iter(documents))
+    return _Bundler(root_file, documents).bundle()
+
+
+class _Bundler(object):
+
+    def __init__(self, root_file, documents):
+        self.root_file = root_file
+        self.documents = documents
+        # The JSON pointer each inlined (file, pointer) was placed at
+        self.inlined = dict()
+
+    def bundle(self):
+        root = deepcopy(self.documents[self.root_file])
+
+        keys = list(root)
+        if "components" in root:
+            keys.remove("components")
+            keys.insert(0, "components")
+
+        for key in keys:
+            root[key] = self.rewrite(root[key], self.root_file, "/" + escape_token(key))
+
+        return root
+
+    def rewrite(self, value, base_file, location):
+        if isinstance(value, dict):
+            ref = value.get("$ref")
+            if isinstance(ref, str):
+                return self.rewrite_ref(value, ref, base_file, location)
+
+            for key in value:
+                value[key] = self.rewrite(value[key], base_file, location + "/" + escape_token(key))
+        elif isinstance(value, list):
+            for idx, item in enumerate(value):
+                value[idx] = self.rewrite(item, base_file, f"{location}/{idx}")
+
+        return value
+
+    def rewrite_ref(self, value, ref, base_file, location):
+        target_file, pointer = split_ref(ref, base_file)
+
+        if target_file == self.root_file:
+            if base_file != self.root_file:
+                value["$ref"] = "#" + pointer
+            return value
+
+        target = resolve_pointer(self.documents[target_file], pointer, ref)
+        inlined = self.find_inlined(target_file, pointer)
+        if inlined is not None:
+            return {"$ref": "#" + inlined}
+
+        self.inlined[(target_file, pointer)] = location
+        return self.rewrite(deepcopy(target), target_file, location)
+
+    def find_inlined(self, target_file, pointer):
+        # A value nested in an inlined value is found under its location
+        tokens = pointer.split("/")
+        for end in range(len(tokens), 0, -1):
+            location = self.inlined.get((target_file, "/".join(tokens[:end])))
+            if location is not None:
+                return "/".join([location, *tokens[end:]])
+
+        return None
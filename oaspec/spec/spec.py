@@ -1,21 +1,14 @@
 # -*- coding: utf-8 -*-
 
-import re
-import json
-# from ..utils import yaml
-import yaml
-
 from pathlib import Path
+from contextlib import contextmanager
 
 from typing import Optional, Union, MutableMapping
 
-# from collections.abc import MutableMapping as CollectionMutableMapping
-from ruamel.yaml.comments import CommentedMap
-import jsonschema
-
-from ..__version__ import __root_dir__
 from .. import schema
-from ..schema import OASpecParserError
+from ..utils import loaders
+from .subtrees import parse_parallel
+from .bundle import bundle
 
 class OASpecParser(object):
     """The top-level object for manipulating OpenAPI specifications.
@@ -27,39 +20,70 @@ class OASpecParser(object):
         _spec_file: The path of the specification source file
             (if a file was used as the specification source)
         _raw_spec: The raw, unproccessed specification source
+        _loader: The loader used for YAML and JSON sources (see `oaspec.utils.loaders`)
+        stats: The `ParseStats` collected by the parser when it was created with
+            `profile=True`, or None
     """
 
     def __init__(
             self,
-            spec: Optional[Union[str, dict, MutableMapping]] = None,
+            spec: Optional[Union[str, bytes, Path, dict, MutableMapping]] = None,
+            loader: Optional[str] = None,
+            profile: Union[bool, "schema.ParseStats"] = False,
     ):
         """Create a new OpenAPI specification control object.
 
         Parameters:
-            spec: A string pointing to a YAML or JSON file containing an OpenAPI
-                specification, a string containing a YAML or JSON representation
-                of an OpenAPI specification, or a parsed raw, mapping of an OpenAPI
-                specification.
+            spec: A path to a YAML or JSON file containing an OpenAPI specification,
+                a string or bytes containing a YAML or JSON representation of an
+                OpenAPI specification, a file object, or a parsed mapping of an
+                OpenAPI specification. Mappings are used as they are, without copying.
+            loader: "round_trip" to keep the comments and formatting of YAML sources,
+                "safe_c" to load YAML into plain dicts with libyaml when available,
+                or "json". By default JSON sources are loaded with "json" and YAML
+                sources with "round_trip".
+            profile: Collect the time spent in each phase of loading and parsing the
+                specification, the nodes built by class, the validations and the
+                failed subschema trials in `stats` (see `oaspec.schema.ParseStats`).
+                Pass a `ParseStats` instead of True to collect them there, such as
+                to add up the statistics of several parsers.
         """
 
+        if isinstance(profile, schema.ParseStats):
+            self.stats = profile
+        else:
+            self.stats = schema.ParseStats() if profile else None
         self._spec_file: Optional[Path] = None
-        self._schema = type("openapiObject", (schema.Schema,), dict()) #schema.OASchema
-
-        if type(spec) is str:
-            if (spec.endswith(".yaml") or spec.endswith(".yml") or spec.endswith(".json")):
-                self.load_file(spec)
-            else:
-                self.load_raw(spec)
-        elif isinstance(spec, dict):
-            self._raw_spec = yaml.load(json.dumps(spec))
-        elif isinstance(spec, CommentedMap):
+        self._schema = None
+        self._loader = loader
+
+        if isinstance(spec, MutableMapping):
             self._raw_spec = spec
+        elif isinstance(spec, Path) or (isinstance(spec, str) and self._is_file_path(spec)):
+            self.load_file(spec)
+        elif isinstance(spec, (str, bytes)) or hasattr(spec, "read"):
+            self.load_raw(spec)
         elif spec is not None:
             raise TypeError(
                 "`spec` must be a file path, a raw string containing a spec, "
                 "a parsed dictionary of a spec, or the _raw_spec from another OASpec"
             )
 
+    @staticmethod
+    def _is_file_path(spec):
+        # YAML and JSON documents span several lines or start with a bracket,
+        # while file paths are single lines that usually have a known extension
+        if "\n" in spec or loaders.sniff_format(spec) == "json":
+            return False
+
+        if Path(spec).suffix in {".yaml", ".yml", ".json"}:
+            return True
+
+        try:
+            return Path(spec).is_file()
+        except OSError:
+            return False
+
     def __setattr__(self, name, value):
         if name == "_raw_spec":
             self._process_raw_spec(value)
@@ -74,29 +98,21 @@ class OASpecParser(object):
         self._load_validation_schema(raw_spec["openapi"])
 
     def _load_validation_schema(self, schema_version):
-        specs_dir = __root_dir__ / "specs"
-        spec_file = specs_dir / "oas-{}.json".format(schema_version)
-
-        if re.fullmatch(r"\A3\.\d{1,2}\.\d{1,2}\Z", schema_version) is None:
-            raise OASpecParserError("Invalid OpenAPI version number. oaspec only supports OpenAPI 3.*.*", "openapi")
-        if not spec_file.exists():
-            available_versions = "\n\t- ".join([f.stem[4:] for f in specs_dir.glob("oas-*.json")])
-            raise OASpecParserError(
-                "Schema file is missing for specified version '{}'.\nSupported versions:\n\t- {}:".format(
-                    schema_version,
-                    available_versions
-                ),
-                "openapi"
-            )
+        # The compiled Schema class tree is shared by every parser in the process,
+        # so only the first parser for a given version pays for building it.
+        with self._phase("load_validation_schema"):
+            self._schema = schema.registry.get(schema_version)
+            self._validation_schema = schema.registry.get_validation_schema(schema_version)
 
-        with spec_file.open("r", encoding="utf-8") as f:
-            self._validation_schema = json.load(f)
+    @contextmanager
+    def _phase(self, name):
+        # Times a phase when the parser is profiled
+        if self.stats is None:
+            yield
+            return
 
-        schema.build_schema(
-            self._validation_schema,
-            schema.Schema,
-            self._schema,
-        )
+        with self.stats.phase(name):
+            yield
 
     def load_file(self, spec: str):
         """Load an OpenAPI specification file.
@@ -113,20 +129,139 @@ class OASpecParser(object):
         # will automatically throw FileNotFoundError if it doesn't exist.
         self._spec_file = Path(spec).resolve(strict=True)
 
-        with self._spec_file.open("r") as f:
-            if self._spec_file.suffix in {".yaml", ".yml", ".json"}:
-                self._raw_spec = yaml.load(f)
-            else:
-                raise ValueError("File type must end with '.yaml' or '.json'")
+        # The format is sniffed from the contents rather than the file extension
+        with self._phase("load"):
+            raw_spec = loaders.load(self._spec_file.read_bytes(), self._loader)
+
+        self._raw_spec = raw_spec
 
-    def load_raw(self, spec: str):
+    def load_bundle(self, spec: str, workers: Optional[int] = None, cache=None):
+        """Load an OpenAPI specification split across several files.
+
+        The file named in *spec* and every file it references are loaded concurrently
+        and bundled into a single specification (see `oaspec.spec.bundle.bundle`),
+        which is assigned to the instance's *_raw_spec* attribute.
+
+        Parameters:
+            spec: The path to the root OpenAPI specification file in YAML or JSON format.
+            workers: The number of threads loading files.
+            cache: The `FileCache` of loaded files. Defaults to a process-wide cache.
+        """
+
+        self._spec_file = Path(spec).resolve(strict=True)
+        with self._phase("load"):
+            raw_spec = bundle(self._spec_file, self._loader, workers, cache)
+
+        self._raw_spec = raw_spec
+
+    def load_raw(self, spec: Union[str, bytes]):
         """Parse and return a raw OpenAPI specification.
 
         Parameters:
-            spec: A string representing a raw OpenAPI specification.
+            spec: A string, bytes or file object representing a raw OpenAPI specification.
+        """
+
+        with self._phase("load"):
+            raw_spec = loaders.load(spec, self._loader)
+
+        self._raw_spec = raw_spec
+
+    def parse_spec(self, gentle_validation=False, validation="node", lazy=False, zero_copy=False, workers=None,
+                   intern=False):
+        """Parse the loaded specification into a tree of Schema objects.
+
+        Parameters:
+            gentle_validation: Continue parsing when the specification fails validation.
+            validation: "node" validates every node of the tree against its own schema,
+                "once" validates the whole specification a single time up front and
+                builds the tree without further validation, and "none" skips validation.
+            lazy: Keep the children of mapping objects as raw values and build them on
+                first access. With "node" validation, each child is validated when it
+                is built, so validation errors are raised on access.
+            zero_copy: Make the nodes reference the loaded specification instead of
+                deep copying it at every level. The loaded specification must not be
+                modified while the parsed tree is in use.
+            workers: Parse the entries of `paths` and the members of the `components`
+                sections in this many worker processes, and the rest of the
+                specification in the calling process. The parsed tree is the same
+                as when parsing serially.
+            intern: Share a single node between structurally identical subtrees of
+                the same class, which are copied when one of them is modified (see
+                `oaspec.schema.InternTable`). Pass an `InternTable` instead of True
+                to read its `stats()` after the parse. Interning requires an eager,
+                serial parse.
+
+        Returns:
+            Schema: The root `openapiObject` of the parsed specification.
         """
+        with self._phase("parse"):
+            return self._parse_spec(gentle_validation, validation, lazy, zero_copy, workers, intern)
+
+    def _parse_spec(self, gentle_validation, validation, lazy, zero_copy, workers, intern):
+        if intern:
+            if lazy or (workers is not None and workers > 1):
+                raise ValueError("Interning is only supported by eager, serial parses")
 
-        self._raw_spec = yaml.load(spec)
+            table = intern if isinstance(intern, schema.InternTable) else schema.InternTable()
+            with table:
+                return self._schema(
+                    self._raw_spec,
+                    gentle_validation=gentle_validation,
+                    validation=validation,
+                    zero_copy=zero_copy,
+                )
 
-    def parse_spec(self, gentle_validation=False):
-        return self._schema(self._raw_spec, gentle_validation=gentle_validation)
+        if workers is not None and workers > 1:
+            return parse_parallel(
+                self._schema,
+                self._raw_spec,
+                workers,
+                gentle_validation=gentle_validation,
+                validation=validation,
+                lazy=lazy,
+                zero_copy=zero_copy,
+            )
+
+        return self._schema(
+            self._raw_spec,
+            gentle_validation=gentle_validation,
+            validation=validation,
+            lazy=lazy,
+            zero_copy=zero_copy,
+        )
+
+    def reparse_spec(self, previous, gentle_validation=False, validation="once", lazy=None, zero_copy=None):
+        """Parse the loaded specification, reusing the unchanged parts of a previous parse.
+
+        Only the subtrees that differ from the ones `previous` was built from are
+        built and validated again (see `oaspec.schema.reparse`). The nodes of
+        `previous` are moved into the new tree, so it must not be used afterwards.
+
+        Parameters:
+            previous: The root `openapiObject` of a previous parse of the specification.
+            gentle_validation: Continue parsing when the specification fails validation.
+            validation: The validation mode used for changed subtrees.
+            lazy: Build the children of new mapping objects on first access. Defaults
+                to the mode of the previous parse.
+            zero_copy: Make the new nodes reference the loaded specification. Defaults
+                to the mode of the previous parse.
+
+        Returns:
+            Schema: The root `openapiObject` of the parsed specification.
+        """
+        with self._phase("reparse"):
+            return self._reparse_spec(previous, gentle_validation, validation, lazy, zero_copy)
+
+    def _reparse_spec(self, previous, gentle_validation, validation, lazy, zero_copy):
+        # A change of OpenAPI version changes every class of the tree
+        if type(previous) is not self._schema:
+            return self._parse_spec(gentle_validation, validation, bool(lazy), bool(zero_copy), None, False)
+
+        return schema.reparse(
+            previous,
+            self._raw_spec,
+            gentle_validation=gentle_validation,
+            validation=validation,
+            lazy=lazy,
+            zero_copy=zero_copy,
+        )
@@ -0,0 +1,451 @@
+# -*- coding: utf-8 -*-
+
+import re
+import json
+from json.decoder import scanstring
+from pathlib import Path
+
+from ruamel.yaml import YAML
+from ruamel.yaml.nodes import ScalarNode
+from ruamel.yaml.events import (
+    MappingStartEvent, MappingEndEvent, SequenceStartEvent, SequenceEndEvent,
+    ScalarEvent, AliasEvent,
+)
+
+from .. import schema
+from ..schema import OASpecParserError
+from .subtrees import COMPONENT_SECTIONS, parse_entry, attach_entries
+
+# Events produced by the YAML and JSON event sources
+MAP_START, MAP_END, SEQ_START, SEQ_END, KEY, SCALAR = range(6)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+_LITERALS = (("true", True), ("false", False), ("null", None))
+_YAML_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+class OASpecStreamParser(object):
+    """A streaming parser for very large OpenAPI specification files.
+
+    `OASpecParser` loads the whole document before parsing it, and the parsed tree
+    then holds a second copy of it. The stream parser instead consumes the parser
+    events of the document and builds the Schema objects of each entry of `paths`
+    and of the sections of `components` as soon as the entry is complete, so the
+    raw document is never held in full. Everything outside of those entries is small
+    and is parsed once the end of the document is reached.
+
+    Entries are validated on their own as they are built, and the rest of the
+    specification when the root object is built, so by default the stream parser
+    uses the "once" validation mode and zero-copy nodes (see `OASpecParser.parse_spec`).
+
+    Attributes:
+        _spec_file: The path of the specification source file
+            (if a file was used as the specification source)
+        _format: The format of the source, either "json" or "yaml"
+    """
+
+    def __init__(self, spec, format=None, chunk_size=65536):
+        """Create a new streaming parser.
+
+        Parameters:
+            spec: The path to a YAML or JSON specification file, or a text file object.
+            format: "json" or "yaml". Detected from the file extension for paths;
+                file objects are read as YAML, which also accepts JSON documents,
+                unless "json" is specified.
+            chunk_size: The number of characters read at a time from JSON sources.
+        """
+        self._spec_file = None
+        self._fp = None
+        self._chunk_size = chunk_size
+
+        if isinstance(spec, (str, Path)):
+            # Resolving the Path with `strict=True` will
+            # automatically throw FileNotFoundError if it doesn't exist.
+            self._spec_file = Path(spec).resolve(strict=True)
+            if format is None:
+                if self._spec_file.suffix == ".json":
+                    format = "json"
+                elif self._spec_file.suffix in {".yaml", ".yml"}:
+                    format = "yaml"
+                else:
+                    raise ValueError("File type must end with '.yaml' or '.json'")
+        elif hasattr(spec, "read"):
+            self._fp = spec
+        else:
+            raise TypeError("`spec` must be a file path or a text file object")
+
+        if format not in {None, "json", "yaml"}:
+            raise ValueError(f"Unknown specification format: {format}")
+
+        self._format = format or "yaml"
+
+    def iter_paths(self, gentle_validation=False, validation="once", lazy=False, zero_copy=True):
+        """Parse the `paths` of the specification one entry at a time.
+
+        Only the Path Item being yielded is held in memory, along with the parts
+        of the specification outside of `paths` and `components` (components
+        entries are validated and discarded).
+
+        Parameters:
+            See `parse_spec`.
+
+        Yields:
+            tuple: The path template and the parsed `pathItem` object.
+        """
+        entries = self._iter_entries(gentle_validation, validation, lazy, zero_copy)
+
+        for container_path, key, node in entries:
+            if container_path == ("paths",):
+                yield key, node
+
+    def parse_spec(self, on_path=None, gentle_validation=False, validation="once", lazy=False, zero_copy=True):
+        """Parse the specification into a tree of Schema objects.
+
+        Parameters:
+            on_path: A callable called with the path template and the parsed
+                `pathItem` object as soon as each entry of `paths` is complete.
+            gentle_validation: Continue parsing when the specification fails validation.
+            validation: The validation mode, see `OASpecParser.parse_spec`.
+            lazy: Build the children of mapping objects on first access.
+            zero_copy: Make the nodes reference the loaded values instead of
+                deep copying them at every level.
+
+        Returns:
+            Schema: The root `openapiObject` of the parsed specification.
+        """
+        options = (gentle_validation, validation, lazy, zero_copy)
+        entries = []
+
+        for container_path, key, node in self._iter_entries(*options):
+            entries.append((container_path, key, node))
+            if on_path is not None and container_path == ("paths",):
+                on_path(key, node)
+
+        # The streamed containers are empty in the skeleton, so that the root object
+        # only parses and validates what the entries did not cover
+        root = self._schema(
+            self._skeleton,
+            gentle_validation=gentle_validation,
+            validation=validation,
+            lazy=lazy,
+            zero_copy=zero_copy,
+        )
+        attach_entries(root, entries)
+
+        return root
+
+    def _iter_entries(self, gentle_validation, validation, lazy, zero_copy):
+        self._schema = None
+        self._skeleton = None
+        pending = []
+
+        for container_path, key, value in self._iter_raw_entries():
+            # The entries are parsed with the classes of the specification's version,
+            # which may only be found later in the document
+            if self._schema is None:
+                if "openapi" not in self._skeleton:
+                    pending.append((container_path, key, value))
+                    continue
+                self._load_schema()
+
+            for entry in pending + [(container_path, key, value)]:
+                yield entry[0], entry[1], parse_entry(self._schema, *entry, gentle_validation, validation, lazy, zero_copy)
+            pending.clear()
+
+        if self._skeleton is None or not isinstance(self._skeleton, dict):
+            raise OASpecParserError("The specification must be a mapping.", "openapi")
+
+        if self._schema is None:
+            self._load_schema()
+
+        for entry in pending:
+            yield entry[0], entry[1], parse_entry(self._schema, *entry, gentle_validation, validation, lazy, zero_copy)
+
+    def _load_schema(self):
+        if "openapi" not in self._skeleton:
+            raise OASpecParserError("Missing required field.", "openapi")
+
+        self._schema = schema.registry.get(str(self._skeleton["openapi"]))
+
+    def _iter_raw_entries(self):
+        """Build the raw values of the document from its events.
+
+        The values of the streamed containers are yielded as soon as they are
+        complete and are not added to their container, so the container stays
+        empty in the skeleton. Everything else is added to the skeleton.
+
+        Yields:
+            tuple: The keys of the container, the key and the raw value of an entry.
+        """
+        if self._spec_file is not None:
+            with self._spec_file.open("r", encoding="utf-8") as f:
+                yield from _iter_raw_entries(self._iter_events(f), self)
+        else:
+            yield from _iter_raw_entries(self._iter_events(self._fp), self)
+
+    def _iter_events(self, fp):
+        if self._format == "json":
+            return iter_json_events(fp, self._chunk_size)
+
+        return iter_yaml_events(fp)
+
+
+def _iter_raw_entries(events, parser):
+    # Each frame holds an open container, its pending mapping key, and the keys
+    # leading to it when it is the root, `components` or a streamed container.
+    stack = []
+
+    for event, value in events:
+        if event == KEY:
+            stack[-1][1] = value
+            continue
+        elif event == MAP_START or event == SEQ_START:
+            container_path = None
+            if not stack:
+                container_path = ()
+            elif stack[-1][2] is not None:
+                parent_path = stack[-1][2] + (stack[-1][1],)
+                if parent_path in {("paths",), ("components",)}:
+                    container_path = parent_path
+                elif len(parent_path) == 2 and parent_path[0] == "components" and \
+                        parent_path[1] in COMPONENT_SECTIONS:
+                    container_path = parent_path
+
+            stack.append([dict() if event == MAP_START else list(), None, container_path])
+            if len(stack) == 1:
+                parser._skeleton = stack[0][0]
+            continue
+        elif event == MAP_END or event == SEQ_END:
+            value = stack.pop()[0]
+            if not stack:
+                continue
+
+        if not stack:
+            # A scalar document
+            parser._skeleton = value
+            continue
+
+        container, key, container_path = stack[-1]
+        if type(container) is list:
+            container.append(value)
+        elif container_path is not None and container_path != () and container_path != ("components",):
+            yield container_path, key, value
+        else:
+            container[key] = value
+
+def iter_json_events(fp, chunk_size=65536):
+    """Generate parser events from a JSON document without loading it in full.
+
+    The document is read from `fp` in chunks of `chunk_size` characters, so the
+    memory used by the tokenizer does not depend on the size of the document.
+
+    Parameters:
+        fp: A text file object containing a JSON document.
+        chunk_size: The number of characters read from `fp` at a time.
+
+    Yields:
+        tuple: An event constant and its value (for KEY and SCALAR events) or None.
+    """
+
+    # For each open container, True for objects and False for arrays
+    containers = []
+    state = "value"
+
+    for token, value in _iter_json_tokens(fp, chunk_size):
+        if state == "colon":
+            if token != ":":
+                raise ValueError("Expected ':' in JSON document")
+            state = "value"
+        elif state == "comma" and token == ",":
+            state = "key" if containers[-1] else "value"
+        elif (state == "comma" or state == "key_or_end") and token == "}" or \
+                (state == "comma" or state == "value_or_end") and token == "]":
+            if containers.pop() is not (token == "}"):
+                raise ValueError(f"Unexpected '{token}' in JSON document")
+
+            state = "comma" if containers else "done"
+            yield (MAP_END if token == "}" else SEQ_END), None
+        elif state == "key" or state == "key_or_end":
+            if token != "string":
+                raise ValueError(f"Expected a string key in JSON document, found {value!r}")
+
+            state = "colon"
+            yield KEY, value
+        elif state == "value" or state == "value_or_end":
+            if token == "{":
+                containers.append(True)
+                state = "key_or_end"
+                yield MAP_START, None
+            elif token == "[":
+                containers.append(False)
+                state = "value_or_end"
+                yield SEQ_START, None
+            elif token in {"string", "number", "literal"}:
+                state = "comma" if containers else "done"
+                yield SCALAR, value
+            else:
+                raise ValueError(f"Unexpected '{token}' in JSON document")
+        else:
+            raise ValueError(f"Unexpected {token} in JSON document")
+
+    if state != "done":
+        raise ValueError("Unexpected end of JSON document")
+
+def _iter_json_tokens(fp, chunk_size):
+    buffer = fp.read(chunk_size)
+    eof = not buffer
+    pos = 0
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+
+        # Refill the buffer when the next token might continue past its end
+        if not eof and pos >= len(buffer) - 5:
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        elif pos >= len(buffer):
+            return
+
+        char = buffer[pos]
+        if char in "{}[],:":
+            pos += 1
+            yield char, None
+        elif char == '"':
+            try:
+                value, end = scanstring(buffer, pos + 1, True)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+
+                chunk = fp.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+
+            pos = end
+            yield "string", value
+        elif char in "tfn":
+            for literal, value in _LITERALS:
+                if buffer.startswith(literal, pos):
+                    pos += len(literal)
+                    yield "literal", value
+                    break
+            else:
+                raise ValueError(f"Invalid literal in JSON document: {buffer[pos:pos + 10]!r}")
+        else:
+            match = _NUMBER.match(buffer, pos)
+            if match is None:
+                raise ValueError(f"Unexpected character in JSON document: {char!r}")
+            elif not eof and (match.end() == len(buffer) or buffer[match.end()] in ".eE+-"):
+                # The number may continue in the next chunk, as after "1234567" or "1.5e-"
+                chunk = fp.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+
+            pos = match.end()
+            if match.group(1) or match.group(2):
+                yield "number", float(match.group(0))
+            else:
+                yield "number", int(match.group(0))
+
+def iter_yaml_events(fp):
+    """Generate parser events from a YAML document without composing it.
+
+    Uses the event API of ruamel.yaml, resolving and constructing each scalar
+    as it is parsed. The events of anchored values are kept so that they can be
+    replayed for their aliases.
+
+    Parameters:
+        fp: A text file object containing a YAML document.
+
+    Yields:
+        tuple: An event constant and its value (for KEY and SCALAR events) or None.
+    """
+    loader = YAML(typ="safe", pure=True)
+    resolver = loader.resolver
+    constructor = loader.constructor
+
+    # For each open container, True for a mapping expecting a key, False for
+    # a mapping expecting a value, and None for a sequence
+    frames = []
+    anchors = dict()
+    # The anchor, depth and events of each anchored container being parsed
+    recordings = []
+
+    def construct_scalar(event):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = resolver.resolve(ScalarNode, event.value, event.implicit)
+        # Recent versions of ruamel.yaml resolve tags to `Tag` objects
+        tag = str(tag)
+
+        if tag == _YAML_MERGE_TAG:
+            raise ValueError("YAML merge keys are not supported by the streaming parser")
+
+        construct = constructor.yaml_constructors.get(tag)
+        if construct is None:
+            return event.value
+
+        return construct(constructor, ScalarNode(tag, event.value))
+
+    def emit(item):
+        for recording in recordings:
+            recording[2].append(item)
+
+        return item
+
+    for event in loader.parse(fp):
+        expects_key = bool(frames) and frames[-1] is True
+
+        if isinstance(event, (ScalarEvent, AliasEvent)):
+            if isinstance(event, AliasEvent):
+                if event.anchor not in anchors:
+                    raise ValueError(f"Found undefined alias '{event.anchor}' in YAML document")
+                items = anchors[event.anchor]
+            else:
+                items = [(SCALAR, construct_scalar(event))]
+                if event.anchor:
+                    anchors[event.anchor] = items
+
+            if expects_key:
+                if len(items) != 1:
+                    raise ValueError("Complex mapping keys are not supported by the streaming parser")
+
+                frames[-1] = False
+                yield emit((KEY, items[0][1]))
+                continue
+
+            for item in items:
+                yield emit(item)
+
+            if frames and frames[-1] is False:
+                frames[-1] = True
+        elif isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+            if expects_key:
+                raise ValueError("Complex mapping keys are not supported by the streaming parser")
+
+            if event.anchor:
+                recordings.append((event.anchor, len(frames), []))
+
+            if isinstance(event, MappingStartEvent):
+                frames.append(True)
+                yield emit((MAP_START, None))
+            else:
+                frames.append(None)
+                yield emit((SEQ_START, None))
+        elif isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+            frames.pop()
+            yield emit((MAP_END if isinstance(event, MappingEndEvent) else SEQ_END, None))
+
+            if recordings and recordings[-1][1] == len(frames):
+                anchor, _, items = recordings.pop()
+                anchors[anchor] = items
+
+            if frames and frames[-1] is False:
+                frames[-1] = True
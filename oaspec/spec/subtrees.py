@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+import gc
+import pickle
+from copy import copy
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+from .. import schema
+from ..schema import OASpecParserError
+
+# The sections of the Components Object whose members are independent subtrees,
+# like the entries of the Paths Object
+COMPONENT_SECTIONS = (
+    "schemas", "responses", "parameters", "examples", "requestBodies",
+    "headers", "securitySchemes", "links", "callbacks",
+)
+
+def split_spec(raw_spec):
+    """Separate the independent subtrees of a specification from the rest of it.
+
+    The entries of `paths` and the members of the `components` sections can be
+    parsed on their own, without the rest of the specification.
+
+    Parameters:
+        raw_spec: The raw specification mapping.
+
+    Returns:
+        tuple: A skeleton of the specification, a copy in which the containers
+            of the subtrees are empty, and a list of the subtrees as tuples of
+            the keys of their container, their key and their raw value.
+    """
+    skeleton = copy(raw_spec)
+    entries = []
+
+    if isinstance(raw_spec.get("paths"), dict):
+        skeleton["paths"] = dict()
+        entries.extend((("paths",), key, value) for key, value in raw_spec["paths"].items())
+
+    if isinstance(raw_spec.get("components"), dict):
+        skeleton["components"] = copy(raw_spec["components"])
+        for section in COMPONENT_SECTIONS:
+            if isinstance(raw_spec["components"].get(section), dict):
+                skeleton["components"][section] = dict()
+                container_path = ("components", section)
+                entries.extend((container_path, key, value) for key, value in raw_spec["components"][section].items())
+
+    return skeleton, entries
+
+def parse_entry(schema_class, container_path, key, value, gentle_validation, validation, lazy, zero_copy):
+    """Parse a subtree of a specification on its own.
+
+    Parameters:
+        schema_class: The root Schema subclass of the specification's version.
+        container_path: The keys leading to the subtree's container.
+        key: The key of the subtree within its container.
+        value: The raw value of the subtree.
+        gentle_validation, validation, lazy, zero_copy: See `OASpecParser.parse_spec`.
+
+    Returns:
+        Schema: The parsed subtree, with its full path as its path prefix.
+    """
+    container_class = schema_class
+    for container_key in container_path:
+        container_class = container_class._properties[container_key]
+
+    entry_type, entry_class = container_class._validate_property(key)
+    if not entry_type:
+        raise OASpecParserError(
+            "Unexpected property '{}' in `{}`.".format(key, ".".join(container_path)),
+            key
+        )
+
+    return entry_class(
+        value,
+        [*container_path, key],
+        gentle_validation,
+        validation,
+        lazy,
+        zero_copy,
+    )
+
+def attach_entries(root, entries):
+    """Add parsed subtrees to the tree parsed from the skeleton of a specification.
+
+    The subtrees are linked to their container like any other child, and are
+    ordered the way the container would have ordered them when parsing them itself.
+
+    Parameters:
+        root: The root object parsed from the skeleton returned by `split_spec`.
+        entries: The keys of the container, the key and the parsed Schema object
+            of each subtree.
+    """
+    containers = dict()
+    for container_path, key, node in entries:
+        containers.setdefault(container_path, dict())[key] = node
+
+    for container_path, nodes in containers.items():
+        # The containers share the raw specification of the root, as they do in a
+        # zero-copy parse, so that the entries are listed in the root's as well
+        container = root
+        raw_spec = root._raw_spec
+        for container_key in container_path:
+            container = container[container_key]
+            raw_spec = raw_spec[container_key]
+            container._raw_spec = raw_spec
+
+        for key in type(container)._property_order(nodes):
+            node = nodes[key]
+            container._present_properties.add(key)
+            container._object_properties[key] = node
+            container._raw_spec[key] = node._raw_spec
+
+            node._parent = container
+            node._key = key
+            del node._path_prefix
+
+def parse_parallel(schema_class, raw_spec, workers, gentle_validation=False, validation="node", lazy=False,
+                   zero_copy=False):
+    """Parse a specification, spreading its independent subtrees over a process pool.
+
+    The subtrees returned by `split_spec` are parsed and validated in batches by
+    worker processes and sent back pickled (see `Schema.__reduce_ex__`), while
+    the skeleton of the specification is parsed in the calling process.
+
+    Only the skeleton and the unpickling of the subtrees are left to the calling
+    process. Unpickling takes about a fifth of the time of building the subtrees
+    with validation="once", which bounds the speedup.
+
+    Parameters:
+        schema_class: The root Schema subclass of the specification's version.
+        raw_spec: The raw specification mapping.
+        workers: The number of worker processes.
+        gentle_validation, validation, lazy, zero_copy: See `OASpecParser.parse_spec`.
+
+    Returns:
+        Schema: The root `openapiObject` of the parsed specification.
+    """
+    options = (gentle_validation, validation, lazy, zero_copy)
+    skeleton, entries = split_spec(raw_spec)
+    schema_version = schema.registry.locate(schema_class)[0]
+
+    # A few batches per worker keep the workers busy until the end without
+    # paying the cost of a round trip for every subtree
+    batch_size = max(1, -(-len(entries) // (workers * 4)))
+    batches = [entries[idx:idx + batch_size] for idx in range(0, len(entries), batch_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_parse_batch, repeat(schema_version), repeat(options), batches)
+
+        root = schema_class(
+            skeleton,
+            gentle_validation=gentle_validation,
+            validation=validation,
+            lazy=lazy,
+            zero_copy=zero_copy,
+        )
+
+        # Unpickling creates many objects that reference each other, which would
+        # trigger a long series of garbage collections that cannot free anything
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            nodes = [node for batch in results for node in pickle.loads(batch)]
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    attach_entries(root, [
+        (container_path, key, node) for (container_path, key, _), node in zip(entries, nodes)
+    ])
+
+    return root
+
+def _parse_batch(schema_version, options, batch):
+    schema_class = schema.registry.get(schema_version)
+
+    nodes = [
+        parse_entry(schema_class, container_path, key, value, *options)
+        for container_path, key, value in batch
+    ]
+
+    # Pickled here so that the calling process controls when they are unpickled
+    return pickle.dumps(nodes, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+
+from ruamel.yaml import YAML
+
+from . import yaml as round_trip_yaml
+
+try:
+    # PyYAML's bindings to libyaml are the fastest YAML loader available
+    from yaml import load as _libyaml_load, CSafeLoader as _LibyamlLoader
+except ImportError:
+    _LibyamlLoader = None
+
+# Loaders accepted by `load`: "round_trip" keeps comments and formatting in
+# ruamel.yaml's CommentedMap objects, "safe_c" loads plain dicts and lists with
+# libyaml when it is available, and "json" uses the standard library's parser.
+LOADERS = ("round_trip", "safe_c", "json")
+
+_BOM = "\ufeff"
+
+# ruamel.yaml's YAML objects keep the state of the document they are loading,
+# so every thread other than the main one loads with its own copy
+_local = threading.local()
+
+def _round_trip_load(source):
+    if threading.current_thread() is threading.main_thread():
+        return round_trip_yaml.load(source)
+
+    loader = getattr(_local, "round_trip", None)
+    if loader is None:
+        loader = _local.round_trip = YAML()
+        loader.preserve_quotes = round_trip_yaml.preserve_quotes
+        loader.allow_duplicate_keys = round_trip_yaml.allow_duplicate_keys
+
+    return loader.load(source)
+
+def sniff_format(source):
+    """Guess whether a document is JSON or YAML from its first characters.
+
+    Every JSON document is also a YAML document, but the `json` module loads them
+    much faster than any YAML loader, so documents that start like a JSON object
+    or array are reported as JSON.
+
+    Parameters:
+        source: The document as a string or bytes.
+
+    Returns:
+        str: "json" or "yaml".
+    """
+    head = source[:512]
+    if isinstance(head, bytes):
+        head = head.decode("utf-8", errors="ignore")
+
+    head = head.lstrip(_BOM + " \t\r\n")
+    return "json" if head[:1] in {"{", "["} else "yaml"
+
+def resolve_loader(loader, source_format):
+    """Pick the loader used for a document.
+
+    Parameters:
+        loader: One of `LOADERS`, or None to use "json" for JSON documents and
+            "round_trip" for YAML documents.
+        source_format: The format of the document, "json" or "yaml".
+
+    Returns:
+        str: The name of the loader.
+    """
+    if loader is None:
+        return "json" if source_format == "json" else "round_trip"
+    elif loader not in LOADERS:
+        raise ValueError("Unknown loader '{}'. Supported loaders: {}".format(loader, ", ".join(LOADERS)))
+    elif loader == "json" and source_format != "json":
+        raise ValueError("The json loader only supports JSON documents")
+
+    return loader
+
+def load(source, loader=None):
+    """Load a JSON or YAML document.
+
+    Parameters:
+        source: The document as a string, bytes, or a text or binary file object.
+        loader: One of `LOADERS`, or None to pick one from the document's format
+            (documents that only look like JSON fall back to "round_trip").
+            "safe_c" follows YAML 1.1 when libyaml is used, so unquoted values
+            such as `yes` and `off` are loaded as booleans.
+
+    Returns:
+        The loaded document.
+    """
+    if hasattr(source, "read"):
+        source = source.read()
+
+    if isinstance(source, bytes):
+        source = source.decode("utf-8-sig")
+    elif source[:1] == _BOM:
+        source = source[1:]
+
+    source_format = sniff_format(source)
+
+    if loader is None and source_format == "json":
+        try:
+            return json.loads(source)
+        except json.JSONDecodeError as json_error:
+            # YAML flow mappings and sequences look like JSON at first glance,
+            # but the JSON error is more useful for documents that are neither
+            try:
+                return _round_trip_load(source)
+            except Exception:
+                raise json_error from None
+
+    loader = resolve_loader(loader, source_format)
+
+    if loader == "json":
+        return json.loads(source)
+    elif loader == "safe_c":
+        if _LibyamlLoader is not None:
+            return _libyaml_load(source, Loader=_LibyamlLoader)
+
+        # ruamel.yaml uses its own C extension for the safe loader when installed
+        return YAML(typ="safe").load(source)
+
+    return _round_trip_load(source)
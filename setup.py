@@ -36,7 +36,7 @@ setup(
 
     long_description = __readme__ + '\n\n' + __changelog__,
 
-    packages     = find_packages(),
+    packages     = find_packages(exclude=("benchmarks", "benchmarks.*", "tests", "tests.*")),
     #add required packages to install_requires list
     install_requires=[
         "jsonschema==2.6.0",
@@ -50,7 +50,7 @@ setup(
         "pytest"
     ],
     entry_points = {
-        "console_scripts": ["oaspec = oaspec:main"]
+        "console_scripts": ["oaspec = oaspec.cli:main"]
     },
     # entry_points = {
     #     "console_scripts": ['%s = %s.%s:main' % (__title__,projectName,projectName)]
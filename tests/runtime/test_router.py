@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+
+from oaspec.schema import registry
+from oaspec.runtime import Router
+
+def operation(operation_id, **properties):
+    return dict(operationId=operation_id, responses={"200": {"description": "OK"}}, **properties)
+
+def build_spec(paths, servers=None):
+    spec = {
+        "openapi": "3.0.1",
+        "info": {"title": "Routes", "version": "1.0.0"},
+        "paths": paths,
+    }
+    if servers is not None:
+        spec["servers"] = servers
+
+    return registry.get("3.0.1")(spec)
+
+def operation_id(match):
+    return match.operation._raw()["operationId"]
+
+@pytest.fixture(scope="module")
+def router():
+    return Router(build_spec({
+        "/users/{userId}": {"get": operation("getUser"), "delete": operation("deleteUser")},
+        "/users/me": {"get": operation("getMe")},
+        "/users/{userId}/keys/{keyId}": {"get": operation("getKey")},
+        "/users/me/settings": {"get": operation("getSettings")},
+        "/files/{name}.json": {"get": operation("getJSON")},
+        "/files/{name}": {"get": operation("getFile")},
+        "/files/{name}.{extension}": {"get": operation("getTyped")},
+        "/": {"get": operation("getRoot")},
+    }))
+
+class TestRouter(object):
+
+    def test_static_path(self, router):
+        assert operation_id(router.match("GET", "/users/me")) == "getMe"
+        assert operation_id(router.match("GET", "/")) == "getRoot"
+
+    def test_path_parameters(self, router):
+        match = router.match("GET", "/users/42/keys/a%2Fb")
+
+        assert operation_id(match) == "getKey"
+        assert match.path_parameters == {"userId": "42", "keyId": "a/b"}
+        assert match.route.path == "/users/{userId}/keys/{keyId}"
+
+    def test_static_precedence(self, router):
+        assert router.match("GET", "/users/me").path_parameters == {}
+        # A static segment that does not lead to a route falls back to the template
+        match = router.match("GET", "/users/me/keys/1")
+        assert operation_id(match) == "getKey"
+        assert match.path_parameters == {"userId": "me", "keyId": "1"}
+        # Paths are matched before methods
+        assert router.match("DELETE", "/users/me") is None
+        assert router.allowed_methods("/users/me") == ["get"]
+
+    def test_partial_templates(self, router):
+        assert router.match("GET", "/files/report.json").path_parameters == {"name": "report"}
+        assert operation_id(router.match("GET", "/files/report.csv")) == "getTyped"
+        assert operation_id(router.match("GET", "/files/report")) == "getFile"
+
+    def test_no_match(self, router):
+        assert router.match("GET", "/users") is None
+        assert router.match("GET", "/users/") is None
+        assert router.match("POST", "/users/1") is None
+        assert router.allowed_methods("/users/1") == ["delete", "get"]
+        assert router.allowed_methods("/groups") == []
+
+    def test_same_template(self):
+        router = Router(build_spec({
+            "/items/{id}": {"get": operation("first")},
+            "/items/{itemId}": {"get": operation("second"), "put": operation("third")},
+        }))
+
+        assert operation_id(router.match("GET", "/items/1")) == "first"
+        assert router.match("PUT", "/items/1").path_parameters == {"itemId": "1"}
+        assert len(router.routes) == 2
+
+class TestServers(object):
+
+    def test_base_path(self):
+        root = build_spec(
+            {"/pets": {"get": operation("listPets")}},
+            servers=[{"url": "https://api.example.com/v1/"}, {"url": "/beta"}],
+        )
+        router = Router(root)
+
+        assert operation_id(router.match("GET", "/v1/pets")) == "listPets"
+        assert operation_id(router.match("GET", "/beta/pets")) == "listPets"
+        assert router.match("GET", "/pets") is None
+        assert operation_id(Router(root, servers=False).match("GET", "/pets")) == "listPets"
+
+    def test_variables(self):
+        router = Router(build_spec({"/pets": {"get": operation("listPets")}}, servers=[{
+            "url": "{scheme}://api.example.com/{version}/{tenant}",
+            "variables": {
+                "scheme": {"default": "https", "enum": ["http", "https"]},
+                "version": {"default": "v1", "enum": ["v1", "v2"]},
+                "tenant": {"default": "public"},
+            },
+        }]))
+
+        match = router.match("GET", "/v2/acme/pets")
+        assert match.server_variables == {"tenant": "acme"}
+        assert match.route.server == "/v2/{tenant}"
+        assert router.match("GET", "/v3/acme/pets") is None
+
+    def test_operation_servers(self):
+        router = Router(build_spec({
+            "/pets": {
+                "servers": [{"url": "/items"}],
+                "get": operation("listPets"),
+                "post": operation("createPet", servers=[{"url": "/uploads"}]),
+            },
+        }, servers=[{"url": "/v1"}]))
+
+        assert operation_id(router.match("GET", "/items/pets")) == "listPets"
+        assert operation_id(router.match("POST", "/uploads/pets")) == "createPet"
+        assert router.match("POST", "/items/pets") is None
+        assert router.match("GET", "/v1/pets") is None
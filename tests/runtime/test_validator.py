@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+from pathlib import Path
+
+import json
+import jsonschema
+
+from oaspec.schema import registry
+from oaspec.schema.exceptions import OASpecParserError
+from oaspec.runtime import TrafficValidator, TrafficError, SchemaCompiler
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+JSON = {"Content-Type": "application/json"}
+
+@pytest.fixture(scope="module")
+def petstore():
+    return TrafficValidator(registry.get("3.0.1")(load_spec()))
+
+@pytest.fixture(scope="module")
+def api():
+    spec = load_spec()
+    spec["components"]["schemas"]["Node"] = {
+        "type": "object",
+        "required": ["name"],
+        "properties": {
+            "name": {"type": "string"},
+            "parent": {"type": "string", "nullable": True},
+            "children": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}},
+        },
+    }
+    spec["components"]["parameters"] = {
+        "flags": {"name": "flags", "in": "query", "schema": {"type": "array", "items": {"type": "boolean"}}},
+    }
+    spec["paths"]["/trees/{treeId}"] = {
+        "parameters": [
+            {"name": "treeId", "in": "path", "required": True, "schema": {"type": "integer"}},
+            {"name": "X-Version", "in": "header", "required": True, "schema": {"type": "integer"}},
+        ],
+        "put": {
+            "parameters": [
+                {"name": "X-Version", "in": "header", "required": False, "schema": {"type": "integer"}},
+                {"$ref": "#/components/parameters/flags"},
+                {"name": "session", "in": "cookie", "required": True, "schema": {"type": "string"}},
+            ],
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {"schema": {"$ref": "#/components/schemas/Node"}},
+                    "text/*": {"schema": {"type": "string", "maxLength": 5}},
+                },
+            },
+            "responses": {
+                "2XX": {
+                    "description": "Updated",
+                    "headers": {"ETag": {"required": True, "schema": {"type": "string"}}},
+                },
+            },
+        },
+    }
+
+    return TrafficValidator(registry.get("3.0.1")(spec))
+
+class TestTrafficValidator(object):
+
+    def test_valid_request(self, petstore):
+        assert petstore.validate_request("GET", "/pets", query={"limit": "10"}) == []
+        assert petstore.validate_request("get", "/pets/12") == []
+
+    def test_invalid_parameter(self, petstore):
+        errors = petstore.validate_request("GET", "/pets", query={"limit": "ten"})
+
+        assert errors == [TrafficError(("query", "limit"), "'ten' is not of type 'integer'")]
+
+    def test_unknown_path_and_method(self, petstore):
+        assert petstore.validate_request("GET", "/owners")[0].location == ("path",)
+        assert petstore.validate_request("DELETE", "/pets/12")[0].location == ("method",)
+
+    def test_find_operation(self, petstore):
+        operation, path_parameters = petstore.find_operation("GET", "/pets/a%20b")
+
+        assert operation.operation_id == "showPetById"
+        assert path_parameters == {"petId": "a b"}
+
+    def test_response_status(self, petstore):
+        assert petstore.validate_response("GET", "/pets", 200, JSON, '[{"id": 1, "name": "Rex"}]') == []
+        # Undocumented statuses use the default response
+        errors = petstore.validate_response("GET", "/pets", 500, JSON, {"code": 500})
+        assert errors == [TrafficError(("body",), "'message' is a required property")]
+
+    def test_response_body(self, petstore):
+        errors = petstore.validate_response("GET", "/pets/1", 200, JSON, [{"id": "1", "name": "Rex"}])
+
+        assert errors == [TrafficError(("body", 0, "id"), "'1' is not of type 'integer'")]
+        assert petstore.validate_response("GET", "/pets/1", 200, JSON, "[")[0].message.startswith("Invalid JSON")
+
+    def test_parameters_merge(self, api):
+        operation, _ = api.find_operation("PUT", "/trees/1")
+
+        parameters = {(parameter.name, parameter.location): parameter for parameter in operation.parameters}
+        assert set(parameters) == {("treeId", "path"), ("x-version", "header"), ("flags", "query"), ("session", "cookie")}
+        # The operation overrides the parameter of the path item
+        assert parameters["x-version", "header"].required is False
+
+    def test_coercion(self, api):
+        headers = dict(JSON, Cookie="session=abc")
+        body = {"name": "root"}
+
+        assert api.validate_request("PUT", "/trees/1", headers, {"flags": "true,false"}, body) == []
+        errors = api.validate_request("PUT", "/trees/one", headers, {"flags": ["yes"]}, body)
+        assert [error.location for error in errors] == [("path", "treeId"), ("query", "flags", 0)]
+
+    def test_required(self, api):
+        errors = api.validate_request("PUT", "/trees/1", JSON)
+
+        assert errors == [
+            TrafficError(("cookie", "session"), "Missing required parameter"),
+            TrafficError(("body",), "Missing required request body"),
+        ]
+
+    def test_recursive_body(self, api):
+        headers = dict(JSON, Cookie="session=abc")
+        body = {"name": "root", "parent": None, "children": [{"name": "leaf", "children": [{}]}]}
+
+        errors = api.validate_request("PUT", "/trees/1", headers, None, json.dumps(body).encode())
+        assert errors == [TrafficError(("body", "children", 0, "children", 0), "'name' is a required property")]
+
+    def test_media_types(self, api):
+        headers = {"Content-Type": "text/plain; charset=utf-8", "Cookie": "session=abc"}
+
+        assert api.validate_request("PUT", "/trees/1", headers, None, "short") == []
+        assert len(api.validate_request("PUT", "/trees/1", headers, None, "too long")) == 1
+        headers["Content-Type"] = "application/xml"
+        assert api.validate_request("PUT", "/trees/1", headers, None, "<a/>")[0].location == ("header", "content-type")
+
+    def test_response_headers(self, api):
+        assert api.validate_response("PUT", "/trees/1", 204, {"ETag": "1"}) == []
+        assert api.validate_response("PUT", "/trees/1", 201, {}) == [
+            TrafficError(("header", "etag"), "Missing required header"),
+        ]
+        assert api.validate_response("PUT", "/trees/1", 404, {})[0].location == ("status",)
+
+class TestSchemaCompiler(object):
+
+    def test_inlines_references(self):
+        compiler = SchemaCompiler(registry.get("3.0.1")(load_spec()))
+
+        pets = compiler.compile({"$ref": "#/components/schemas/Pets"})
+        assert pets["items"]["required"] == ["id", "name"]
+        # Shared components are converted once
+        assert compiler.compile({"$ref": "#/components/schemas/Pet"}) is pets["items"]
+
+    def test_nullable(self):
+        compiler = SchemaCompiler(registry.get("3.0.1")(load_spec()))
+
+        schema = compiler.compile({"type": "string", "enum": ["a"], "nullable": True})
+        assert schema == {"type": ["string", "null"], "enum": ["a", None]}
+
+    def test_nullable_without_type(self):
+        compiler = SchemaCompiler(registry.get("3.0.1")(load_spec()))
+
+        schema = compiler.compile({"allOf": [{"$ref": "#/components/schemas/Pet"}], "nullable": True})
+        assert schema["anyOf"][1] == {"type": "null"}
+
+        validator = jsonschema.Draft4Validator(schema)
+        assert validator.is_valid(None)
+        assert validator.is_valid({"id": 1, "name": "Rex"})
+        assert not validator.is_valid({"id": 1})
+
+    def test_references_outside_schemas(self):
+        spec = load_spec()
+        spec["components"]["parameters"] = {
+            "limit": {"name": "limit", "in": "query", "schema": {"type": "integer", "maximum": 100}},
+        }
+        spec["components"]["responses"] = {
+            "Tree": {
+                "description": "A tree",
+                "content": {"application/json": {"schema": {
+                    "type": "array",
+                    "items": {"$ref": "#/components/responses/Tree/content/application~1json/schema"},
+                }}},
+            },
+        }
+        compiler = SchemaCompiler(registry.get("3.0.1")(spec))
+
+        limit = compiler.compile({"$ref": "#/components/parameters/limit/schema"})
+        assert limit == {"type": "integer", "maximum": 100}
+
+        # Recursive references are resolved against the converted schemas
+        tree = compiler.compile({"$ref": "#/components/responses/Tree/content/application~1json/schema"})
+        validator = jsonschema.Draft4Validator(tree, resolver=compiler.resolver)
+        assert validator.is_valid([[], [[]]])
+        assert not validator.is_valid([[1]])
+
+    def test_unresolvable_reference(self):
+        compiler = SchemaCompiler(registry.get("3.0.1")(load_spec()))
+
+        with pytest.raises(OASpecParserError):
+            compiler.compile({"$ref": "#/components/parameters/missing/schema"})
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import os
+import sys
+import stat
+import subprocess
+from pathlib import Path
+
+import json
+
+from oaspec.schema import SchemaRegistry
+from oaspec.schema.cache import SchemaCache
+from oaspec.schema.funcs import get_schema_classes
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_json(file_path):
+    with Path(file_path).open('r', encoding='utf-8') as f:
+        return json.load(f)
+
+class TestSchemaCache(object):
+
+    def test_restored_tree_matches_built_tree(self, tmp_path):
+        built = SchemaRegistry(cache=SchemaCache(tmp_path))
+        restored = SchemaRegistry(cache=SchemaCache(tmp_path))
+
+        built_class = built.get("3.0.1")
+        restored_class = restored.get("3.0.1")
+
+        assert built.stats("3.0.1")["builds"] == 1
+        assert restored.stats("3.0.1")["builds"] == 0
+        assert restored.stats("3.0.1")["cache_loads"] == 1
+        assert restored_class is not built_class
+
+        built_classes = get_schema_classes(built_class)
+        restored_classes = get_schema_classes(restored_class)
+        assert [cls.__name__ for cls in built_classes] == [cls.__name__ for cls in restored_classes]
+        assert [cls._parsing_schema for cls in built_classes] == [cls._parsing_schema for cls in restored_classes]
+
+        raw_spec = load_json(get_test_data("petstore-3.0.0.json"))
+        assert built_class(raw_spec)._raw() == restored_class(raw_spec)._raw() == raw_spec
+
+    def test_stale_entries_are_replaced(self, tmp_path):
+        cache = SchemaCache(tmp_path)
+        SchemaRegistry(cache=cache).get("3.0.1")
+
+        stale_file = tmp_path / "oas-3.0.1-0000000000000000.pickle"
+        stale_file.write_bytes(b"stale")
+        for cache_file in tmp_path.glob("oas-3.0.1-*.pickle"):
+            if cache_file != stale_file:
+                cache_file.unlink()
+
+        registry = SchemaRegistry(cache=cache)
+        registry.get("3.0.1")
+
+        assert registry.stats("3.0.1")["builds"] == 1
+        assert not stale_file.exists()
+        assert len(list(tmp_path.glob("oas-3.0.1-*.pickle"))) == 1
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = SchemaCache(tmp_path)
+        SchemaRegistry(cache=cache).get("3.0.1")
+
+        for cache_file in tmp_path.glob("oas-3.0.1-*.pickle"):
+            cache_file.write_bytes(b"\x80\x04truncated")
+
+        registry = SchemaRegistry(cache=cache)
+        registry.get("3.0.1")
+
+        assert registry.stats("3.0.1")["builds"] == 1
+        assert SchemaRegistry(cache=cache).get("3.0.1") is not None
+
+    def test_directory_is_private(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        SchemaRegistry(cache=SchemaCache(cache_dir)).get("3.0.1")
+
+        assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+
+    def test_untrusted_entry_is_a_miss(self, tmp_path):
+        cache = SchemaCache(tmp_path)
+        SchemaRegistry(cache=cache).get("3.0.1")
+
+        for cache_file in tmp_path.glob("oas-3.0.1-*.pickle"):
+            cache_file.chmod(0o666)
+
+        registry = SchemaRegistry(cache=cache)
+        registry.get("3.0.1")
+
+        assert registry.stats("3.0.1")["builds"] == 1
+
+    def test_untrusted_directory_is_not_used(self, tmp_path):
+        cache = SchemaCache(tmp_path)
+        tmp_path.chmod(0o777)
+        SchemaRegistry(cache=cache).get("3.0.1")
+
+        assert not list(tmp_path.glob("oas-3.0.1-*.pickle"))
+
+    def test_cache_is_opt_in(self, monkeypatch):
+        monkeypatch.delenv("OASPEC_CACHE_DIR", raising=False)
+        assert SchemaRegistry().cache is None
+        assert isinstance(SchemaRegistry(cache=True).cache, SchemaCache)
+
+        monkeypatch.setenv("OASPEC_CACHE_DIR", "/nonexistent")
+        assert SchemaRegistry().cache.cache_dir == Path("/nonexistent")
+
+        monkeypatch.setenv("OASPEC_NO_CACHE", "1")
+        assert SchemaRegistry().cache is None
+
+    def test_key_depends_on_content(self, tmp_path):
+        cache = SchemaCache(tmp_path)
+
+        assert cache.key(b"{}") == cache.key(b"{}")
+        assert cache.key(b"{}") != cache.key(b"{ }")
+
+    def test_class_names_are_stable_across_processes(self):
+        script = (
+            "from oaspec.schema import SchemaRegistry;"
+            "from oaspec.schema.funcs import get_schema_classes;"
+            "print([c.__name__ for c in get_schema_classes(SchemaRegistry(cache=False).get('3.0.1'))])"
+        )
+
+        outputs = set()
+        for seed in ("1", "2"):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            outputs.add(subprocess.check_output([sys.executable, "-c", script], env=env))
+
+        assert len(outputs) == 1
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+from copy import deepcopy
+from pathlib import Path
+
+import json
+
+from oaspec.schema import registry, reparse, diff
+from oaspec.schema.changes import subtree_hash
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+@pytest.fixture
+def schema_class():
+    return registry.get("3.0.1")
+
+def edited(spec):
+    spec = deepcopy(spec)
+    del spec["paths"]["/pets"]["post"]
+    spec["paths"]["/pets"]["get"]["parameters"][0]["required"] = True
+    spec["paths"]["/pets/{petId}"]["get"]["parameters"].append(
+        {"name": "fields", "in": "query", "schema": {"type": "string"}}
+    )
+    spec["paths"]["/owners"] = deepcopy(spec["paths"]["/pets/{petId}"])
+    pet = spec["components"]["schemas"]["Pet"]
+    pet["required"].append("tag")
+    pet["properties"]["id"]["type"] = "string"
+    del pet["properties"]["name"]
+    spec["info"]["title"] = "Renamed"
+    return spec
+
+def by_name(result):
+    return {(change.kind, change.action, change.name): change for change in result}
+
+class TestDiff(object):
+
+    def test_identical(self, schema_class):
+        spec = load_spec()
+        result = diff(schema_class(spec), schema_class(deepcopy(spec)))
+
+        assert not result
+        assert len(result) == 0
+        assert result.as_dict() == {"changes": [], "breaking": 0}
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_changes(self, schema_class, lazy):
+        spec = load_spec()
+        result = diff(schema_class(spec, lazy=lazy), schema_class(edited(spec), lazy=lazy))
+        changes = by_name(result)
+
+        assert set(changes) == {
+            ("operation", "removed", "POST /pets"),
+            ("parameter", "changed", "query limit"),
+            ("parameter", "added", "query fields"),
+            ("path", "added", "/owners"),
+            ("schema", "changed", "Pet"),
+            ("document", "changed", ""),
+        }
+        assert result.summary()["operation removed"] == 1
+
+        assert changes["operation", "removed", "POST /pets"].breaking
+        assert changes["parameter", "changed", "query limit"].reasons == ["became required"]
+        assert not changes["parameter", "added", "query fields"].breaking
+        assert not changes["path", "added", "/owners"].breaking
+
+        pet = changes["schema", "changed", "Pet"]
+        assert sorted(pet.reasons) == [
+            "new required properties: tag",
+            "property `name` removed",
+            "type changed from 'integer' to 'string'",
+        ]
+
+        info = changes["document", "changed", ""]
+        assert not info.breaking
+        assert info.changes == [
+            {"path": ["info", "title"], "action": "changed", "old": "Swagger Petstore", "new": "Renamed"},
+        ]
+        assert {change.name for change in result.breaking} == {"POST /pets", "query limit", "Pet"}
+
+    def test_new_required_parameter(self, schema_class):
+        spec = load_spec()
+        new_spec = deepcopy(spec)
+        new_spec["paths"]["/pets"]["get"]["parameters"].append(
+            {"name": "X-Tenant", "in": "header", "required": True, "schema": {"type": "string"}}
+        )
+        result = diff(schema_class(spec), schema_class(new_spec))
+
+        [change] = result.changes
+        assert change.as_dict()["path"] == ["paths", "/pets", "get", "parameters", 1]
+        assert change.reasons == ["new required parameter"]
+
+    def test_reordered_parameters(self, schema_class):
+        spec = load_spec()
+        parameters = spec["paths"]["/pets"]["get"]["parameters"]
+        parameters.append({"name": "offset", "in": "query", "schema": {"type": "integer"}})
+        new_spec = deepcopy(spec)
+        new_spec["paths"]["/pets"]["get"]["parameters"].reverse()
+
+        assert not diff(schema_class(spec), schema_class(new_spec))
+
+    def test_enum_narrowed(self, schema_class):
+        spec = load_spec()
+        spec["components"]["schemas"]["Pet"]["properties"]["tag"]["enum"] = ["cat", "dog"]
+        new_spec = deepcopy(spec)
+        new_spec["components"]["schemas"]["Pet"]["properties"]["tag"]["enum"] = ["dog", "bird"]
+
+        [change] = diff(schema_class(spec), schema_class(new_spec))
+        assert change.reasons == ["enum values removed: cat"]
+
+    def test_reparse(self, schema_class):
+        spec = load_spec()
+        previous = schema_class(spec)
+        parsed = reparse(previous, edited(spec))
+
+        expected = diff(schema_class(spec), schema_class(edited(spec)))
+        assert diff(previous, parsed).as_dict() == expected.as_dict()
+
+class TestSubtreeHash(object):
+
+    def test_content_hash(self, schema_class):
+        spec = load_spec()
+        root = schema_class(spec)
+        other = schema_class(deepcopy(spec))
+
+        assert subtree_hash(root) == subtree_hash(other)
+        assert subtree_hash(root.paths) != subtree_hash(root.components)
+        assert subtree_hash(root.components.schemas["Pet"]) == subtree_hash(other.components.schemas["Pet"])
+
+    def test_lazy_trees(self, schema_class):
+        spec = load_spec()
+        lazy = schema_class(spec, lazy=True)
+
+        assert subtree_hash(lazy) == subtree_hash(schema_class(deepcopy(spec)))
+
+    def test_invalidated_by_amend(self, schema_class):
+        root = schema_class(load_spec())
+        before = subtree_hash(root)
+        info = subtree_hash(root.info)
+
+        root.info._amend({"title": {"__override": "Renamed"}})
+
+        assert subtree_hash(root.info) != info
+        assert subtree_hash(root) != before
+        [change] = diff(schema_class(load_spec()), root)
+        assert change.changes[0]["new"] == "Renamed"
+
+    def test_invalidated_by_update(self, schema_class):
+        root = schema_class(load_spec())
+        before = subtree_hash(root)
+        spec = load_spec()
+        spec["info"]["description"] = "More pets"
+
+        root._update(schema_class(spec))
+
+        assert subtree_hash(root) != before
+        [change] = diff(schema_class(load_spec()), root)
+        assert change.changes == [{"path": ["info", "description"], "action": "added", "old": None, "new": "More pets"}]
+
+    def test_invalidated_below_grafted_subtree(self, schema_class):
+        spec = load_spec()
+        extra = deepcopy(spec)
+        extra["paths"] = {"/extra": deepcopy(spec["paths"]["/pets/{petId}"])}
+        expected = deepcopy(spec)
+        expected["paths"]["/extra"] = deepcopy(extra["paths"]["/extra"])
+
+        root = schema_class(spec)
+        root._merge([schema_class(extra)])
+        assert not diff(root, schema_class(expected))
+
+        root.paths["/extra"]._amend({"get": {"summary": {"__override": "Extra"}}})
+
+        [change] = diff(root, schema_class(expected))
+        assert change.name == "GET /extra"
+        assert change.changes[0]["path"] == ["paths", "/extra", "get", "summary"]
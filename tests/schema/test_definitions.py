@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import pytest
+import pickle
+
+import jsonschema
+
+from oaspec.schema import SchemaRegistry
+from oaspec.schema.definitions import DefinitionStore
+from oaspec.schema.funcs import get_schema_classes
+
+@pytest.fixture(scope="module")
+def schema_class():
+    return SchemaRegistry(cache=False).get("3.0.1")
+
+class TestDefinitionStore(object):
+
+    def test_closures(self):
+        store = DefinitionStore({
+            "a": {"properties": {"b": {"$ref": "#/definitions/b"}}},
+            "b": {"items": {"$ref": "#/definitions/c"}},
+            "c": {"additionalProperties": {"$ref": "#/definitions/b"}},
+            "d": {"type": "string"},
+        })
+
+        assert store.graph["#/definitions/a"] == {"#/definitions/b"}
+        assert store.closures["#/definitions/a"] == {"#/definitions/b", "#/definitions/c"}
+        assert store.closures["#/definitions/c"] == {"#/definitions/b", "#/definitions/c"}
+        assert store.closures["#/definitions/d"] == set()
+
+        definitions = store.definitions_for({"$ref": "#/definitions/a"})
+        assert list(definitions) == ["a", "b", "c"]
+        assert all(definitions[name] is store.definitions[name] for name in definitions)
+
+    def test_classes_share_definitions(self, schema_class):
+        store = schema_class._definition_store
+        classes = get_schema_classes(schema_class)
+
+        assert all(cls._definition_store is store for cls in classes)
+        for cls in classes:
+            if cls is schema_class:
+                continue
+            for name, definition in cls._parsing_schema.get("definitions", dict()).items():
+                assert definition is store.definitions[name]
+
+    def test_validators_resolve_refs(self, schema_class):
+        operation_class = schema_class._definitions["#/definitions/operationObject"]
+        assert "responsesObject" in operation_class._parsing_schema["definitions"]
+
+        assert operation_class.validate({"responses": {"200": {"description": "OK"}}})
+        with pytest.raises(jsonschema.ValidationError):
+            # Responses are checked through refs to other definitions
+            operation_class.validate({"responses": {"default": {"content": {}}}}, True)
+
+    def test_pickle(self, schema_class):
+        store = pickle.loads(pickle.dumps(schema_class._definition_store))
+
+        assert store.closures == schema_class._definition_store.closures
+        assert store.resolver() is store.resolver()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import pytest
+from copy import deepcopy
+from pathlib import Path
+
+import json
+import jsonschema
+
+from oaspec.schema import registry, reparse
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+def describe(node):
+    """List the class, path and keys of every node of a parsed tree."""
+    nodes = [(type(node).__name__, node._path, list(getattr(node, "_object_properties", [])))]
+
+    if hasattr(node, "_object_properties"):
+        for child in node._object_properties.values():
+            nodes.extend(describe(child))
+    elif node._is_array():
+        for child in node._value:
+            nodes.extend(describe(child))
+
+    return nodes
+
+@pytest.fixture
+def schema_class():
+    return registry.get("3.0.1")
+
+class TestReparse(object):
+
+    def test_one_operation_changed(self, schema_class):
+        spec = load_spec()
+        previous = schema_class(spec)
+        unchanged_path = previous.paths["/pets/{petId}"]
+        unchanged_operation = previous.paths["/pets"].post
+
+        edited = deepcopy(spec)
+        edited["paths"]["/pets"]["get"]["summary"] = "List some pets"
+        stats = dict()
+        parsed = reparse(previous, edited, stats=stats)
+
+        assert parsed._raw() == edited
+        assert describe(parsed) == describe(schema_class(edited))
+        assert parsed.paths["/pets/{petId}"] is unchanged_path
+        assert parsed.paths["/pets"].post is unchanged_operation
+        assert unchanged_operation._parent is parsed.paths["/pets"]
+        assert unchanged_operation._path == ["paths", "/pets", "post"]
+        # The root, paths, the path item, the operation and the summary
+        assert stats["rebuilt"] == 4 and stats["built"] == 1
+
+    def test_unchanged_document(self, schema_class):
+        spec = load_spec()
+        previous = schema_class(spec)
+
+        assert reparse(previous, deepcopy(spec)) is previous
+
+    @pytest.mark.parametrize("zero_copy,lazy", [(False, False), (True, False), (False, True)])
+    def test_modes(self, schema_class, zero_copy, lazy):
+        spec = load_spec()
+        previous = schema_class(spec, zero_copy=zero_copy, lazy=lazy)
+
+        edited = deepcopy(spec)
+        edited["components"]["schemas"]["Pet"]["properties"]["tag"] = {"$ref": "#/components/schemas/Error"}
+        edited["paths"]["/pets/{petId}"]["x-internal"] = True
+        parsed = reparse(previous, edited)
+
+        assert parsed._raw() == edited
+        assert describe(parsed) == describe(schema_class(edited))
+        assert parsed._lazy is lazy
+
+    def test_moved_array_items_are_reused(self, schema_class):
+        spec = load_spec()
+        spec["paths"]["/pets"]["get"]["parameters"].append({"name": "page", "in": "query"})
+        previous = schema_class(spec)
+        first, second = previous.paths["/pets"].get.parameters._value
+
+        edited = deepcopy(spec)
+        edited["paths"]["/pets"]["get"]["parameters"].reverse()
+        parsed = reparse(previous, edited)
+
+        assert parsed.paths["/pets"].get.parameters._value == [second, first]
+        assert parsed.paths["/pets"].get.parameters._value[0] is second
+        assert second._path == ["paths", "/pets", "get", "parameters", "array"]
+
+    def test_values_of_another_type_are_not_reused(self, schema_class):
+        spec = load_spec()
+        spec["paths"]["/pets"]["get"]["tags"] = ["1", "pets"]
+        previous = schema_class(spec)
+
+        edited = deepcopy(spec)
+        edited["paths"]["/pets"]["get"]["tags"] = [1, "pets"]
+        edited["paths"]["/pets"]["get"]["parameters"][0]["schema"]["maximum"] = 100
+        spec_maximum = deepcopy(edited)
+        spec_maximum["paths"]["/pets"]["get"]["parameters"][0]["schema"]["maximum"] = 100.0
+        parsed = reparse(reparse(previous, edited, validation="none"), spec_maximum, validation="none")
+
+        assert parsed.paths["/pets"].get.tags._raw() == [1, "pets"]
+        assert type(parsed.paths["/pets"].get.tags._value[0]._raw()) is int
+        maximum = parsed.paths["/pets"].get.parameters._value[0].schema._raw()["maximum"]
+        assert type(maximum) is float
+
+    def test_invalid_changes(self, schema_class):
+        spec = load_spec()
+
+        edited = deepcopy(spec)
+        edited["paths"]["/pets"]["get"]["responses"] = []
+        with pytest.raises(jsonschema.ValidationError) as excinfo:
+            reparse(schema_class(spec), edited)
+        assert list(excinfo.value.path)[:4] == ["paths", "/pets", "get", "responses"]
+
+        # 1 == True, but 1 is not a valid value for a boolean
+        spec["paths"]["/pets"]["get"]["deprecated"] = True
+        edited = deepcopy(spec)
+        edited["paths"]["/pets"]["get"]["deprecated"] = 1
+        with pytest.raises(jsonschema.ValidationError):
+            schema_class(edited)
+        with pytest.raises(jsonschema.ValidationError):
+            reparse(schema_class(spec), edited)
+
+        # Changed children of lazy trees are validated, although they are not built
+        previous = schema_class(spec, lazy=True)
+        previous.paths["/pets"].get
+        with pytest.raises(jsonschema.ValidationError) as excinfo:
+            reparse(previous, edited)
+        assert list(excinfo.value.path) == ["paths", "/pets", "get", "deprecated"]
+
+        edited = deepcopy(spec)
+        del edited["info"]["title"]
+        with pytest.raises(jsonschema.ValidationError) as excinfo:
+            reparse(schema_class(spec), edited)
+        assert list(excinfo.value.path) == ["info"]
+        assert "'title' is a required property" in str(excinfo.value)
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_wrong_types(self, schema_class, lazy):
+        spec = load_spec()
+        previous = schema_class(spec, lazy=lazy)
+
+        edited = deepcopy(spec)
+        edited["info"]["version"] = 1
+        with pytest.raises(jsonschema.ValidationError) as excinfo:
+            reparse(previous, edited)
+        assert list(excinfo.value.path) == ["info", "version"]
+        assert "1 is not of type 'string'" in str(excinfo.value)
+
+        edited = deepcopy(spec)
+        edited["paths"]["/pets"]["get"]["responses"]["default"]["content"] = []
+        with pytest.raises(jsonschema.ValidationError) as excinfo:
+            reparse(schema_class(spec, lazy=lazy), edited)
+        assert list(excinfo.value.path)[:5] == ["paths", "/pets", "get", "responses", "default"]
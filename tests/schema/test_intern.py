@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import pytest
+from pathlib import Path
+
+import json
+
+from oaspec.schema import registry, InternTable
+from oaspec.schema.intern import active_table
+from oaspec.spec import OASpecParser
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+def describe(node):
+    """List the class and keys of every node of a parsed tree, in order."""
+    nodes = [(type(node).__name__, list(getattr(node, "_object_properties", [])))]
+
+    if hasattr(node, "_object_properties"):
+        for child in node._object_properties.values():
+            nodes.extend(describe(child))
+    elif node._is_array():
+        for child in node._value:
+            nodes.extend(describe(child))
+
+    return nodes
+
+def parse_interned(spec, **kwargs):
+    table = InternTable()
+    with table:
+        root = registry.get("3.0.1")(spec, **kwargs)
+
+    return root, table
+
+class TestInterning(object):
+
+    @pytest.mark.parametrize("validation", ["node", "once"])
+    @pytest.mark.parametrize("zero_copy", [False, True])
+    def test_same_tree(self, validation, zero_copy):
+        spec = load_spec()
+        root, _ = parse_interned(spec, validation=validation, zero_copy=zero_copy)
+        plain = registry.get("3.0.1")(spec)
+
+        assert root._raw() == plain._raw()
+        assert describe(root) == describe(plain)
+
+    def test_identical_subtrees_shared(self):
+        root, table = parse_interned(load_spec())
+        get_default = root.paths["/pets"].get.responses["default"]
+        post_default = root.paths["/pets"].post.responses["default"]
+
+        assert get_default is post_default
+        assert get_default._path == ["paths", "/pets", "get", "responses", "default"]
+        assert (root.paths["/pets"].post.responses, "default") in [
+            (parent, key) for parent, key in get_default._shared_by
+        ]
+
+        stats = table.stats()
+        assert stats["shared"] > 0
+        assert stats["total_nodes"] == stats["built"] + stats["saved_nodes"]
+        assert stats["dedup_ratio"] > 1
+
+    def test_table_active_during_parse_only(self):
+        spec = load_spec()
+        root, table = parse_interned(spec)
+        built = table.built
+
+        registry.get("3.0.1")(spec)
+        assert table.built == built
+        assert table.stats()["built"] == built
+
+    def test_nested_tables(self):
+        spec = load_spec()
+
+        with InternTable() as outer:
+            with InternTable() as inner:
+                registry.get("3.0.1")(spec)
+                assert active_table() is inner
+            assert active_table() is outer
+
+            root = registry.get("3.0.1")(spec)
+        assert active_table() is None
+
+        assert outer.built == inner.built
+        assert root.paths["/pets"].get.responses["default"] is root.paths["/pets"].post.responses["default"]
+
+    def test_amend_other_occurrence(self):
+        root, _ = parse_interned(load_spec())
+        get_responses = root.paths["/pets"].get.responses
+        post_responses = root.paths["/pets"].post.responses
+        shared = get_responses["default"]
+
+        post_responses._amend({"default": {"description": {"__override": "Changed"}}})
+
+        assert post_responses["default"] is not shared
+        assert post_responses["default"].description == "Changed"
+        assert post_responses["default"]._path == ["paths", "/pets", "post", "responses", "default"]
+        assert get_responses["default"] is shared
+        assert shared.description == "unexpected error"
+        assert all(parent is not post_responses for parent, _ in getattr(shared, "_shared_by", []))
+
+    def test_amend_first_occurrence(self):
+        root, _ = parse_interned(load_spec())
+        shared = root.paths["/pets"].get.responses["default"]
+
+        shared._amend({"description": {"__override": "Changed"}})
+
+        assert root.paths["/pets"].get.responses["default"].description == "Changed"
+        for path in ("/pets", "/pets/{petId}"):
+            other = root.paths[path].post.responses["default"] if path == "/pets" \
+                else root.paths[path].get.responses["default"]
+            assert other is not shared
+            assert other.description == "unexpected error"
+            assert other._parent.default is other
+
+    def test_setitem(self):
+        root, _ = parse_interned(load_spec())
+        get_responses = root.paths["/pets"].get.responses
+        post_responses = root.paths["/pets"].post.responses
+        shared = get_responses["default"]
+        replacement, _ = parse_interned(load_spec())
+        replacement.paths["/pets"].get.responses._amend({"default": {"description": {"__override": "Replaced"}}})
+
+        post_responses["default"] = replacement.paths["/pets"].get.responses["default"]
+
+        assert post_responses["default"].description == "Replaced"
+        assert get_responses["default"] is shared
+        assert shared.description == "unexpected error"
+        assert all(parent is not post_responses for parent, _ in getattr(shared, "_shared_by", []))
+
+    def test_setitem_first_occurrence(self):
+        root, _ = parse_interned(load_spec())
+        get_responses = root.paths["/pets"].get.responses
+        shared = get_responses["default"]
+        others = [parent for parent, _ in shared._shared_by]
+        replacement, _ = parse_interned(load_spec())
+
+        get_responses["default"] = replacement.paths["/pets"].get.responses["200"]
+
+        # The next occurrence becomes the first one
+        assert shared._parent is others[0]
+        assert shared._path == ["paths", "/pets", "post", "responses", "default"]
+        assert shared.description == "unexpected error"
+
+    def test_update(self):
+        spec = load_spec()
+        root, _ = parse_interned(spec)
+        other, _ = parse_interned(load_spec())
+        other.paths["/pets"].post.responses._amend({"default": {"description": {"__override": "Updated"}}})
+
+        post_responses = root.paths["/pets"].post.responses
+        post_responses._update(other.paths["/pets"].post.responses)
+
+        assert post_responses["default"].description == "Updated"
+        assert root.paths["/pets"].get.responses["default"].description == "unexpected error"
+        assert root.paths["/pets/{petId}"].get.responses["default"].description == "unexpected error"
+
+    def test_shared_array_items(self):
+        spec = load_spec()
+        spec["paths"]["/pets"]["get"]["tags"] = ["pets", "store", "pets"]
+        root, _ = parse_interned(spec, validation="none")
+        get_tags = root.paths["/pets"].get.tags
+        post_tags = root.paths["/pets"].post.tags
+
+        assert get_tags[0] is get_tags[2]
+        assert get_tags[0] is post_tags[0]
+
+        post_tags._amend({"__original": ["pets"], "__override": ["__del pets", "animals"]})
+
+        assert [tag._value for tag in post_tags._value] == ["animals"]
+        assert [tag._value for tag in get_tags._value] == ["pets", "store", "pets"]
+        assert all(parent is not post_tags for parent, _ in get_tags[0]._shared_by)
+        assert root.paths["/pets/{petId}"].get.tags[0] is get_tags[0]
+
+        # Both items of the first occurrence are the same node, one of them is copied
+        get_tags[0]._amend({"__override": "animals"})
+        assert sorted(tag._value for tag in get_tags._value) == ["animals", "pets", "store"]
+        assert get_tags[0] is not get_tags[2]
+
+    def test_parse_spec(self):
+        parser = OASpecParser(load_spec())
+        table = InternTable()
+        root = parser.parse_spec(validation="once", intern=table)
+
+        assert root._raw() == parser.parse_spec()._raw()
+        assert table.stats()["shared"] > 0
+
+        with pytest.raises(ValueError):
+            parser.parse_spec(lazy=True, intern=True)
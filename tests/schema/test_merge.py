@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+
+from oaspec.schema import registry, merge_fragments
+
+def fragment(title, paths, **info):
+    spec = {
+        "openapi": "3.0.1",
+        "info": dict(title=title, version="1.0.0", **info),
+        "paths": {
+            path: {"get": {"summary": summary, "responses": {"200": {"description": "OK"}}}}
+            for path, summary in paths.items()
+        },
+    }
+
+    return registry.get("3.0.1")(spec, validation="none")
+
+@pytest.fixture
+def fragments():
+    return [
+        fragment("Base", {"/users": "List users"}),
+        fragment("Users", {"/users": "All users", "/users/{id}": "Get a user"}, description="Users"),
+        fragment("Orders", {"/orders": "List orders"}, description="Orders"),
+    ]
+
+class TestMergeFragments(object):
+
+    @pytest.mark.parametrize("no_override, overwrites_config", [
+        (False, None),
+        (True, None),
+        (True, {"paths": "__overwrite_subkeys"}),
+        (True, {"paths": {"/users": "__overwrite_subkeys"}, "info": "__overwrite_subkeys"}),
+    ])
+    def test_same_result_as_update(self, fragments, no_override, overwrites_config):
+        base, *others = fragments
+        expected_base, *expected_others = [fragment._raw() for fragment in fragments]
+        expected = registry.get("3.0.1")(expected_base, validation="none")
+        for other in expected_others:
+            expected._update(registry.get("3.0.1")(other, validation="none"), no_override, overwrites_config)
+
+        base._merge(others, no_override, overwrites_config)
+
+        assert base._raw() == expected._raw()
+
+    def test_provenance(self, fragments):
+        base, *others = fragments
+        report = merge_fragments(base, others)
+
+        assert report.provenance[("paths", "/users/{id}")] == 0
+        assert report.provenance[("paths", "/orders")] == 1
+        assert report.source(["paths", "/orders", "get", "summary"]) == 1
+        assert report.source(["paths", "/users", "get", "summary"]) == 0
+        assert report.source(["openapi"]) == 1
+        assert report.source(["components"]) is None
+
+    def test_conflicts(self, fragments):
+        base, *others = fragments
+        report = merge_fragments(base, others)
+
+        conflicts = {tuple(conflict["path"]): conflict for conflict in report.conflicts}
+        assert set(conflicts) == {("info", "title"), ("info", "description")}
+        assert conflicts["info", "description"] == {"path": ["info", "description"], "fragments": [0, 1], "kept": 1}
+        assert base.info.description == "Orders"
+
+        report = merge_fragments(fragments[0], [fragment("Other", {}, description="Other")], no_override=True)
+        assert report.conflicts == []
+        assert fragments[0].info.description == "Orders"
+
+    def test_overwrites_config_is_per_key(self, fragments):
+        base, *others = fragments
+        # "__overwrite_subkeys" for info does not apply to the keys that follow it
+        config = {"info": "__overwrite_subkeys"}
+
+        base._update(others[0], no_override=True, overwrites_config=config)
+
+        assert base.info.description == "Users"
+        assert "/users/{id}" not in base.paths
+
+    def test_added_subtrees_belong_to_base(self, fragments):
+        base, *others = fragments
+        base._ref_index
+        base._subtree_hash()
+
+        merge_fragments(base, others)
+
+        added = base.paths["/orders"]
+        assert added is not others[1].paths["/orders"]
+        assert added._parent is base.paths
+        assert added.get.responses["200"]._path == ["paths", "/orders", "get", "responses", "200"]
+        assert "_ref_index" not in base.__dict__
+        assert "_subtree_hash" not in base.__dict__
+
+        # Changes below the added subtree drop the caches of base, and only of base
+        base._ref_index
+        base._subtree_hash()
+        others[1]._subtree_hash()
+        added._amend({"get": {"summary": {"__override": "Orders"}}})
+        assert "_ref_index" not in base.__dict__
+        assert "_subtree_hash" not in base.__dict__
+        assert "_subtree_hash" in others[1].__dict__
+
+        # The fragments are left as they were
+        assert others[1].paths["/orders"].get.summary == "List orders"
+        others[1].paths["/orders"]._amend({"get": {"summary": {"__override": "Changed"}}})
+        assert base.paths["/orders"].get.summary == "Orders"
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+from pathlib import Path
+
+import json
+
+from oaspec.schema import registry, apply_overlays, validate_overlay, OverlayError
+from oaspec.schema.lazy import Deferred
+from oaspec.schema.overlay import value_key
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+@pytest.fixture
+def root():
+    spec = load_spec()
+    spec["paths"]["/pets"]["get"]["tags"] = ["pets", "store", "public"]
+    return registry.get("3.0.1")(spec)
+
+class TestAmendArrays(object):
+
+    def test_override_and_delete(self, root):
+        tags = root.paths["/pets"].get.tags
+        tags._amend({"__original": ["pets", "store"], "__override": ["animals", "__del store"]})
+
+        # New values first, then the listed items that were not deleted
+        assert tags._raw() == ["animals", "pets"]
+
+    def test_delete_all(self, root):
+        tags = root.paths["/pets"].get.tags
+        tags._amend({"__original": ["pets", "store", "public"], "__override": ["__del *", "animals", "public"]})
+
+        assert tags._raw() == ["animals", "public"]
+
+    def test_object_items(self):
+        spec = load_spec()
+        spec["security"] = [{"api_key": []}, {"oauth": ["read"]}]
+        root = registry.get("3.0.1")(spec)
+
+        root.security._amend({"__original": [{"oauth": ["read"]}], "__override": []})
+        assert root.security._raw() == [{"oauth": ["read"]}]
+
+    def test_contains(self, root):
+        assert "store" in root.paths["/pets"].get.tags
+        assert "animals" not in root.paths["/pets"].get.tags
+
+    def test_value_key(self):
+        assert value_key({"a": [1, {"b": 2}]}) == value_key({"a": [1, {"b": 2}]})
+        assert value_key({"a": [1]}) != value_key({"a": (2,)})
+        assert hash(value_key([{"a": 1}]))
+
+class TestApplyOverlays(object):
+
+    def test_same_result_as_amend(self, root):
+        overlays = [
+            {"info": {"title": {"__override": "First"}, "description": "Added"}},
+            {"info": {"title": {"__override": "Second"}, "description": {"__override": "Amended"}}},
+            {"paths": {"/pets": {"get": {"tags": {"__original": ["pets"], "__override": ["animals"]}}}}},
+        ]
+        other = registry.get("3.0.1")(root._raw())
+        for overlay in overlays:
+            other._amend(overlay)
+
+        apply_overlays(root, overlays)
+
+        assert root._raw() == other._raw()
+        assert root.info.title == "Second"
+        assert root.info.description == "Amended"
+
+    def test_report(self, root):
+        report = root._apply_overlays([
+            {"info": {"title": {"__override": "Renamed"}, "termsOfService": "https://example.com/terms"}},
+            {"paths": {"/pets": {"get": {"tags": {"__original": ["pets"], "__override": ["__del pets", "animals"]}}}}},
+        ])
+
+        assert list(report) == [
+            {"path": ["info", "title"], "action": "replace", "old": "Swagger Petstore", "new": "Renamed"},
+            {"path": ["info", "termsOfService"], "action": "add", "value": "https://example.com/terms"},
+            {
+                "path": ["paths", "/pets", "get", "tags"],
+                "action": "array",
+                "added": ["animals"],
+                "removed": ["pets", "store", "public"],
+            },
+        ]
+        assert report.summary() == {"replace": 1, "add": 1, "array": 1}
+
+    def test_validation(self, root):
+        errors = validate_overlay(root, {
+            "info": {"title": "Not a directive", "x-logo": {"url": "logo.png"}},
+            "paths": {"/pets": {"get": {"tags": ["animals"]}}},
+        })
+
+        assert errors == [
+            (["info", "title"], "Expected a mapping with an `__override` value"),
+            (["paths", "/pets", "get", "tags"], "Expected a mapping with an `__override` list"),
+        ]
+
+    def test_invalid_overlays_are_not_applied(self, root):
+        overlays = [
+            {"info": {"title": {"__override": "Renamed"}}},
+            {"paths": {"/pets": {"get": {"tags": {"__original": [], "__override": ["__delete pets"]}}}}},
+        ]
+
+        with pytest.raises(OverlayError) as excinfo:
+            apply_overlays(root, overlays)
+
+        assert excinfo.value.errors == [(1, ["paths", "/pets", "get", "tags"], "Unknown directive `__delete pets`")]
+        assert root.info.title == "Swagger Petstore"
+
+    def test_lazy_tree(self):
+        root = registry.get("3.0.1")(load_spec(), lazy=True)
+
+        assert validate_overlay(root, {"info": {"title": {"__override": "Lazy"}}}) == []
+        # Validation does not build deferred children
+        assert type(dict.get(root._object_properties, "info")) is Deferred
+
+        apply_overlays(root, [{"info": {"title": {"__override": "Lazy"}}}])
+        assert root.info.title == "Lazy"
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+from pathlib import Path
+
+import json
+
+from oaspec.schema import registry, ParseStats
+from oaspec.schema.profile import active_stats
+from oaspec.schema.refs import walk
+from oaspec.spec import OASpecParser
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+class TestParseStats(object):
+
+    def test_counts_nodes(self):
+        with ParseStats() as stats:
+            root = registry.get("3.0.1")(load_spec())
+
+        assert sum(stats.nodes.values()) == sum(1 for _ in walk(root))
+        assert stats.nodes["openapiObject"] == 1
+        assert stats.nodes["operationObject"] == 3
+
+    @pytest.mark.parametrize("validation, validations", [("node", 153), ("once", 1), ("none", 0)])
+    def test_counts_validations(self, validation, validations):
+        with ParseStats() as stats:
+            registry.get("3.0.1")(load_spec(), validation=validation)
+
+        assert stats.validations >= validations
+        assert (stats.validation_time > 0) == (stats.validations > 0)
+
+    def test_counts_failed_trials(self, monkeypatch):
+        # Without the dispatch index, every subschema is tried in order
+        monkeypatch.setattr(
+            "oaspec.schema.schema.match_subschema_index",
+            lambda index, value: list(range(len(index["constraints"]))),
+        )
+
+        with ParseStats() as stats:
+            registry.get("3.0.1")(load_spec())
+
+        assert sum(stats.failed_trials.values()) > 0
+
+    def test_inactive_by_default(self):
+        stats = ParseStats()
+        registry.get("3.0.1")(load_spec())
+
+        with stats:
+            assert active_stats() is stats
+            with ParseStats() as nested:
+                assert active_stats() is nested
+            assert active_stats() is stats
+
+        assert active_stats() is None
+        assert not stats.nodes
+
+    def test_merge(self):
+        first, second = ParseStats(), ParseStats()
+        with first.phase("parse"):
+            registry.get("3.0.1")(load_spec())
+        with second.phase("parse"):
+            registry.get("3.0.1")(load_spec())
+
+        first.merge(second.as_dict())
+
+        assert first.nodes == ParseStats().nodes + second.nodes + second.nodes
+        assert first.phases["parse"] >= second.phases["parse"]
+        assert json.loads(json.dumps(first.as_dict()))["total_nodes"] == 2 * sum(second.nodes.values())
+
+class TestParserProfile(object):
+
+    def test_phases(self):
+        parser = OASpecParser(json.dumps(load_spec()), profile=True)
+        root = parser.parse_spec()
+
+        assert list(parser.stats.phases) == ["load", "load_validation_schema", "parse"]
+        assert sum(parser.stats.nodes.values()) == sum(1 for _ in walk(root))
+        assert "Nodes built: " in parser.stats.report()
+
+    def test_disabled(self):
+        parser = OASpecParser(load_spec())
+        parser.parse_spec()
+
+        assert parser.stats is None
+
+    def test_shared_stats(self):
+        stats = ParseStats()
+        for _ in range(2):
+            OASpecParser(load_spec(), profile=stats).parse_spec(validation="once")
+
+        assert stats.nodes["openapiObject"] == 2
+        assert stats.validations >= 2
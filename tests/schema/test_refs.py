@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import pytest
+import pickle
+from pathlib import Path
+
+import json
+
+from oaspec.schema import registry, reparse, OASpecParserError
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+def parse(spec, **kwargs):
+    return registry.get("3.0.1")(spec, **kwargs)
+
+class TestResolve(object):
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_component_reference(self, lazy):
+        root = parse(load_spec(), lazy=lazy)
+        ref = root.paths["/pets"].get.responses["200"].content["application/json"].schema
+
+        target = ref._resolve()
+        assert target is root.components.schemas["Pets"]
+        assert target._path == ["components", "schemas", "Pets"]
+        assert ref._resolve() is target
+
+    def test_not_a_reference(self):
+        root = parse(load_spec())
+        assert root.info._resolve() is root.info
+
+    def test_chain_memoized(self):
+        spec = load_spec()
+        spec["components"]["schemas"]["Alias"] = {"$ref": "#/components/schemas/Other"}
+        spec["components"]["schemas"]["Other"] = {"$ref": "#/components/schemas/Pet"}
+        root = parse(spec)
+
+        assert root.components.schemas["Alias"]._resolve() is root.components.schemas["Pet"]
+        assert root._ref_index._resolved["#/components/schemas/Other"] is root.components.schemas["Pet"]
+
+    def test_pointer_outside_components(self):
+        spec = load_spec()
+        spec["components"]["schemas"]["Id"] = {"$ref": "#/components/schemas/Pet/properties/id"}
+        spec["components"]["schemas"]["Listed"] = {"$ref": "#/paths/~1pets/get/responses/200/content/application~1json/schema"}
+        root = parse(spec)
+
+        assert root.components.schemas["Id"]._resolve() is root.components.schemas["Pet"].properties["id"]
+        assert root.components.schemas["Listed"]._resolve() is root.components.schemas["Pets"]
+
+    def test_percent_encoded_pointer(self):
+        spec = load_spec()
+        spec["components"]["schemas"]["Pet Name"] = {"type": "string"}
+        spec["components"]["schemas"]["Alias"] = {"$ref": "#/components/schemas/Pet%20Name"}
+        root = parse(spec)
+
+        assert root.components.schemas["Alias"]._resolve() is root.components.schemas["Pet Name"]
+
+    def test_cycle(self):
+        spec = load_spec()
+        spec["components"]["schemas"]["A"] = {"$ref": "#/components/schemas/B"}
+        spec["components"]["schemas"]["B"] = {"$ref": "#/components/schemas/A"}
+        root = parse(spec)
+
+        with pytest.raises(OASpecParserError, match="Circular reference"):
+            root.components.schemas["A"]._resolve()
+
+    @pytest.mark.parametrize("ref", ["#/components/schemas/Missing", "other.yaml#/components/schemas/Pet"])
+    def test_unresolvable(self, ref):
+        spec = load_spec()
+        spec["components"]["schemas"]["Broken"] = {"$ref": ref}
+        root = parse(spec)
+
+        with pytest.raises(OASpecParserError):
+            root.components.schemas["Broken"]._resolve()
+
+    def test_index_dropped_on_change(self):
+        root = parse(load_spec())
+        ref = root.paths["/pets"].get.responses["200"].content["application/json"].schema
+        assert ref._resolve() is root.components.schemas["Pets"]
+
+        root.components.schemas._amend({"Pets": {"description": {"__override": "Amended"}}})
+        assert "_ref_index" not in root.__dict__
+        assert ref._resolve() is root.components.schemas["Pets"]
+
+    def test_reparse(self):
+        spec = load_spec()
+        previous = parse(spec, validation="once")
+        ref = previous.paths["/pets"].get.responses["200"].content["application/json"].schema
+        ref._resolve()
+
+        edited = load_spec()
+        edited["components"]["schemas"]["Pets"]["description"] = "Edited"
+        root = reparse(previous, edited)
+
+        assert root.paths["/pets"].get.responses["200"].content["application/json"].schema is ref
+        assert ref._resolve() is root.components.schemas["Pets"]
+
+    def test_pickle_without_index(self):
+        root = parse(load_spec())
+        root.components.schemas["Pets"]._resolve()
+
+        restored = pickle.loads(pickle.dumps(root))
+        assert "_ref_index" not in restored.__dict__
+        ref = restored.paths["/pets"].get.responses["200"].content["application/json"].schema
+        assert ref._resolve() is restored.components.schemas["Pets"]
+
+class TestWalk(object):
+
+    def test_without_refs(self):
+        root = parse(load_spec())
+        nodes = dict(root.components._walk())
+
+        assert nodes[()] is root.components
+        assert nodes[("schemas", "Pets", "items")]["$ref"] == "#/components/schemas/Pet"
+
+    def test_follow_refs(self):
+        root = parse(load_spec())
+        nodes = dict(root.components.schemas["Pets"]._walk(follow_refs=True))
+
+        assert nodes[("items",)] is root.components.schemas["Pet"]
+        assert nodes[("items", "required", 0)] == "id"
+
+    def test_recursive_schema(self):
+        spec = load_spec()
+        spec["components"]["schemas"]["Tree"] = {
+            "type": "object",
+            "properties": {
+                "children": {"type": "array", "items": {"$ref": "#/components/schemas/Tree"}},
+            },
+        }
+        root = parse(spec)
+        tree = root.components.schemas["Tree"]
+
+        nodes = list(tree._walk(follow_refs=True))
+        assert (("properties", "children", "items"), tree) in nodes
+        assert not any(len(keys) > 3 for keys, _ in nodes)
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_lazy(self, lazy):
+        root = parse(load_spec(), lazy=lazy)
+        walk = root._walk(follow_refs=True)
+        assert next(walk) == ((), root)
+
+        if lazy:
+            assert not root._object_properties.is_materialized("paths")
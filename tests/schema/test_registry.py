@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+import threading
+from pathlib import Path
+
+import json
+
+from oaspec.schema import SchemaRegistry, OASpecParserError
+from oaspec.spec import OASpecParser
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_json(file_path):
+    with Path(file_path).open('r', encoding='utf-8') as f:
+        return json.load(f)
+
+class TestSchemaRegistry(object):
+
+    def test_builds_each_version_once(self):
+        registry = SchemaRegistry(cache=False)
+
+        first = registry.get("3.0.1")
+        second = registry.get("3.0.1")
+
+        assert first is second
+        assert first.__name__ == "openapiObject"
+
+        stats = registry.stats("3.0.1")
+        assert stats["builds"] == 1
+        assert stats["requests"] == 2
+        assert stats["build_time"] > 0
+
+    def test_concurrent_requests_share_one_build(self):
+        registry = SchemaRegistry(cache=False)
+        results = []
+
+        def worker():
+            results.append(registry.get("3.0.1"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 8
+        assert all(result is results[0] for result in results)
+        assert registry.stats("3.0.1")["builds"] == 1
+
+    def test_invalid_version(self):
+        registry = SchemaRegistry(cache=False)
+
+        with pytest.raises(OASpecParserError) as excinfo:
+            registry.get("2.0.0")
+
+        assert "oaspec only supports OpenAPI" in str(excinfo.value)
+        assert registry.stats() == {}
+
+    def test_missing_version(self):
+        registry = SchemaRegistry(cache=False)
+
+        with pytest.raises(OASpecParserError) as excinfo:
+            registry.get("3.9.9")
+
+        assert "Schema file is missing" in str(excinfo.value)
+
+    def test_parsers_share_compiled_schema(self):
+        raw_spec = load_json(get_test_data("petstore-3.0.0.json"))
+        raw_spec["openapi"] = "3.0.1"
+
+        first = OASpecParser()
+        first._raw_spec = raw_spec
+        second = OASpecParser()
+        second._raw_spec = raw_spec
+
+        assert first._schema is second._schema
+        assert first.parse_spec()._raw() == second.parse_spec()._raw() == raw_spec
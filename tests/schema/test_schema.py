@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+from copy import deepcopy
+from pathlib import Path
+
+import json
+import jsonschema
+
+from oaspec.schema import Schema, registry
+from oaspec.schema.funcs import match_subschema_index
+from oaspec.schema.exceptions import OASpecParserWarning
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+@pytest.fixture
+def schema_class():
+    return registry.get("3.0.1")
+
+class TestValidationModes(object):
+
+    @pytest.mark.parametrize("validation", ["node", "once", "none"])
+    def test_modes_build_identical_trees(self, schema_class, validation):
+        spec = load_spec()
+
+        parsed = schema_class(spec, validation=validation)
+
+        assert parsed._raw() == spec
+        assert type(parsed.paths["/pets"].get.responses["200"]).__name__ == \
+            type(schema_class(spec).paths["/pets"].get.responses["200"]).__name__
+
+    def test_once_points_at_failing_node(self, schema_class):
+        spec = load_spec()
+        spec["info"]["title"] = 42
+
+        with pytest.raises(jsonschema.ValidationError) as excinfo:
+            schema_class(spec, validation="once")
+
+        assert list(excinfo.value.path) == ["info", "title"]
+
+    def test_once_includes_node_path(self, schema_class):
+        info_class = schema_class._properties["info"]
+
+        with pytest.raises(jsonschema.ValidationError) as excinfo:
+            info_class({"title": 42, "version": "1"}, ["info"], validation="once")
+
+        assert list(excinfo.value.path) == ["info", "title"]
+
+    def test_gentle_validation_continues(self, schema_class):
+        spec = load_spec()
+        spec["info"]["title"] = 42
+
+        parsed = schema_class(spec, gentle_validation=True, validation="once")
+
+        assert parsed.info.title == 42
+
+    def test_unknown_mode(self, schema_class):
+        with pytest.raises(ValueError):
+            schema_class(load_spec(), validation="sometimes")
+
+    def test_validator_is_reused(self, schema_class):
+        assert schema_class._get_validator() is schema_class._get_validator()
+        assert schema_class._get_validator() is not schema_class._properties["info"]._get_validator()
+
+def node_classes(node, classes=None, path=()):
+    classes = [] if classes is None else classes
+    classes.append((path, type(node).__name__))
+
+    if node._is_array():
+        for idx, item in enumerate(node._value):
+            node_classes(item, classes, path + (idx,))
+    elif hasattr(node, "_object_properties"):
+        for key, value in node._object_properties.items():
+            node_classes(value, classes, path + (key,))
+
+    return classes
+
+def trial_dispatch(self, trusted):
+    for subschema_cls in self._boolean_subschema_classes:
+        if subschema_cls.validate(self._raw_spec):
+            return subschema_cls
+
+    raise RuntimeError("Could not find matching subschema")
+
+class TestSubschemaDispatch(object):
+
+    def dispatch_spec(self):
+        spec = load_spec()
+        spec["components"]["securitySchemes"] = {
+            "api_key": {"type": "apiKey", "name": "api_key", "in": "header"},
+            "shared": {"$ref": "#/components/securitySchemes/api_key"},
+        }
+        spec["components"]["schemas"]["Pet"]["properties"]["id"]["example"] = 42
+        spec["components"]["schemas"]["Pet"]["properties"]["tag"]["example"] = None
+        spec["components"]["schemas"]["Pet"]["properties"]["name"]["minLength"] = 1
+        spec["components"]["schemas"]["Pet"]["x-extension"] = [1.5, "two", {"three": True}]
+        spec["components"]["responses"] = {"Error": {"$ref": "#/components/schemas/Error"}}
+        return spec
+
+    @pytest.mark.parametrize("validation", ["node", "once"])
+    def test_index_matches_trial_validation(self, schema_class, validation, monkeypatch):
+        spec = self.dispatch_spec()
+
+        indexed = node_classes(schema_class(spec, validation=validation))
+        monkeypatch.setattr(Schema, "_select_subschema", trial_dispatch)
+        trial = node_classes(schema_class(spec, validation=validation))
+
+        assert indexed == trial
+
+    def test_index_resolves_common_cases_without_validation(self, schema_class):
+        any_class = schema_class._definitions["#/definitions/any"]
+        reference_union = schema_class._definitions["#/definitions/componentsObject"] \
+            ._properties["parameters"]._additional_properties
+
+        assert len(any_class._boolean_subschema_classes) == 6
+        for value in (None, 1, 1.5, True, "text", {}, []):
+            matches = match_subschema_index(any_class._subschema_index, value)
+            assert len(matches) == 1
+
+        assert [
+            reference_union._boolean_subschema_classes[position].__name__
+            for position in match_subschema_index(reference_union._subschema_index, {"$ref": "#/a"})
+        ] == ["referenceObject"]
+        assert [
+            reference_union._boolean_subschema_classes[position].__name__
+            for position in match_subschema_index(reference_union._subschema_index, {"name": "a", "in": "query"})
+        ] == ["parameterObject"]
+
+    def test_no_matching_subschema(self, schema_class):
+        any_class = schema_class._definitions["#/definitions/any"]
+
+        assert match_subschema_index(any_class._subschema_index, object()) == []
+
+class TestLazyParsing(object):
+
+    def test_children_are_built_on_access(self, schema_class):
+        parsed = schema_class(load_spec(), lazy=True)
+        properties = parsed._object_properties
+
+        assert set(parsed._keys()) == set(load_spec().keys())
+        assert not any(properties.is_materialized(key) for key in parsed._keys())
+
+        assert parsed.info.title == "Swagger Petstore"
+        assert properties.is_materialized("info")
+        assert not properties.is_materialized("paths")
+
+        pets = parsed["paths"]["/pets"]
+        assert properties.is_materialized("paths")
+        assert not parsed.paths._object_properties.is_materialized("/pets/{petId}")
+        assert pets.get.operationId == "listPets"
+
+    def test_iteration_does_not_build_children(self, schema_class):
+        parsed = schema_class(load_spec(), lazy=True)
+
+        assert list(parsed) == list(load_spec())
+        assert "paths" in parsed
+        assert not parsed._object_properties.is_materialized("paths")
+
+    @pytest.mark.parametrize("validation", ["node", "once"])
+    def test_partially_built_tree_dumps_correctly(self, schema_class, validation):
+        spec = load_spec()
+        parsed = schema_class(spec, validation=validation, lazy=True)
+        parsed.info.title
+
+        assert parsed._raw() == spec
+        assert parsed._dump_json() == schema_class(spec)._dump_json()
+        assert node_classes(parsed) == node_classes(schema_class(spec))
+
+    def test_node_validation_errors_are_raised_on_access(self, schema_class):
+        spec = load_spec()
+        spec["paths"]["/pets"]["get"]["operationId"] = 42
+
+        parsed = schema_class(spec, gentle_validation=True, lazy=True)
+        assert parsed.info.title == "Swagger Petstore"
+
+        with pytest.raises(jsonschema.ValidationError):
+            parsed.paths
+
+class TestZeroCopyParsing(object):
+
+    def test_nodes_reference_the_loaded_document(self, schema_class):
+        spec = load_spec()
+
+        parsed = schema_class(spec, zero_copy=True)
+
+        assert parsed._raw_spec is spec
+        assert parsed.info._raw_spec is spec["info"]
+        assert parsed.paths["/pets"].get._raw_spec is spec["paths"]["/pets"]["get"]
+        assert parsed._raw() == spec
+        assert node_classes(parsed) == node_classes(schema_class(spec))
+
+    def test_copying_mode_does_not_share(self, schema_class):
+        spec = load_spec()
+
+        parsed = schema_class(spec)
+
+        assert parsed._raw_spec is not spec
+        assert parsed.info._raw_spec is not spec["info"]
+
+    def test_mutation_copies_on_write(self, schema_class):
+        spec = load_spec()
+        original = load_spec()
+        parsed = schema_class(spec, zero_copy=True)
+
+        contact = {"name": "API Support"}
+        parsed.info["contact"] = contact
+        contact["name"] = "changed"
+        parsed.info._amend({"title": {"__override": "Amended Petstore"}})
+
+        assert spec == original
+        assert parsed.info._raw_spec is not spec["info"]
+        assert parsed.info._raw_spec == spec["info"]
+        assert parsed.info.contact.name == "API Support"
+        assert parsed.info.title == "Amended Petstore"
+
+        # Untouched siblings still share the document
+        assert parsed.paths._raw_spec is spec["paths"]
+
+class TestNodePaths(object):
+
+    def test_paths_follow_parent_links(self, schema_class):
+        parsed = schema_class(load_spec())
+        parameter = parsed.paths["/pets"].get.parameters[0]
+
+        assert parsed._path == []
+        assert parsed.paths._path == ["paths"]
+        assert parameter._path == ["paths", "/pets", "get", "parameters", "array"]
+        assert parameter._parent._parent is parsed.paths["/pets"].get
+        assert "_path" not in vars(parameter)
+
+    def test_explicit_path_is_a_prefix(self, schema_class):
+        info_class = schema_class._properties["info"]
+
+        info = info_class({"title": "API", "version": "1", "license": {"name": "MIT"}}, ["root", "info"])
+
+        assert info._path == ["root", "info"]
+        assert info.license._path == ["root", "info", "license"]
+        assert info._generate_path("title") == ["root", "info", "title"]
+
+    def test_nodes_created_by_mutation_are_linked(self, schema_class):
+        parsed = schema_class(load_spec())
+
+        parsed.info["contact"] = {"name": "API Support"}
+        parsed.info._amend({"termsOfService": "https://example.com/terms"})
+
+        assert parsed.info.contact._path == ["info", "contact"]
+        assert parsed.info.termsOfService._path == ["info", "termsOfService"]
+
+    def test_overlap_warning_reports_path(self, schema_class):
+        spec = load_spec()
+        spec["paths"]["/pets"]["get"]["validate"] = True
+
+        with pytest.warns(OASpecParserWarning) as record:
+            schema_class(spec)
+
+        assert '-> "/pets"' in str(record[0].message)
+
+class TestUpdate(object):
+
+    def other_spec(self):
+        spec = load_spec()
+        spec["info"]["description"] = "Other"
+        spec["paths"]["/owners"] = deepcopy(spec["paths"]["/pets/{petId}"])
+        spec["paths"]["/pets"]["put"] = deepcopy(spec["paths"]["/pets"]["post"])
+        return spec
+
+    def test_overwrite_subkeys_applies_to_its_key_only(self, schema_class):
+        root = schema_class(load_spec())
+
+        root._update(schema_class(self.other_spec()), no_override=True, overwrites_config={
+            "info": "__overwrite_subkeys",
+        })
+
+        assert root.info.description == "Other"
+        assert "/owners" not in root.paths
+
+    def test_nested_config_applies_to_its_key_only(self, schema_class):
+        root = schema_class(load_spec())
+
+        root._update(schema_class(self.other_spec()), no_override=True, overwrites_config={
+            "info": {"/pets": "__overwrite_subkeys"},
+            "paths": "__overwrite_subkeys",
+        })
+
+        assert "description" not in root.info
+        assert "/owners" in root.paths
+        # The configuration of info is not used for the keys of paths
+        assert "put" not in root.paths["/pets"]
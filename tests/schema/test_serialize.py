@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+from io import StringIO, BytesIO
+from pathlib import Path
+
+import json
+
+from oaspec.schema import registry
+from oaspec.schema.serialize import iter_json
+from oaspec.utils import yaml
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+def parse(spec, **kwargs):
+    return registry.get("3.0.1")(spec, **kwargs)
+
+def edge_case_spec():
+    spec = load_spec()
+    spec["info"]["title"] = "yes"
+    spec["info"]["version"] = "1.0"
+    spec["info"]["description"] = "Multiple\nlines, ünïcödé — and \"quotes\"\n"
+    spec["paths"]["/pets"]["get"]["x-values"] = {
+        "none": None,
+        "empty list": [],
+        "empty dict": {},
+        "list": [1, 2.5, True, None, {"key": "null"}],
+        "empty string": "",
+        "spaces": "  leading",
+    }
+    return spec
+
+def dump_raw_yaml(node):
+    buffer = StringIO()
+    yaml.dump(node._raw(), buffer)
+    return buffer.getvalue()
+
+class TestJSON(object):
+
+    @pytest.mark.parametrize("spec", [load_spec(), edge_case_spec()])
+    def test_matches_json_dumps(self, spec):
+        node = parse(spec)
+
+        assert node._dump_json() == json.dumps(node._raw(), ensure_ascii=False, indent=2)
+
+    def test_compact_mode(self):
+        node = parse(edge_case_spec())
+
+        assert node._dump_json(mode="compact") == \
+            json.dumps(node._raw(), ensure_ascii=False, separators=(",", ":"))
+
+    def test_canonical_mode(self):
+        spec = edge_case_spec()
+        reordered = json.loads(json.dumps(spec, sort_keys=True))
+
+        dumped = parse(spec)._dump_json(mode="canonical")
+
+        assert dumped == json.dumps(spec, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        assert dumped == parse(reordered)._dump_json(mode="canonical")
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            parse(load_spec())._dump_json(mode="tabs")
+
+    def test_yields_chunks(self):
+        node = parse(load_spec())
+
+        chunks = list(iter_json(node))
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == node._dump_json()
+
+    def test_writes_to_text_stream(self):
+        node = parse(edge_case_spec())
+        stream = StringIO()
+
+        node._dump_json(stream)
+
+        assert stream.getvalue() == node._dump_json()
+
+    def test_writes_to_binary_stream(self):
+        node = parse(edge_case_spec())
+        stream = BytesIO()
+
+        node._dump_json(stream)
+
+        assert stream.getvalue().decode("utf-8") == node._dump_json()
+
+    def test_writes_to_path(self, tmp_path):
+        node = parse(edge_case_spec())
+
+        node._dump_json(tmp_path / "spec.json")
+        node._dump_json(str(tmp_path / "compact.json"), mode="compact")
+
+        assert (tmp_path / "spec.json").read_text(encoding="utf-8") == node._dump_json()
+        assert json.loads((tmp_path / "compact.json").read_text(encoding="utf-8")) == node._raw()
+
+class TestYAML(object):
+
+    @pytest.mark.parametrize("spec", [load_spec(), edge_case_spec()])
+    def test_matches_yaml_dump(self, spec):
+        node = parse(spec)
+
+        assert node._dump_yaml() == dump_raw_yaml(node)
+
+    def test_round_trips(self):
+        spec = edge_case_spec()
+
+        assert yaml.load(parse(spec)._dump_yaml()) == spec
+
+    def test_writes_to_streams(self):
+        node = parse(edge_case_spec())
+        text, binary = StringIO(), BytesIO()
+
+        node._dump_yaml(text)
+        node._dump_yaml(binary)
+
+        assert text.getvalue() == dump_raw_yaml(node)
+        assert binary.getvalue().decode("utf-8") == dump_raw_yaml(node)
+
+    def test_writes_to_path(self, tmp_path):
+        node = parse(edge_case_spec())
+
+        node._dump_yaml(tmp_path / "spec.yaml")
+
+        assert (tmp_path / "spec.yaml").read_text(encoding="utf-8") == dump_raw_yaml(node)
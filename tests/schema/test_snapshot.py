@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+from io import BytesIO
+from pathlib import Path
+
+import json
+import pickle
+
+from oaspec.schema import registry, load_snapshot, InternTable
+from oaspec.schema.lazy import Deferred
+from oaspec.schema import snapshot
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+def parse(spec, **kwargs):
+    return registry.get("3.0.1")(spec, **kwargs)
+
+def describe(node):
+    """List the class, path and keys of every node of a parsed tree, in order."""
+    nodes = [(type(node).__name__, node._path, list(getattr(node, "_object_properties", [])))]
+
+    if hasattr(node, "_object_properties"):
+        for child in node._object_properties.values():
+            nodes.extend(describe(child))
+    elif node._is_array():
+        for child in node._value:
+            nodes.extend(describe(child))
+
+    return nodes
+
+class TestSnapshot(object):
+
+    @pytest.mark.parametrize("zero_copy", [False, True])
+    @pytest.mark.parametrize("validation", ["node", "once"])
+    def test_round_trip(self, zero_copy, validation):
+        root = parse(load_spec(), zero_copy=zero_copy, validation=validation)
+
+        loaded = load_snapshot(root._dump_snapshot())
+
+        assert loaded._raw() == root._raw()
+        assert loaded._raw_spec == root._raw_spec
+        assert describe(loaded) == describe(root)
+        assert loaded.paths["/pets"].get.parameters[0]._key == "array"
+        assert loaded._validation == root._validation
+
+    def test_no_parsing_on_load(self, monkeypatch):
+        data = parse(load_spec())._dump_snapshot()
+        monkeypatch.setattr(registry.get("3.0.1"), "__init__", None)
+
+        assert load_snapshot(data).info.title == "Swagger Petstore"
+
+    def test_references(self):
+        loaded = load_snapshot(parse(load_spec())._dump_snapshot())
+        media_type = loaded.paths["/pets"].get.responses["200"].content["application/json"]
+
+        assert media_type.schema._resolve() is loaded.components.schemas["Pets"]
+
+    def test_modified_nodes(self):
+        root = parse(load_spec())
+        root.info._amend({"title": {"__override": "Changed"}})
+
+        loaded = load_snapshot(root._dump_snapshot())
+
+        assert loaded.info.title == "Changed"
+        assert loaded.info._raw_spec == root.info._raw_spec
+        assert loaded._raw_spec == root._raw_spec
+
+    @pytest.mark.parametrize("zero_copy", [False, True])
+    def test_raw_specification_stored_once(self, zero_copy):
+        spec = load_spec()
+        root = parse(spec, zero_copy=zero_copy)
+
+        assert snapshot._SnapshotWriter().dump(root)["raw_specs"] == {}
+
+        # The raw specification of a modified node is no longer its parent's
+        root.info._amend({"title": {"__override": "Changed"}})
+        assert list(snapshot._SnapshotWriter().dump(root)["raw_specs"].values()) == [root.info._raw_spec]
+        assert spec["info"]["title"] == "Swagger Petstore"
+
+    def test_copy_on_write_after_load(self):
+        loaded = load_snapshot(parse(load_spec())._dump_snapshot())
+
+        loaded.info._amend({"title": {"__override": "Changed"}})
+
+        assert loaded.info.title == "Changed"
+        assert loaded._raw_spec["info"]["title"] == "Swagger Petstore"
+
+    def test_lazy_children_stay_deferred(self):
+        root = parse(load_spec(), lazy=True)
+        root.info
+
+        loaded = load_snapshot(root._dump_snapshot())
+        properties = loaded.components.schemas._object_properties
+
+        assert all(type(dict.__getitem__(properties, key)) is Deferred for key in properties)
+        assert type(dict.__getitem__(loaded._object_properties, "info")) is not Deferred
+        assert loaded._raw() == root._raw()
+
+    def test_interned_tree(self):
+        with InternTable():
+            root = parse(load_spec())
+
+        loaded = load_snapshot(root._dump_snapshot())
+
+        assert loaded._raw() == root._raw()
+        assert loaded.paths["/pets"].post.responses["default"]._path == \
+            ["paths", "/pets", "post", "responses", "default"]
+
+    def test_subtree(self):
+        root = parse(load_spec())
+
+        loaded = load_snapshot(root.paths["/pets"]._dump_snapshot())
+
+        assert loaded._raw() == root.paths["/pets"]._raw()
+        assert loaded.get._path == ["paths", "/pets", "get"]
+
+    def test_files(self, tmp_path):
+        root = parse(load_spec())
+        stream = BytesIO()
+
+        root._dump_snapshot(tmp_path / "spec.snapshot")
+        root._dump_snapshot(stream)
+        stream.seek(0)
+
+        assert load_snapshot(tmp_path / "spec.snapshot")._raw() == root._raw()
+        assert load_snapshot(str(tmp_path / "spec.snapshot"))._raw() == root._raw()
+        assert load_snapshot(stream)._raw() == root._raw()
+
+    def test_smaller_than_pickle(self):
+        root = parse(load_spec())
+
+        assert len(root._dump_snapshot()) < len(pickle.dumps(root, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def test_rejects_other_data(self):
+        data = parse(load_spec())._dump_snapshot()
+
+        with pytest.raises(ValueError):
+            load_snapshot(b"not a snapshot")
+        with pytest.raises(ValueError):
+            load_snapshot(snapshot._HEADER.pack(snapshot.MAGIC, snapshot.FORMAT_VERSION + 1) + data[snapshot._HEADER.size:])
+
+    def test_rejects_other_validation_schema(self, monkeypatch):
+        data = parse(load_spec())._dump_snapshot()
+        monkeypatch.setitem(registry._digests, "3.0.1", "0" * 64)
+
+        with pytest.raises(ValueError):
+            load_snapshot(data)
+
+class TestClassPickling(object):
+
+    def test_registry_classes(self):
+        root = parse(load_spec())
+
+        for schema_class in (type(root), type(root.info), type(root.paths["/pets"].get.parameters[0])):
+            assert pickle.loads(pickle.dumps(schema_class)) is schema_class
+
+    def test_class_references(self):
+        root = parse(load_spec())
+        payload = {"classes": [type(root.info)], "node": root.info}
+
+        restored = pickle.loads(pickle.dumps(payload))
+
+        assert restored["classes"][0] is type(restored["node"])
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import os
+import pytest
+
+import json
+
+from oaspec.schema import OASpecParserError
+from oaspec.schema.refs import reference_of
+from oaspec.spec import OASpecParser, FileCache, bundle
+
+def write_files(root, files):
+    for name, document in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(document) if name.endswith(".json") else document)
+
+    return root / next(iter(files))
+
+def refs(value):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "$ref":
+                yield item
+            else:
+                yield from refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from refs(item)
+
+PET_SCHEMA = """\
+Pet:
+  type: object
+  required: [id, name]
+  properties:
+    id:
+      type: integer
+      format: int64
+    name:
+      type: string
+    owner:
+      $ref: "./owner.yaml"
+"""
+
+OWNER_SCHEMA = """\
+type: object
+properties:
+  name:
+    type: string
+"""
+
+PETS_PATH = """\
+get:
+  responses:
+    '200':
+      description: A list of pets
+      content:
+        application/json:
+          schema:
+            type: array
+            items:
+              $ref: "../schemas/pet.yaml#/Pet"
+    default:
+      $ref: "../openapi.yaml#/components/responses/Error"
+post:
+  responses:
+    '201':
+      description: The created pet
+      content:
+        application/json:
+          schema:
+            $ref: "../schemas/pet.yaml#/Pet"
+"""
+
+ROOT_SPEC = """\
+openapi: 3.0.1
+info:
+  title: Split petstore
+  version: 1.0.0
+paths:
+  /pets:
+    $ref: "./paths/pets.yaml"
+  /owners/{ownerId}:
+    get:
+      parameters:
+        - name: ownerId
+          in: path
+          required: true
+          schema:
+            type: string
+      responses:
+        '200':
+          description: An owner
+          content:
+            application/json:
+              schema:
+                $ref: "./schemas/pet.yaml#/Pet/properties/owner"
+components:
+  schemas:
+    Pet:
+      $ref: "./schemas/pet.yaml#/Pet"
+  responses:
+    Error:
+      description: unexpected error
+"""
+
+@pytest.fixture
+def petstore(tmp_path):
+    return write_files(tmp_path, {
+        "openapi.yaml": ROOT_SPEC,
+        "paths/pets.yaml": PETS_PATH,
+        "schemas/pet.yaml": PET_SCHEMA,
+        "schemas/owner.yaml": OWNER_SCHEMA,
+    })
+
+class TestBundle(object):
+
+    def test_inline_first_occurrence(self, petstore):
+        bundled = bundle(petstore, cache=FileCache())
+
+        assert all(ref.startswith("#/") for ref in refs(bundled))
+        assert bundled["components"]["schemas"]["Pet"]["required"] == ["id", "name"]
+        assert bundled["components"]["schemas"]["Pet"]["properties"]["owner"]["type"] == "object"
+
+        pets = bundled["paths"]["/pets"]
+        assert pets["get"]["responses"]["200"]["content"]["application/json"]["schema"]["items"] == {
+            "$ref": "#/components/schemas/Pet"
+        }
+        assert pets["get"]["responses"]["default"] == {"$ref": "#/components/responses/Error"}
+        assert pets["post"]["responses"]["201"]["content"]["application/json"]["schema"] == {
+            "$ref": "#/components/schemas/Pet"
+        }
+
+        owner_schema = bundled["paths"]["/owners/{ownerId}"]["get"]["responses"]["200"]["content"]["application/json"]
+        assert owner_schema["schema"] == {"$ref": "#/components/schemas/Pet/properties/owner"}
+
+    def test_files_unchanged(self, petstore):
+        cache = FileCache()
+        bundle(petstore, cache=cache)
+
+        pets = cache.get(petstore.parent / "paths/pets.yaml")
+        assert pets["post"]["responses"]["201"]["content"]["application/json"]["schema"] == {
+            "$ref": "../schemas/pet.yaml#/Pet"
+        }
+
+    def test_parse(self, petstore):
+        parser = OASpecParser()
+        parser.load_bundle(str(petstore), workers=2, cache=FileCache())
+        root = parser.parse_spec(validation="once")
+
+        references = [node for _, node in root._walk() if reference_of(node) is not None]
+        assert references
+        for node in references:
+            assert reference_of(node._resolve()) is None
+
+        items = root.paths["/pets"].get.responses["200"].content["application/json"].schema["items"]
+        assert items._resolve() is root.components.schemas["Pet"]
+
+    def test_cache(self, petstore):
+        cache = FileCache()
+        first = bundle(petstore, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 4)
+
+        assert bundle(petstore, cache=cache) == first
+        assert (cache.hits, cache.misses) == (4, 4)
+
+        owner = petstore.parent / "schemas/owner.yaml"
+        owner.write_text(OWNER_SCHEMA + "description: An owner\n")
+        os.utime(owner, ns=(owner.stat().st_atime_ns, owner.stat().st_mtime_ns + 10 ** 9))
+
+        bundled = bundle(petstore, cache=cache)
+        assert (cache.hits, cache.misses) == (7, 5)
+        assert bundled["components"]["schemas"]["Pet"]["properties"]["owner"]["description"] == "An owner"
+
+    def test_circular(self, tmp_path):
+        spec_file = write_files(tmp_path, {
+            "openapi.json": {
+                "openapi": "3.0.1",
+                "info": {"title": "Tree", "version": "1.0.0"},
+                "paths": {},
+                "components": {"schemas": {"Node": {"$ref": "node.json"}}},
+            },
+            "node.json": {
+                "type": "object",
+                "properties": {"children": {"type": "array", "items": {"$ref": "#"}}},
+            },
+        })
+
+        bundled = bundle(spec_file, cache=FileCache())
+        node = bundled["components"]["schemas"]["Node"]
+        assert node["properties"]["children"]["items"] == {"$ref": "#/components/schemas/Node"}
+
+    @pytest.mark.parametrize("ref, error", [
+        ("./missing.yaml", FileNotFoundError),
+        ("./owner.yaml#/missing", OASpecParserError),
+        ("https://example.com/pet.yaml", OASpecParserError),
+    ])
+    def test_unresolvable(self, petstore, ref, error):
+        (petstore.parent / "schemas/owner.yaml").write_text(f"$ref: \"{ref}\"\n")
+
+        with pytest.raises(error):
+            bundle(petstore, cache=FileCache())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import pickle
+import pytest
+from pathlib import Path
+
+import json
+import jsonschema
+
+from oaspec.schema import registry
+from oaspec.spec import OASpecParser
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_spec(file_path="petstore-3.0.0.json"):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    spec["openapi"] = "3.0.1"
+    return spec
+
+def describe(node):
+    """List the class, path and keys of every node of a parsed tree."""
+    nodes = [(type(node).__name__, node._path, list(getattr(node, "_object_properties", [])))]
+
+    if hasattr(node, "_object_properties"):
+        for child in node._object_properties.values():
+            nodes.extend(describe(child))
+    elif node._is_array():
+        for child in node._value:
+            nodes.extend(describe(child))
+
+    return nodes
+
+class TestParallelParsing(object):
+
+    @pytest.mark.parametrize("options", [
+        {},
+        {"validation": "once"},
+        {"validation": "none", "zero_copy": True},
+    ])
+    def test_same_tree_as_serial(self, options):
+        spec = load_spec()
+        # Extensions are ordered after the path templates when parsing serially
+        spec["paths"] = {"x-first": {"a": 1}, **spec["paths"]}
+
+        serial = OASpecParser(spec).parse_spec(**options)
+        parallel = OASpecParser(spec).parse_spec(workers=2, **options)
+
+        assert parallel._raw() == serial._raw()
+        assert describe(parallel) == describe(serial)
+        assert parallel.paths["/pets"]._parent is parallel.paths
+        assert parallel.components.schemas["Pet"]._path == ["components", "schemas", "Pet"]
+
+    @pytest.mark.parametrize("zero_copy", [False, True])
+    def test_same_raw_spec_as_serial(self, zero_copy):
+        spec = load_spec()
+
+        serial = OASpecParser(spec).parse_spec(zero_copy=zero_copy)
+        parallel = OASpecParser(spec).parse_spec(workers=2, zero_copy=zero_copy)
+
+        assert parallel._raw_spec == serial._raw_spec
+        assert parallel.components._raw_spec == serial.components._raw_spec
+        assert list(parallel._raw_spec["paths"]) == ["/pets", "/pets/{petId}"]
+
+    def test_validation_errors(self):
+        spec = load_spec()
+        spec["paths"]["/pets"]["get"]["responses"] = []
+
+        with pytest.raises(jsonschema.ValidationError):
+            OASpecParser(spec).parse_spec(workers=2)
+
+class TestPickling(object):
+
+    @pytest.mark.parametrize("options", [{}, {"lazy": True}, {"zero_copy": True}])
+    def test_round_trip(self, options):
+        parsed = registry.get("3.0.1")(load_spec(), **options)
+
+        restored = pickle.loads(pickle.dumps(parsed))
+
+        assert restored._raw() == parsed._raw()
+        assert describe(restored) == describe(parsed)
+        assert list(restored.paths._keys()) == ["/pets", "/pets/{petId}"]
+
+    def test_subtree(self):
+        parsed = registry.get("3.0.1")(load_spec())
+        pet = parsed.components.schemas["Pet"]
+
+        restored = pickle.loads(pickle.dumps(pet))
+
+        assert len(pickle.dumps(parsed.info.title)) < len(pickle.dumps(pet)) < len(pickle.dumps(parsed)) / 4
+        assert restored._parent is None
+        assert restored._path == ["components", "schemas", "Pet"]
+        assert restored.properties._parent is restored
+        assert restored.properties["id"]._path == ["components", "schemas", "Pet", "properties", "id"]
+        assert restored._raw() == pet._raw()
+
+    def test_registry_locates_classes(self):
+        schema_class = registry.get("3.0.1")
+        pet_class = type(schema_class(load_spec()).components.schemas["Pet"])
+
+        location = registry.locate(pet_class)
+
+        assert location[0] == "3.0.1"
+        assert registry.get_class(*location) is pet_class
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import io
+import pytest
+from pathlib import Path
+
+import json
+from ruamel.yaml import YAML
+
+from oaspec.schema import registry, OASpecParserError
+from oaspec.spec import OASpecStreamParser
+from oaspec.spec.stream import iter_json_events, iter_yaml_events, MAP_START, MAP_END, KEY, SCALAR
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_text(file_path):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        return f.read().replace("3.0.0", "3.0.1", 1)
+
+def parse_full(text):
+    spec = YAML(typ="safe").load(text)
+    return registry.get("3.0.1")(spec, validation="once")
+
+class TestStreamParser(object):
+
+    @pytest.mark.parametrize("file_path,format", [
+        ("petstore-3.0.0.json", "json"),
+        ("petstore-3.0.0.yaml", "yaml"),
+    ])
+    def test_builds_same_tree_as_full_parse(self, file_path, format):
+        text = load_text(file_path)
+
+        parsed = OASpecStreamParser(io.StringIO(text), format=format, chunk_size=7).parse_spec()
+        expected = parse_full(text)
+
+        assert parsed._raw() == expected._raw()
+        assert type(parsed.paths["/pets"].get.responses["200"]).__name__ == \
+            type(expected.paths["/pets"].get.responses["200"]).__name__
+
+        pet = parsed.components.schemas["Pet"]
+        assert pet._parent is parsed.components.schemas
+        assert pet._path == ["components", "schemas", "Pet"]
+
+    @pytest.mark.parametrize("zero_copy", [False, True])
+    def test_same_raw_spec_as_full_parse(self, zero_copy):
+        text = load_text("petstore-3.0.0.json")
+
+        parsed = OASpecStreamParser(io.StringIO(text), format="json").parse_spec(zero_copy=zero_copy)
+        expected = parse_full(text)
+
+        assert parsed._raw_spec == expected._raw_spec
+        assert parsed.paths._raw_spec is parsed._raw_spec["paths"]
+
+    def test_callback_receives_each_path(self):
+        seen = []
+
+        def on_path(template, node):
+            seen.append((template, node._path))
+
+        parsed = OASpecStreamParser(io.StringIO(load_text("petstore-3.0.0.yaml"))).parse_spec(on_path=on_path)
+
+        assert seen == [
+            ("/pets", ["paths", "/pets"]),
+            ("/pets/{petId}", ["paths", "/pets/{petId}"]),
+        ]
+        assert list(parsed.paths) == ["/pets", "/pets/{petId}"]
+
+    def test_iter_paths(self):
+        text = load_text("petstore-3.0.0.json")
+
+        paths = list(OASpecStreamParser(io.StringIO(text), format="json").iter_paths())
+
+        assert [template for template, _ in paths] == ["/pets", "/pets/{petId}"]
+        assert paths[1][1]._raw() == json.loads(text)["paths"]["/pets/{petId}"]
+
+    def test_version_after_paths(self):
+        spec = json.loads(load_text("petstore-3.0.0.json"))
+        spec = {"paths": spec.pop("paths"), **spec}
+
+        parsed = OASpecStreamParser(io.StringIO(json.dumps(spec)), format="json").parse_spec()
+
+        assert parsed._raw() == spec
+
+    def test_invalid_entry(self):
+        spec = json.loads(load_text("petstore-3.0.0.json"))
+        spec["paths"]["/pets"]["get"]["responses"] = []
+
+        parser = OASpecStreamParser(io.StringIO(json.dumps(spec)), format="json")
+        with pytest.raises(Exception) as excinfo:
+            parser.parse_spec()
+
+        assert list(excinfo.value.path)[:3] == ["paths", "/pets", "get"]
+
+    def test_missing_version(self):
+        parser = OASpecStreamParser(io.StringIO('{"paths": {"/a": {}}}'), format="json")
+
+        with pytest.raises(OASpecParserError):
+            parser.parse_spec()
+
+class TestEventSources(object):
+
+    def test_json_events(self):
+        events = list(iter_json_events(io.StringIO('{"a": [1, 2.5e1, "x\\"y"], "b": {"c": null}}'), 3))
+
+        assert events[:2] == [(MAP_START, None), (KEY, "a")]
+        assert (SCALAR, 25.0) in events and (SCALAR, 'x"y') in events
+        assert events[-2:] == [(MAP_END, None), (MAP_END, None)]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 9, 15, 27, 64])
+    def test_numbers_split_across_chunks(self, chunk_size):
+        document = json.dumps({
+            "numbers": [1234567, -0.0, 1.5e-12, -2.25E+30, 3.0e5, 0, -17, 123456789.125, 6.02214076e23],
+            "nested": {"maximum": 1.5e-7, "minimum": -1234567890, "multipleOf": 0.0001},
+        })
+
+        def scalars(value):
+            if isinstance(value, dict):
+                return [item for child in value.values() for item in scalars(child)]
+            elif isinstance(value, list):
+                return [item for child in value for item in scalars(child)]
+            return [repr(value)]
+
+        events = list(iter_json_events(io.StringIO(document), chunk_size))
+
+        assert [repr(value) for event, value in events if event == SCALAR] == scalars(json.loads(document))
+
+    @pytest.mark.parametrize("document", ['{"a": 1,}', '{"a" 1}', '[1 2]', '{"a": 1} 2', '{"a": '])
+    def test_invalid_json(self, document):
+        with pytest.raises(ValueError):
+            list(iter_json_events(io.StringIO(document)))
+
+    def test_yaml_aliases(self):
+        document = "a: &x {b: [z, true]}\nc: *x\nd: &y '010'\ne: *y\n"
+
+        events = list(iter_yaml_events(io.StringIO(document)))
+
+        assert events.count((SCALAR, "z")) == 2
+        assert events.count((SCALAR, "010")) == 2
+        assert events[-1] == (MAP_END, None)
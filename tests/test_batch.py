@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import json
+import pytest
+from time import perf_counter
+
+from benchmarks.generator import generate_spec
+from oaspec.batch import find_spec_files, validate_files
+from oaspec.cli import main
+
+@pytest.fixture
+def corpus(tmp_path):
+    """A directory of generated specifications, two of which are invalid."""
+    (tmp_path / "nested").mkdir()
+
+    for idx in range(40):
+        spec = generate_spec(paths=5, schemas=3, seed=idx)
+        directory = tmp_path / "nested" if idx % 2 else tmp_path
+        with (directory / f"spec-{idx:02}.json").open("w", encoding="utf-8") as f:
+            json.dump(spec, f)
+
+    spec = generate_spec(paths=5, schemas=3)
+    spec["paths"]["/p0"] = {"get": {"responses": []}}
+    with (tmp_path / "invalid.json").open("w", encoding="utf-8") as f:
+        json.dump(spec, f)
+
+    (tmp_path / "broken.yaml").write_text("openapi: [\n")
+    (tmp_path / "notes.txt").write_text("not a spec")
+
+    return tmp_path
+
+class TestBatchValidation(object):
+
+    def test_find_spec_files(self, corpus):
+        spec_files = find_spec_files([corpus])
+
+        assert len(spec_files) == 42
+        assert spec_files == sorted(spec_files)
+        assert find_spec_files([corpus / "notes.txt"]) == [corpus / "notes.txt"]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_results(self, corpus, jobs):
+        results = list(validate_files([corpus], jobs=jobs))
+
+        assert [result["file"] for result in results] == [str(path) for path in find_spec_files([corpus])]
+
+        invalid = {result["file"]: result["error"] for result in results if not result["valid"]}
+        assert set(invalid) == {str(corpus / "invalid.json"), str(corpus / "broken.yaml")}
+        assert invalid[str(corpus / "invalid.json")]["path"] == ["paths", "/p0", "get", "responses"]
+        assert invalid[str(corpus / "broken.yaml")]["type"] == "ParserError"
+
+    def test_throughput(self, corpus):
+        start = perf_counter()
+        results = list(validate_files([corpus], jobs=2))
+        elapsed = perf_counter() - start
+
+        # Each file takes a few milliseconds once the schema is compiled, so even
+        # a slow machine should get through well over 10 files per second
+        assert len(results) == 42
+        assert len(results) / elapsed > 10
+
+class TestCommandLine(object):
+
+    def test_validate(self, corpus, capsys):
+        status = main(["validate", str(corpus), "--jobs", "2"])
+
+        lines = capsys.readouterr().out.splitlines()
+        results = [json.loads(line) for line in lines]
+
+        assert status == 1
+        assert len(results) == 42
+        assert sum(not result["valid"] for result in results) == 2
+
+    def test_validate_valid_files(self, corpus, capsys):
+        status = main(["validate", "--quiet", str(corpus / "nested")])
+
+        assert status == 0
+        assert capsys.readouterr().out == ""
+
+    def test_usage_errors(self):
+        with pytest.raises(SystemExit) as excinfo:
+            main(["validate"])
+
+        assert excinfo.value.code == 2
+
+    def test_validate_profile(self, corpus, capsys):
+        assert main(["validate", "--profile", str(corpus / "nested")]) == 0
+
+        captured = capsys.readouterr()
+        results = [json.loads(line) for line in captured.out.splitlines()]
+        assert all(result["profile"]["total_nodes"] > 0 for result in results)
+        assert "Phases:" in captured.err and "Nodes built:" in captured.err
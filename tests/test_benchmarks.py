@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import json
+import pytest
+
+from benchmarks.generator import generate_spec
+from benchmarks.suite import run_suite, compare_results, main
+from oaspec.schema import registry
+
+def count_refs(value):
+    if isinstance(value, dict):
+        return ("$ref" in value) + sum(count_refs(item) for item in value.values())
+    elif isinstance(value, list):
+        return sum(count_refs(item) for item in value)
+
+    return 0
+
+class TestGenerator(object):
+
+    @pytest.mark.parametrize("options", [
+        dict(),
+        dict(depth=3),
+        dict(ref_density=0.5),
+        dict(ref_density=0),
+        dict(unions=3, operations=2),
+        dict(schemas=0, unions=1),
+    ])
+    def test_valid_specs(self, options):
+        spec = generate_spec(paths=10, **options)
+
+        assert registry.get("3.0.1")(spec)._raw() == spec
+
+    def test_deterministic(self):
+        options = dict(paths=20, depth=2, ref_density=0.5, unions=2)
+
+        assert generate_spec(**options) == generate_spec(**options)
+        assert generate_spec(**options) != generate_spec(seed=1, **options)
+
+    def test_shape_options_keep_paths(self):
+        spec = generate_spec(paths=20)
+        shaped = generate_spec(paths=20, depth=2, unions=2)
+
+        assert [list(item) for item in spec["paths"].values()] == [list(item) for item in shaped["paths"].values()]
+
+    def test_ref_density(self):
+        refs = [count_refs(generate_spec(paths=50, ref_density=density)["paths"]) for density in (0, 0.5, 1)]
+
+        assert refs[0] < refs[1] < refs[2]
+
+    def test_operations(self):
+        spec = generate_spec(paths=20, operations=1)
+
+        assert all(list(item) == ["parameters", "get"] for item in spec["paths"].values())
+        with pytest.raises(ValueError):
+            generate_spec(operations=5)
+
+class TestSuite(object):
+
+    def test_run_suite(self):
+        results = run_suite(dict(paths=2, schemas=2), repeat=1, phases=["load_json", "parse", "serialize_json"])
+
+        assert list(results["phases"]) == ["load_json", "parse", "serialize_json"]
+        assert results["nodes"] > 0
+        assert all(measures["time"] > 0 and measures["peak_memory"] > 0 for measures in results["phases"].values())
+
+    def test_compare_results(self):
+        baseline = {"phases": {
+            "parse": {"time": 1.0, "peak_memory": 1000},
+            "raw": {"time": 0.0001, "peak_memory": 1000},
+            "removed": {"time": 1.0, "peak_memory": 1000},
+        }}
+        current = {"phases": {
+            "parse": {"time": 1.05, "peak_memory": 1500},
+            "raw": {"time": 0.0005, "peak_memory": 1000},
+            "added": {"time": 1.0, "peak_memory": 1000},
+        }}
+
+        comparison = compare_results(baseline, current, threshold=0.1)
+        regressions = {(row["phase"], row["metric"]) for row in comparison if row["regression"]}
+
+        assert {row["phase"] for row in comparison} == {"parse", "raw"}
+        assert regressions == {("parse", "peak_memory")}
+        assert {(row["phase"], row["metric"]) for row in compare_results(baseline, current, 0.01, 1.0)
+                if row["regression"]} == {("parse", "time")}
+
+    def test_compare_files(self, tmp_path, capsys):
+        results = {
+            "format": 1,
+            "created": "2018-11-29T00:00:00+00:00",
+            "generator": {"paths": 2},
+            "phases": {"parse": {"time": 1.0, "mean_time": 1.0, "peak_memory": 1000}},
+        }
+        (tmp_path / "baseline.json").write_text(json.dumps(results))
+        results["phases"]["parse"]["time"] = 2.0
+        (tmp_path / "current.json").write_text(json.dumps(results))
+
+        assert main(["--compare", str(tmp_path / "baseline.json"), str(tmp_path / "baseline.json")]) == 0
+        assert main(["--compare", str(tmp_path / "baseline.json"), str(tmp_path / "current.json")]) == 1
+        assert "REGRESSION" in capsys.readouterr().out
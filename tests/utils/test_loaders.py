@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018 Platform.sh
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import pytest
+from pathlib import Path
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from ruamel.yaml.comments import CommentedMap
+
+from oaspec.spec import OASpecParser
+from oaspec.utils import loaders
+
+def get_test_data(file_path):
+    return Path.cwd() / "tests/data" / file_path
+
+def load_text(file_path):
+    with get_test_data(file_path).open('r', encoding='utf-8') as f:
+        return f.read().replace("3.0.0", "3.0.1", 1)
+
+class TestLoaders(object):
+
+    @pytest.mark.parametrize("source,expected", [
+        ('{"a": 1}', "json"),
+        (b'\xef\xbb\xbf  \n[1]', "json"),
+        ("a: 1", "yaml"),
+        (b"---\na: {b: 1}", "yaml"),
+    ])
+    def test_sniff_format(self, source, expected):
+        assert loaders.sniff_format(source) == expected
+
+    @pytest.mark.parametrize("loader", [None, "round_trip", "safe_c", "json"])
+    def test_loaders_agree_on_json(self, loader):
+        text = load_text("petstore-3.0.0.json")
+
+        assert loaders.load(text, loader) == json.loads(text)
+        assert loaders.load(text.encode("utf-8"), loader) == json.loads(text)
+
+    @pytest.mark.parametrize("loader", [None, "round_trip", "safe_c"])
+    def test_loaders_agree_on_yaml(self, loader):
+        text = load_text("petstore-3.0.0.yaml")
+
+        assert loaders.load(text, loader) == loaders.load(text, "round_trip")
+
+    def test_default_loaders(self):
+        assert type(loaders.load('{"a": 1}')) is dict
+        assert isinstance(loaders.load("a: 1"), CommentedMap)
+        # A YAML flow mapping is not valid JSON
+        assert loaders.load("{a: 1}") == {"a": 1}
+
+    @pytest.mark.parametrize("loader", ["round_trip", "safe_c"])
+    def test_threads(self, loader):
+        text = load_text("petstore-3.0.0.yaml")
+        expected = loaders.load(text, loader)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(loaders.load, [text] * 32, [loader] * 32))
+
+        assert all(result == expected for result in results)
+
+    def test_invalid_loader(self):
+        with pytest.raises(ValueError):
+            loaders.load("a: 1", "json")
+        with pytest.raises(ValueError):
+            loaders.load("a: 1", "fast")
+
+class TestParserSources(object):
+
+    def test_mappings_are_not_reserialized(self):
+        spec = json.loads(load_text("petstore-3.0.0.json"))
+
+        parser = OASpecParser(spec)
+
+        assert parser._raw_spec is spec
+
+    @pytest.mark.parametrize("file_path", ["petstore-3.0.0.json", "petstore-3.0.0.yaml"])
+    def test_sources_are_sniffed(self, tmp_path, file_path):
+        text = load_text(file_path)
+        expected = OASpecParser(text).parse_spec()._raw()
+
+        # A file without a known extension
+        spec_file = tmp_path / "spec"
+        spec_file.write_text(text)
+
+        assert OASpecParser(str(spec_file)).parse_spec()._raw() == expected
+        assert OASpecParser(spec_file, loader="safe_c").parse_spec()._raw() == expected
+        assert OASpecParser(text.encode("utf-8")).parse_spec()._raw() == expected
+        with spec_file.open("rb") as f:
+            assert OASpecParser(f).parse_spec()._raw() == expected